@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory held by a large result set, with and without interning.
+
+Decodes a synthetic corpus (500,000 rows by default) page by page, as
+search() does, keeps every row, and reports the memory retained for plain
+dicts, interned dicts (``intern=True``), Annotation records
+(``as_model=True``) and interned records. The corpus has realistic
+repetition: 2,000 users, 50 groups, 20,000 URIs with their titles, a
+200-tag vocabulary and one permissions structure per user and group.
+
+Each mode runs in a fresh process and is measured by its peak resident set
+size, so the figures include allocator overhead.
+
+Usage:
+    python benchmarks/bench_interning.py [--rows 500000] [--modes dicts interned]
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+from itertools import chain
+
+# Add parent directory to path for local development
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hypothesisapi import Annotation, Interner
+from hypothesisapi.codec import default_codec
+
+MODES = ("dicts", "interned", "models", "interned-models")
+PAGE_SIZE = 200
+
+
+def synthetic_pages(rows, seed=1):
+    """Yield search response bodies (bytes) holding ``rows`` rows in total."""
+    rng = random.Random(seed)
+    words = ["evidence", "claim", "source", "method", "result", "context", "note", "data"]
+    tags = [f"tag{n}" for n in range(200)]
+    for start in range(0, rows, PAGE_SIZE):
+        page = []
+        for n in range(start, min(start + PAGE_SIZE, rows)):
+            user = f"acct:user{rng.randrange(2000)}@hypothes.is"
+            group = "__world__" if rng.random() < 0.6 else f"group{rng.randrange(49):02d}"
+            page_id = rng.randrange(20000)
+            uri = f"https://example.org/articles/{page_id}"
+            exact = " ".join(rng.choice(words) for _ in range(rng.randint(3, 15)))
+            page.append({
+                "id": f"{n:022d}",
+                "created": "2024-05-01T12:34:56.789012+00:00",
+                "updated": "2024-05-02T08:00:00.000000+00:00",
+                "user": user,
+                "uri": uri,
+                "text": " ".join(rng.choice(words) for _ in range(rng.randint(0, 40))),
+                "tags": rng.sample(tags, rng.randint(0, 3)),
+                "group": group,
+                "permissions": {
+                    "read": [f"group:{group}"],
+                    "admin": [user],
+                    "update": [user],
+                    "delete": [user],
+                },
+                "target": [{
+                    "source": uri,
+                    "selector": [{"type": "TextQuoteSelector", "exact": exact}],
+                }],
+                "document": {"title": [f"Article {page_id}"]},
+                "links": {"html": f"https://hypothes.is/a/{n:022d}"},
+                "flagged": False,
+                "hidden": False,
+            })
+        yield json.dumps({"rows": page, "total": rows}).encode("utf-8")
+
+
+def peak_rss():
+    """Peak resident set size of this process, in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure(mode, rows):
+    """Load the corpus in one mode; return (bytes retained, seconds)."""
+    codec = default_codec()
+    pages = synthetic_pages(rows)
+    first = next(pages)  # warm up generator, codec and allocator
+    baseline = peak_rss()
+    interner = Interner() if mode.startswith("interned") else None
+    kept = []
+    start = time.perf_counter()
+    for body in chain([first], pages):
+        for row in codec.loads(body)["rows"]:
+            if mode.endswith("models"):
+                kept.append(Annotation.from_dict(row, codec, interner))
+            else:
+                kept.append(interner.annotation(row) if interner is not None else row)
+    elapsed = time.perf_counter() - start
+    return peak_rss() - baseline, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500_000, help="Corpus size (default: 500000)")
+    parser.add_argument("--modes", nargs="*", choices=MODES, default=list(MODES))
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        retained, elapsed = measure(args.child, args.rows)
+        print(f"{retained} {elapsed}")
+        return
+
+    print(f"{args.rows:,} rows, codec {default_codec().name}")
+    print(f"{'mode':<16} {'MB':>8} {'bytes/row':>10} {'vs dicts':>9} {'load s':>7}")
+    reference = None
+    for mode in args.modes:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--rows", str(args.rows), "--child", mode],
+            check=True, capture_output=True, text=True,
+        ).stdout.split()
+        retained, elapsed = int(output[0]), float(output[1])
+        reference = reference or (retained if mode == "dicts" else None)
+        ratio = f"{retained / reference:>8.0%}" if reference else f"{'-':>8}"
+        print(
+            f"{mode:<16} {retained / 1e6:>8.0f} {retained / args.rows:>10.0f}"
+            f" {ratio:>9} {elapsed:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
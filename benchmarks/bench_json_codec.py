@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark: decoding and encoding search pages with each JSON codec.
+
+Times ``loads`` of whole 200-row search pages and ``dumps`` of their rows
+(what export_jsonl() does per row) with every available codec. Pass recorded
+pages (raw ``/api/search`` response bodies saved to files) with ``--pages``;
+without them, synthetic pages with full ``target`` selectors and
+``document`` metadata are generated.
+
+Usage:
+    python benchmarks/bench_json_codec.py [--pages page1.json ...] [--rounds 20]
+
+Install orjson (``pip install hypothesisapi[fast]``) to include it.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path for local development
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hypothesisapi import OrjsonCodec, StdlibCodec
+from hypothesisapi import codec as codec_module
+
+
+def synthetic_row(n, rng):
+    words = ["annotation", "climate", "evidence", "source", "claim", "naïve", "résumé", "data"]
+    text = " ".join(rng.choice(words) for _ in range(rng.randint(20, 120)))
+    exact = " ".join(rng.choice(words) for _ in range(rng.randint(10, 60)))
+    uri = f"https://example.org/articles/{n % 500}"
+    user = f"acct:user{n % 300}@hypothes.is"
+    return {
+        "id": f"{n:022d}",
+        "created": "2024-05-01T12:34:56.789012+00:00",
+        "updated": "2024-05-02T08:00:00.000000+00:00",
+        "user": user,
+        "uri": uri,
+        "text": text,
+        "tags": rng.sample(words, 3),
+        "group": "__world__",
+        "permissions": {
+            "read": ["group:__world__"],
+            "admin": [user],
+            "update": [user],
+            "delete": [user],
+        },
+        "target": [{
+            "source": uri,
+            "selector": [
+                {"type": "RangeSelector", "endOffset": 120, "startOffset": 4,
+                 "endContainer": "/div[1]/main[1]/article[1]/p[7]",
+                 "startContainer": "/div[1]/main[1]/article[1]/p[5]"},
+                {"end": 18430, "type": "TextPositionSelector", "start": 17102},
+                {"type": "TextQuoteSelector", "exact": exact,
+                 "prefix": exact[:32], "suffix": exact[-32:]},
+            ],
+        }],
+        "document": {"title": [f"Article {n % 500}"],
+                     "link": [{"href": uri}, {"href": uri + "?amp", "rel": "amphtml"}]},
+        "links": {
+            "html": f"https://hypothes.is/a/{n:022d}",
+            "incontext": f"https://hyp.is/{n:022d}/{uri}",
+        },
+        "flagged": False,
+        "hidden": False,
+        "user_info": {"display_name": None},
+    }
+
+
+def synthetic_pages(count, rows_per_page=200):
+    rng = random.Random(1)
+    pages = []
+    for p in range(count):
+        rows = [synthetic_row(p * rows_per_page + i, rng) for i in range(rows_per_page)]
+        pages.append(json.dumps({"total": count * rows_per_page, "rows": rows}).encode("utf-8"))
+    return pages
+
+
+def bench(codec, pages, rounds):
+    """Return (seconds to decode every page, seconds to encode every row), best of rounds."""
+    decoded = [codec.loads(page) for page in pages]
+    decode = encode = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for page in pages:
+            codec.loads(page)
+        decode = min(decode, time.perf_counter() - start)
+        start = time.perf_counter()
+        for page in decoded:
+            for row in page["rows"]:
+                codec.dumps(row)
+        encode = min(encode, time.perf_counter() - start)
+    return decode, encode
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", nargs="*", help="Recorded search response bodies")
+    parser.add_argument("--synthetic", type=int, default=10, help="Synthetic pages (default: 10)")
+    parser.add_argument(
+        "--rounds", type=int, default=20, help="Rounds per codec, best is kept (default: 20)"
+    )
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = []
+        for name in args.pages:
+            with open(name, "rb") as f:
+                pages.append(f.read())
+    else:
+        pages = synthetic_pages(args.synthetic)
+    megabytes = sum(len(page) for page in pages) / 1e6
+
+    codecs = [StdlibCodec()] + ([OrjsonCodec()] if codec_module.orjson is not None else [])
+    print(f"{len(pages)} pages, {megabytes:.1f} MB")
+    print(f"{'codec':<8} {'decode MB/s':>12} {'encode MB/s':>12} {'decode x':>9}")
+    baseline = None
+    for codec in codecs:
+        decode, encode = bench(codec, pages, args.rounds)
+        baseline = baseline or decode
+        print(
+            f"{codec.name:<8} {megabytes / decode:>12.0f} {megabytes / encode:>12.0f}"
+            f" {baseline / decode:>8.1f}x"
+        )
+    if codec_module.orjson is None:
+        print("orjson is not installed; pip install hypothesisapi[fast] to compare")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-call latency with and without the pooled transport.
+
+Runs a local stub server and times ``API.get_annotation()`` three ways:
+
+* ``requests.get`` per call (the pre-0.5 behavior, one connection per call)
+* the pooled transport with keep-alive disabled
+* the pooled transport with keep-alive (the default)
+
+Usage:
+    python benchmarks/bench_transport.py [--calls 500]
+
+Numbers against a loopback server only show the TCP setup cost; against
+https://hypothes.is the saved TLS handshake makes the gap considerably larger.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path for local development
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from hypothesisapi import API
+from tests.stub_server import StubServer, json_handler
+
+
+def bench_unpooled(url, calls):
+    """One connection per call, as module-level requests.get does."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        response = requests.get(f"{url}/annotations/abc", timeout=30)
+        response.json()
+    return time.perf_counter() - start
+
+
+def bench_api(url, calls, keep_alive):
+    """Calls through API and its pooled transport."""
+    with API(username="bench", api_key="key", api_url=url, keep_alive=keep_alive) as api:
+        start = time.perf_counter()
+        for _ in range(calls):
+            api.get_annotation("abc")
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=500, help="Calls per mode (default: 500)")
+    args = parser.parse_args()
+
+    with StubServer(json_handler({"id": "abc", "text": "x" * 512})) as server:
+        results = [
+            ("requests.get per call", bench_unpooled(server.url, args.calls)),
+            ("transport, keep_alive=False", bench_api(server.url, args.calls, False)),
+            ("transport, keep_alive=True", bench_api(server.url, args.calls, True)),
+        ]
+        connections = server.connections
+
+    baseline = results[0][1]
+    print(f"{args.calls} calls per mode, {connections} TCP connections accepted in total")
+    for name, elapsed in results:
+        per_call = elapsed / args.calls * 1e6
+        print(f"  {name:30s} {per_call:8.1f} us/call  ({baseline / elapsed:4.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,11 @@ analysis, or integration with other tools.
 
 Usage:
     python 08_export_annotations.py [tag] [--json output.json] [--csv output.csv]
+    python 08_export_annotations.py [tag] --jsonl output.jsonl.gz
+
+The JSON and CSV exports hold every annotation in memory. For large
+collections use --jsonl, which streams rows to disk with export_jsonl()
+(gzip-compressed when the name ends in .gz) and can be resumed.
 
 If no tag is provided, uses the fixture tag 'hypothesisapi-example'.
 
@@ -41,7 +46,7 @@ from _common import (
     get_api, extract_quote, extract_username, format_user_for_search,
     FIXTURE_TAG
 )
-from hypothesisapi import HypothesisAPIError
+from hypothesisapi import HypothesisAPIError, export_jsonl
 
 
 def export_json(annotations, filename):
@@ -106,6 +111,9 @@ def main():
                         help="CSV output filename (default: annotations.csv)")
     parser.add_argument("--limit", type=int, default=100,
                         help="Maximum annotations to export (default: 100)")
+    parser.add_argument("--jsonl", dest="jsonl_file",
+                        help="Stream all matches to this JSON Lines file instead "
+                             "(.gz for gzip); --limit is ignored")
     parser.add_argument("--user", help="Filter by username")
     parser.add_argument("--uri", help="Filter by URI")
     args = parser.parse_args()
@@ -128,6 +136,13 @@ def main():
             search_kwargs["uri"] = args.uri
             print(f"  Filtered by URI: {args.uri}")
 
+        if args.jsonl_file:
+            filters = {k: v for k, v in search_kwargs.items() if k != "limit"}
+            report = export_jsonl(api, args.jsonl_file,
+                                  checkpoint=args.jsonl_file + ".checkpoint", **filters)
+            print(f"\nStreamed {report.rows} annotation(s) to {args.jsonl_file}")
+            return
+
         # Fetch annotations
         annotations = list(api.search(**search_kwargs))
 
@@ -6,6 +6,10 @@ Demonstrates how to perform batch operations on annotations, specifically
 adding or removing tags from multiple annotations at once. This is a
 self-contained example that creates test annotations, modifies them, and cleans up.
 
+For large collections, api.retag(query, add=[...], remove=[...]) does the same
+from search results without a GET per annotation, and api.update_many() /
+api.delete_many() send the requests concurrently.
+
 Usage:
     python 09_batch_tag_update.py
 
@@ -13,17 +13,91 @@ __author__ = "Raymond Yee"
 __email__ = "raymond.yee@gmail.com"
 __version__ = "0.4.0"
 
+import copy
 import warnings
-from typing import Any, Dict, Generator, List, Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from itertools import chain, islice
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+    overload,
+)
 from urllib.parse import quote, urlencode
 
 import requests
 
+from ._base import (
+    API_URL,
+    APP_URL,
+    DEFAULT_TIMEOUT,
+    MAX_SEARCH_OFFSET,
+    _BaseClient,
+    _remove_none,
+)
+from .asyncapi import AsyncAPI
+from .batch import BULK_ANNOTATIONS_CHUNK, BULK_OPERATIONS_CHUNK, BatchReport, ItemResult
+from .cache import AnnotationCache
+from .codec import JSONCodec, OrjsonCodec, StdlibCodec, default_codec
+from .concurrency import AdaptiveConcurrency, _run_concurrently
+from .crawl import crawl
+from .exceptions import AuthenticationError, ForbiddenError, HypothesisAPIError, NotFoundError
+from .export import ExportReport, export_jsonl, export_parquet
+from .httpcache import HTTPCache, SQLiteCacheBackend
+from .mirror import Mirror, SyncReport
+from .interning import Interner, _resolve_interner
+from .models import Annotation
+from .ratelimit import RateLimiter
+from .selectors import extract_quote
+from .singleflight import SingleFlight
+from .streaming import STREAM_CHUNK_SIZE, RowParser
+from .transport import DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, RetryPolicy, Transport
+
 __all__ = [
     # Main class and constants
     "API",
+    "AsyncAPI",
     "API_URL",
     "APP_URL",
+    "MAX_SEARCH_OFFSET",
+    "Annotation",
+    "Interner",
+    # Transport and caching
+    "Transport",
+    "AnnotationCache",
+    "HTTPCache",
+    "SQLiteCacheBackend",
+    "RetryPolicy",
+    "RateLimiter",
+    "JSONCodec",
+    "StdlibCodec",
+    "OrjsonCodec",
+    # Concurrency and batches
+    "AdaptiveConcurrency",
+    "SingleFlight",
+    "ItemResult",
+    "BatchReport",
+    # Crawling and mirroring
+    "crawl",
+    "Mirror",
+    "SyncReport",
+    "extract_quote",
+    # Export
+    "export_jsonl",
+    "export_parquet",
+    "ExportReport",
     # Exceptions
     "HypothesisAPIError",
     "AuthenticationError",
@@ -33,8 +107,9 @@ __all__ = [
 
 # Note: The following API methods are available on the API class:
 # Annotations: create, get_annotation, update, delete, flag, hide, unhide, reindex, moderation
-# Search: search, search_raw
+# Search: search, search_raw, search_parallel
 # Bulk: bulk, bulk_annotations, bulk_groups, bulk_lms_annotations
+# Batch: get_annotations, create_many, update_many, delete_many, retag
 # Groups: get_groups, create_group, get_group, update_group, get_group_annotations,
 #         get_group_members, add_group_member, get_group_member, update_group_member,
 #         remove_group_member, leave_group
@@ -42,42 +117,12 @@ __all__ = [
 # Users (Admin): create_user, get_user, update_user
 # Analytics: create_analytics_event
 # Utility: root, get_links
+#
+# AsyncAPI mirrors every one of these as a coroutine (search is an async generator),
+# except the thread-pool helpers search_parallel and the Batch methods.
 
-APP_URL = "https://hypothes.is/app"
-API_URL = "https://hypothes.is/api"
-DEFAULT_TIMEOUT = 30  # seconds
-
-
-def _remove_none(d: Dict[str, Any]) -> Dict[str, Any]:
-    """Remove keys with None values from a dictionary."""
-    return {k: v for k, v in d.items() if v is not None}
-
-
-class HypothesisAPIError(Exception):
-    """Base exception for Hypothesis API errors."""
-
-    def __init__(self, message: str, status_code: Optional[int] = None, response: Optional[str] = None):
-        super().__init__(message)
-        self.status_code = status_code
-        self.response = response
-
-
-class AuthenticationError(HypothesisAPIError):
-    """Raised when authentication fails."""
-    pass
 
-
-class NotFoundError(HypothesisAPIError):
-    """Raised when a resource is not found."""
-    pass
-
-
-class ForbiddenError(HypothesisAPIError):
-    """Raised when user lacks permission for an action (403 Forbidden)."""
-    pass
-
-
-class API:
+class API(_BaseClient):
     """
     Main interface for Hypothesis API interactions.
 
@@ -94,6 +139,11 @@ class API:
         app_url: Base URL for the Hypothesis web app.
         username: Hypothesis username.
         api_key: API key (bearer token) for authentication.
+        transport: Pooled HTTP transport used by every request.
+        timeout: Per-request timeout in seconds.
+        annotation_cache: Read cache for get_annotation(), if enabled.
+        codec: JSON codec for response bodies.
+        singleflight: Coalesces concurrent identical GETs, if enabled.
     """
 
     def __init__(
@@ -102,6 +152,17 @@ class API:
         api_key: str,
         api_url: str = API_URL,
         app_url: str = APP_URL,
+        transport: Optional[Transport] = None,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        keep_alive: bool = True,
+        timeout: float = DEFAULT_TIMEOUT,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        annotation_cache: Optional[AnnotationCache] = None,
+        http_cache: Optional[HTTPCache] = None,
+        coalesce: bool = True,
+        codec: Optional[JSONCodec] = None,
     ) -> None:
         """
         Initialize the API client.
@@ -111,57 +172,106 @@ class API:
             api_key: API key (bearer token). Get yours at https://hypothes.is/account/developer
             api_url: Base URL for the API (default: https://hypothes.is/api).
             app_url: Base URL for the web app (default: https://hypothes.is/app).
+            transport: Shared Transport to send requests through. Pass the same
+                transport to several clients to share one connection pool.
+            pool_connections: Number of per-host pools to cache. Only used when
+                transport is not given.
+            pool_maxsize: Maximum connections kept per host. Only used when
+                transport is not given.
+            keep_alive: Keep connections open between requests. Only used when
+                transport is not given.
+            timeout: Per-request timeout in seconds (default: 30).
+            retry: Retry policy for throttled (429) and transient (5xx)
+                failures (default: up to 3 attempts with jittered exponential
+                backoff). Only used when transport is not given.
+            rate_limiter: Token bucket consulted before every request. Pass
+                the same limiter to every client using this API key to stay
+                under the server's rate limit. Only used when transport is
+                not given.
+            annotation_cache: AnnotationCache for get_annotation() results.
+                Updates, deletes and moderation actions made through this
+                client invalidate the affected annotation.
+            http_cache: HTTPCache for GET responses: stale responses are
+                revalidated with conditional requests, and fresh ones (per
+                the cache's per-endpoint freshness) are served without a
+                request. Only used when transport is not given.
+            coalesce: Share one request among threads making the same GET
+                (same URL and credentials) at the same time (default: True).
+                Each caller gets its own copy of the result.
+            codec: JSON codec for response and request bodies (default:
+                orjson if installed, else the standard library). Request
+                bodies use the transport's codec, which is this one unless
+                a transport is given.
         """
         self.api_url = api_url
         self.app_url = app_url
         self.username = username
         self.api_key = api_key
+        self.timeout = timeout
+        self.codec = codec if codec is not None else default_codec()
+        if transport is None:
+            transport = Transport(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                keep_alive=keep_alive,
+                retry=retry,
+                rate_limiter=rate_limiter,
+                http_cache=http_cache,
+                codec=self.codec,
+            )
+        self.transport = transport
+        # Whether admin/LMS-only bulk endpoints work for this account, by
+        # endpoint name; unknown until first tried
+        self._bulk_available: Dict[str, bool] = {}
+        self.annotation_cache = annotation_cache
+        self.singleflight = SingleFlight() if coalesce else None
 
-    def _get_user_acct(self, user: Optional[str] = None, authority: str = "hypothes.is") -> str:
-        """Format a username as a Hypothesis account identifier."""
-        username = user or self.username
-        return f"acct:{username}@{authority}"
+    def close(self) -> None:
+        """Close the pooled connections held by this client's transport."""
+        self.transport.close()
 
-    def _get_headers(self, authenticated: bool = True) -> Dict[str, str]:
-        """Get HTTP headers for API requests."""
-        headers = {
-            "Content-Type": "application/json;charset=UTF-8",
-            "Accept": "application/json",
-        }
-        if authenticated:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        return headers
-
-    def _handle_response(self, response: requests.Response) -> Any:
-        """Handle API response and raise appropriate exceptions."""
-        if response.status_code in (200, 201):
-            return response.json()
-        elif response.status_code == 204:
-            return {}
-        elif response.status_code == 401:
-            raise AuthenticationError(
-                "Authentication failed. Check your API key.",
-                status_code=response.status_code,
-                response=response.text,
-            )
-        elif response.status_code == 403:
-            raise ForbiddenError(
-                "Permission denied for this action.",
-                status_code=response.status_code,
-                response=response.text,
-            )
-        elif response.status_code == 404:
-            raise NotFoundError(
-                "Resource not found.",
-                status_code=response.status_code,
-                response=response.text,
-            )
-        else:
-            raise HypothesisAPIError(
-                f"API request failed with status {response.status_code}",
-                status_code=response.status_code,
-                response=response.text,
-            )
+    def __enter__(self) -> "API":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _invalidate_annotation(self, annotation_id: str) -> None:
+        """Drop an annotation from the read cache after a write."""
+        if self.annotation_cache is not None:
+            self.annotation_cache.invalidate(annotation_id)
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        authenticated: bool = True,
+        idempotency_key: Optional[str] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Send a request through the shared transport."""
+        return self.transport.request(
+            method,
+            url,
+            headers=self._get_headers(authenticated=authenticated, idempotency_key=idempotency_key),
+            timeout=self.timeout,
+            **kwargs,
+        )
+
+    def _get(self, url: str, authenticated: bool = True) -> Any:
+        """
+        GET a URL and return the parsed body, coalescing concurrent identical
+        reads into one request.
+        """
+        def fetch() -> Any:
+            return self._handle_response(self._request("GET", url, authenticated=authenticated))
+
+        if self.singleflight is None:
+            return fetch()
+        key = (url, self.api_key if authenticated else None)
+        value, shared = self.singleflight.do(key, fetch)
+        # Callers may modify what they get back; a shared value stays intact
+        return copy.deepcopy(value) if shared else value
 
     # ========== Root Endpoint ==========
 
@@ -172,12 +282,7 @@ class API:
         Returns:
             Dictionary containing API links and version information.
         """
-        response = requests.get(
-            self.api_url,
-            headers=self._get_headers(authenticated=False),
-            timeout=DEFAULT_TIMEOUT,
-        )
-        return self._handle_response(response)
+        return self._get(self.api_url, authenticated=False)
 
     # ========== Annotation Endpoints ==========
 
@@ -185,6 +290,7 @@ class API:
         self,
         payload: Dict[str, Any],
         group: str = "__world__",
+        idempotency_key: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Create a new annotation.
@@ -197,6 +303,11 @@ class API:
                 - document: Document metadata
                 - references: Parent annotation IDs for replies
             group: Group ID for the annotation (default: "__world__" for public).
+            idempotency_key: Unique key for this annotation (e.g. a UUID), sent
+                as an ``Idempotency-Key`` header. POST requests are only
+                retried after a 429/5xx or connection error when a key is set.
+                The retry is the caller's judgement that a duplicate is
+                acceptable or can be detected; the API may not deduplicate.
 
         Returns:
             The created annotation object.
@@ -205,38 +316,39 @@ class API:
             HypothesisAPIError: If the request fails.
             ValueError: If 'uri' is not provided in payload.
         """
-        if "uri" not in payload:
-            raise ValueError("Payload must include 'uri'")
-
-        user_acct = self._get_user_acct()
-        payload_out = payload.copy()
-        payload_out["user"] = user_acct
-        # Only set group if not already in payload
-        if "group" not in payload_out:
-            payload_out["group"] = group
-        effective_group = payload_out["group"]
-
-        if "permissions" not in payload:
-            read_permissions = ["group:__world__"] if effective_group == "__world__" else [f"group:{effective_group}"]
-            payload_out["permissions"] = {
-                "read": read_permissions,
-                "update": [user_acct],
-                "delete": [user_acct],
-                "admin": [user_acct],
-            }
+        payload_out = self._build_create_payload(payload, group)
 
-        if "document" not in payload:
-            payload_out["document"] = {}
-
-        response = requests.post(
+        response = self._request(
+            "POST",
             f"{self.api_url}/annotations",
-            headers=self._get_headers(),
+            idempotency_key=idempotency_key,
             json=payload_out,
-            timeout=DEFAULT_TIMEOUT,
         )
         return self._handle_response(response)
 
-    def get_annotation(self, annotation_id: str, authenticated: bool = True) -> Dict[str, Any]:
+    @overload
+    def get_annotation(
+        self,
+        annotation_id: str,
+        authenticated: bool = True,
+        as_model: Literal[False] = False,
+    ) -> Dict[str, Any]: ...
+
+    @overload
+    def get_annotation(
+        self,
+        annotation_id: str,
+        authenticated: bool = True,
+        *,
+        as_model: Literal[True],
+    ) -> Annotation: ...
+
+    def get_annotation(
+        self,
+        annotation_id: str,
+        authenticated: bool = True,
+        as_model: bool = False,
+    ) -> Union[Dict[str, Any], Annotation]:
         """
         Retrieve a single annotation by ID.
 
@@ -244,6 +356,7 @@ class API:
             annotation_id: The annotation ID.
             authenticated: Whether to send authentication headers (default: True).
                 Set to True to access private/group annotations.
+            as_model: Return an :class:`Annotation` instead of a dict.
 
         Returns:
             The annotation object.
@@ -252,12 +365,17 @@ class API:
             NotFoundError: If the annotation doesn't exist.
             ForbiddenError: If the annotation is private and user lacks access.
         """
-        response = requests.get(
-            f"{self.api_url}/annotations/{annotation_id}",
-            headers=self._get_headers(authenticated=authenticated),
-            timeout=DEFAULT_TIMEOUT,
+        if self.annotation_cache is not None:
+            cached = self.annotation_cache.get(annotation_id, authenticated)
+            if cached is not None:
+                return Annotation.from_dict(cached, self.codec) if as_model else cached
+
+        annotation = self._get(
+            f"{self.api_url}/annotations/{annotation_id}", authenticated=authenticated
         )
-        return self._handle_response(response)
+        if self.annotation_cache is not None:
+            self.annotation_cache.set(annotation_id, annotation, authenticated)
+        return Annotation.from_dict(annotation, self.codec) if as_model else annotation
 
     def update(self, annotation_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -277,12 +395,14 @@ class API:
             NotFoundError: If the annotation doesn't exist.
             ForbiddenError: If user doesn't have update permission.
         """
-        response = requests.patch(
-            f"{self.api_url}/annotations/{annotation_id}",
-            headers=self._get_headers(),
-            json=payload,
-            timeout=DEFAULT_TIMEOUT,
-        )
+        try:
+            response = self._request(
+                "PATCH",
+                f"{self.api_url}/annotations/{annotation_id}",
+                json=payload,
+            )
+        finally:
+            self._invalidate_annotation(annotation_id)
         return self._handle_response(response)
 
     def delete(self, annotation_id: str) -> Dict[str, Any]:
@@ -299,11 +419,10 @@ class API:
             NotFoundError: If the annotation doesn't exist.
             ForbiddenError: If user doesn't have delete permission.
         """
-        response = requests.delete(
-            f"{self.api_url}/annotations/{annotation_id}",
-            headers=self._get_headers(),
-            timeout=DEFAULT_TIMEOUT,
-        )
+        try:
+            response = self._request("DELETE", f"{self.api_url}/annotations/{annotation_id}")
+        finally:
+            self._invalidate_annotation(annotation_id)
         return self._handle_response(response)
 
     def flag(self, annotation_id: str) -> Dict[str, Any]:
@@ -319,11 +438,7 @@ class API:
         Raises:
             NotFoundError: If the annotation doesn't exist.
         """
-        response = requests.put(
-            f"{self.api_url}/annotations/{annotation_id}/flag",
-            headers=self._get_headers(),
-            timeout=DEFAULT_TIMEOUT,
-        )
+        response = self._request("PUT", f"{self.api_url}/annotations/{annotation_id}/flag")
         return self._handle_response(response)
 
     def hide(self, annotation_id: str) -> Dict[str, Any]:
@@ -339,11 +454,10 @@ class API:
         Raises:
             ForbiddenError: If user is not a moderator.
         """
-        response = requests.put(
-            f"{self.api_url}/annotations/{annotation_id}/hide",
-            headers=self._get_headers(),
-            timeout=DEFAULT_TIMEOUT,
-        )
+        try:
+            response = self._request("PUT", f"{self.api_url}/annotations/{annotation_id}/hide")
+        finally:
+            self._invalidate_annotation(annotation_id)
         return self._handle_response(response)
 
     def unhide(self, annotation_id: str) -> Dict[str, Any]:
@@ -359,11 +473,10 @@ class API:
         Raises:
             ForbiddenError: If user is not a moderator.
         """
-        response = requests.delete(
-            f"{self.api_url}/annotations/{annotation_id}/hide",
-            headers=self._get_headers(),
-            timeout=DEFAULT_TIMEOUT,
-        )
+        try:
+            response = self._request("DELETE", f"{self.api_url}/annotations/{annotation_id}/hide")
+        finally:
+            self._invalidate_annotation(annotation_id)
         return self._handle_response(response)
 
     def reindex(self, annotation_id: str) -> Dict[str, Any]:
@@ -387,11 +500,7 @@ class API:
             This is an internal/admin-only endpoint. Regular users will
             receive an error when attempting to use this method.
         """
-        response = requests.post(
-            f"{self.api_url}/annotations/{annotation_id}/reindex",
-            headers=self._get_headers(),
-            timeout=DEFAULT_TIMEOUT,
-        )
+        response = self._request("POST", f"{self.api_url}/annotations/{annotation_id}/reindex")
         return self._handle_response(response)
 
     def moderation(
@@ -426,17 +535,20 @@ class API:
             This is an alternative to hide()/unhide() with more granular control.
             For simple hide/unhide operations, prefer those methods.
         """
-        response = requests.patch(
-            f"{self.api_url}/annotations/{annotation_id}/moderation",
-            headers=self._get_headers(),
-            json={
-                "moderation_status": moderation_status,
-                "annotation_updated": annotation_updated,
-            },
-            timeout=DEFAULT_TIMEOUT,
-        )
+        try:
+            response = self._request(
+                "PATCH",
+                f"{self.api_url}/annotations/{annotation_id}/moderation",
+                json={
+                    "moderation_status": moderation_status,
+                    "annotation_updated": annotation_updated,
+                },
+            )
+        finally:
+            self._invalidate_annotation(annotation_id)
         return self._handle_response(response)
 
+    @overload
     def search(
         self,
         user: Optional[str] = None,
@@ -456,14 +568,85 @@ class API:
         offset: int = 0,
         limit: int = 200,
         search_after: Optional[str] = None,
+        cursor: bool = False,
+        prefetch: int = 0,
+        stream: bool = False,
+        as_model: Literal[False] = False,
+        intern: Union[bool, Interner] = False,
         **kwargs: Any,
-    ) -> Generator[Dict[str, Any], None, None]:
+    ) -> Generator[Dict[str, Any], None, None]: ...
+
+    @overload
+    def search(
+        self,
+        user: Optional[str] = None,
+        authority: Optional[str] = None,
+        uri: Optional[str] = None,
+        url: Optional[str] = None,
+        wildcard_uri: Optional[str] = None,
+        text: Optional[str] = None,
+        any_field: Optional[str] = None,
+        tag: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        group: Optional[str] = None,
+        quote: Optional[str] = None,
+        references: Optional[str] = None,
+        sort: Optional[str] = None,
+        order: str = "asc",
+        offset: int = 0,
+        limit: int = 200,
+        search_after: Optional[str] = None,
+        cursor: bool = False,
+        prefetch: int = 0,
+        stream: bool = False,
+        *,
+        as_model: Literal[True],
+        intern: Union[bool, Interner] = False,
+        **kwargs: Any,
+    ) -> Generator[Annotation, None, None]: ...
+
+    def search(
+        self,
+        user: Optional[str] = None,
+        authority: Optional[str] = None,
+        uri: Optional[str] = None,
+        url: Optional[str] = None,
+        wildcard_uri: Optional[str] = None,
+        text: Optional[str] = None,
+        any_field: Optional[str] = None,
+        tag: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        group: Optional[str] = None,
+        quote: Optional[str] = None,
+        references: Optional[str] = None,
+        sort: Optional[str] = None,
+        order: str = "asc",
+        offset: int = 0,
+        limit: int = 200,
+        search_after: Optional[str] = None,
+        cursor: bool = False,
+        prefetch: int = 0,
+        stream: bool = False,
+        as_model: bool = False,
+        intern: Union[bool, Interner] = False,
+        **kwargs: Any,
+    ) -> Generator[Union[Dict[str, Any], Annotation], None, None]:
         """
         Search for annotations with pagination.
 
         This method returns a generator that automatically handles pagination,
         yielding annotations one at a time.
 
+        With ``prefetch=N`` the next N pages are requested in background threads
+        while the current page is consumed, so the network is not idle while
+        the caller processes rows. At most N + 1 pages are held in memory.
+
+        With ``stream=True`` each page is parsed as it downloads and every
+        row is yielded as soon as it has arrived, rather than after the whole
+        page, which shortens the wait for the first row and keeps at most one
+        row's raw JSON in memory. Streamed pages are not shared between
+        threads making the same search.
+
         Args:
             user: Filter by username. Can be just username or full acct: format.
                 If just username, authority param determines the domain.
@@ -481,95 +664,174 @@ class API:
             references: Filter by parent annotation ID (for replies).
             sort: Sort field (created, updated, id, group, user).
             order: Sort order (asc or desc).
-            offset: Starting offset for results (ignored if search_after is set).
+            offset: Starting offset for results (ignored in cursor mode).
             limit: Maximum results per page (max 200).
-            search_after: Pagination cursor for efficient deep pagination.
-                When set, offset-based pagination is disabled.
+            search_after: Start after the row whose sort field has this value.
+                Implies cursor=True.
+            cursor: Page with search_after instead of offset (default: False).
+                Each page's cursor is the last row's value for the active sort
+                field, so every page costs the same however deep it is and
+                result sets beyond MAX_SEARCH_OFFSET are reachable. Requires
+                sort to be created, updated (the default) or id.
+            prefetch: Number of pages to fetch ahead of the caller (default: 0,
+                no prefetching). With cursor pagination each page's cursor
+                depends on the previous page, so at most one page is fetched
+                ahead. Keep it below the transport's ``pool_maxsize``.
+            stream: Parse each page incrementally (default: False). Cannot be
+                combined with prefetch.
+            as_model: Yield compact :class:`Annotation` records instead of
+                dicts (default: False). They use less memory but are slower
+                to build, since each row is decoded and then partly
+                re-encoded.
+            intern: Share repeated values (user, group, uri, tags,
+                permissions, document titles) between rows, for result sets
+                kept in memory. True uses a new :class:`Interner` for this
+                search; pass an Interner to share one across searches.
             **kwargs: Additional search parameters.
 
         Yields:
             Annotation objects matching the search criteria.
 
         Raises:
-            HypothesisAPIError: If the search request fails.
+            HypothesisAPIError: If the search request fails, or a streamed
+                page is cut short.
             AuthenticationError: If authentication fails.
-        """
-        # Handle user parameter - support both username and full acct: format
-        user_acct: Optional[str] = None
-        if user:
-            if user.startswith("acct:"):
-                user_acct = user
-            else:
-                user_acct = self._get_user_acct(user, authority=authority or "hypothes.is")
-
-        search_dict: Dict[str, Any] = {
-            "user": user_acct,
-            "uri": uri or url,
-            "wildcard_uri": wildcard_uri,
-            "text": text,
-            "any": any_field,
-            "group": group,
-            "quote": quote,
-            "references": references,
-            "sort": sort,
-            "order": order,
-            "limit": limit,
-        }
-
-        # Handle tags - Hypothesis API expects repeated tag= parameters, not tags=
-        # Build a list under "tag" key for urlencode with doseq=True
-        tag_list: List[str] = []
-        if tag:
-            tag_list.append(tag)
-        if tags:
-            tag_list.extend(tags)
-        if tag_list:
-            search_dict["tag"] = tag_list
-
-        # Handle pagination mode: cursor-based (search_after) vs offset-based
-        use_cursor_pagination = search_after is not None
-        if use_cursor_pagination:
-            search_dict["search_after"] = search_after
-        else:
-            search_dict["offset"] = offset
-
-        search_dict.update(kwargs)
-        search_dict = _remove_none(search_dict)
+            ValueError: If cursor pagination is combined with an unsupported
+                sort, or stream with prefetch.
+        """
+        if stream and prefetch > 0:
+            raise ValueError("stream cannot be combined with prefetch")
+        interner = _resolve_interner(intern)
+        search_dict = self._build_search_params(
+            user=user,
+            authority=authority,
+            uri=uri,
+            url=url,
+            wildcard_uri=wildcard_uri,
+            text=text,
+            any_field=any_field,
+            tag=tag,
+            tags=tags,
+            group=group,
+            quote=quote,
+            references=references,
+            sort=sort,
+            order=order,
+            offset=offset,
+            limit=limit,
+            search_after=search_after,
+            cursor=cursor,
+            **kwargs,
+        )
 
         last_seen_id: Optional[str] = None
 
-        while True:
-            url_str = f"{self.api_url}/search?{urlencode(search_dict, doseq=True)}"
-            response = requests.get(
-                url_str,
-                headers=self._get_headers(),
-                timeout=DEFAULT_TIMEOUT,
-            )
-            # Use _handle_response to properly handle errors
-            data = self._handle_response(response)
-            rows = data.get("rows", [])
-
-            if not rows:
-                break
-
-            # Guard against infinite loops - break if seeing same first result
-            first_id = rows[0].get("id") if rows else None
-            if first_id and first_id == last_seen_id:
-                break
-            last_seen_id = first_id
+        if stream:
+            while True:
+                last_row: Optional[Dict[str, Any]] = None
+                for row in self._stream_search_page(search_dict):
+                    if last_row is None:
+                        # Guard against infinite loops - stop if seeing same first result
+                        first_id = row.get("id")
+                        if first_id and first_id == last_seen_id:
+                            return
+                        last_seen_id = first_id
+                    last_row = row
+                    yield self._output_row(row, as_model, interner)
+                if last_row is None:
+                    return
+                self._advance_search_params(search_dict, [last_row])
+
+        pages = self._iter_search_pages(search_dict, prefetch=prefetch)
+        try:
+            for rows in pages:
+                # Guard against infinite loops - break if seeing same first result
+                first_id = rows[0].get("id")
+                if first_id and first_id == last_seen_id:
+                    break
+                last_seen_id = first_id
+
+                for row in rows:
+                    yield self._output_row(row, as_model, interner)
+        finally:
+            pages.close()
+
+    def _fetch_search_page(self, search_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch one page of search results."""
+        url_str = f"{self.api_url}/search?{urlencode(search_dict, doseq=True)}"
+        return self._get(url_str)
+
+    def _stream_search_page(
+        self,
+        search_dict: Dict[str, Any],
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Yield the rows of one page of search results as they download."""
+        url_str = f"{self.api_url}/search?{urlencode(search_dict, doseq=True)}"
+        with self._request("GET", url_str, stream=True) as response:
+            if response.status_code != 200:
+                self._handle_response(response)
+                return
+            parser = RowParser()
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                for raw in parser.feed(chunk):
+                    yield self.codec.loads(raw)
+            try:
+                parser.close()
+            except ValueError as e:
+                raise HypothesisAPIError(str(e), status_code=response.status_code) from e
+
+    def _iter_search_pages(
+        self,
+        search_dict: Dict[str, Any],
+        prefetch: int = 0,
+    ) -> Generator[List[Dict[str, Any]], None, None]:
+        """Yield non-empty pages of rows, optionally fetching ahead in threads."""
+        if prefetch <= 0:
+            while True:
+                rows = self._fetch_search_page(search_dict).get("rows", [])
+                if not rows:
+                    return
+                yield rows
+                self._advance_search_params(search_dict, rows)
+
+        cursor = self._is_cursor_search(search_dict)
+        total: Optional[int] = None
+        pending: Deque[Future] = deque()
+        executor = ThreadPoolExecutor(
+            max_workers=1 if cursor else prefetch,
+            thread_name_prefix="hypothesisapi-prefetch",
+        )
 
-            for row in rows:
-                yield row
+        def submit() -> None:
+            # Offset pages past the reported total are known to be empty
+            if not cursor and total is not None and search_dict["offset"] >= total:
+                return
+            page = executor.submit(copy_context().run, self._fetch_search_page, dict(search_dict))
+            pending.append(page)
+            if not cursor:
+                self._advance_search_params(search_dict, [])
 
-            # Update pagination for next page
-            if use_cursor_pagination:
-                # For cursor-based pagination, use search_after from last result
-                # Note: This is experimental - the API may return this differently
-                last_row = rows[-1]
-                search_dict["search_after"] = last_row.get("created", "") + last_row.get("id", "")
-            else:
-                # For offset-based pagination, increment offset
-                search_dict["offset"] = search_dict.get("offset", 0) + limit
+        try:
+            for _ in range(1 if cursor else prefetch + 1):
+                submit()
+            while pending:
+                data = pending.popleft().result()
+                rows = data.get("rows", [])
+                if not rows:
+                    return
+                if total is None:
+                    total = data.get("total")
+                if cursor:
+                    # The next cursor is known now; fetch it while rows are consumed
+                    self._advance_search_params(search_dict, rows)
+                    submit()
+                yield rows
+                if not cursor:
+                    submit()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
 
     def search_raw(
         self,
@@ -595,12 +857,105 @@ class API:
         search_dict = _remove_none(search_dict)
 
         url = f"{self.api_url}/search?{urlencode(search_dict, doseq=True)}"
-        response = requests.get(
-            url,
-            headers=self._get_headers(),
-            timeout=DEFAULT_TIMEOUT,
+        return self._get(url)
+
+    def search_parallel(
+        self,
+        max_workers: int = 4,
+        ordered: bool = True,
+        limit: int = 200,
+        offset: int = 0,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+        **kwargs: Any,
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Search with offset pages fetched concurrently.
+
+        Reads the result total with one ``search_raw(limit=0)`` call, then
+        fans the offset ranges out across a thread pool instead of walking
+        pages one after another. Rows are de-duplicated by ``id``, since
+        concurrent writes can shift rows across page boundaries.
+
+        Args:
+            max_workers: Number of pages fetched at once (default: 4). Keep it
+                at or below the transport's ``pool_maxsize``.
+            ordered: Yield rows in result order (default: True). When False,
+                each page's rows are yielded as soon as that page arrives.
+            limit: Rows per page (max 200).
+            offset: Starting offset.
+            concurrency: AdaptiveConcurrency governor that adjusts the number
+                of pages in flight from throttling and latency. Replaces
+                max_workers when given.
+            **kwargs: Search filters, as accepted by search().
+
+        Yields:
+            Annotation objects matching the search criteria.
+
+        Raises:
+            ValueError: If cursor or search_after is given; cursor pages cannot
+                be fetched in parallel.
+            HypothesisAPIError: If any page request fails.
+
+        Note:
+            The API rejects offsets above MAX_SEARCH_OFFSET, so only the first
+            MAX_SEARCH_OFFSET + limit rows of a result set are reachable this
+            way. Larger result sets need cursor pagination (``search(cursor=True)``)
+            or :func:`hypothesisapi.crawl`.
+        """
+        if kwargs.get("cursor") or kwargs.get("search_after") is not None:
+            raise ValueError("search_parallel() does not support cursor pagination")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        search_dict = self._build_search_params(limit=limit, offset=offset, **kwargs)
+        return self._search_parallel(search_dict, max_workers, ordered, concurrency)
+
+    def _search_parallel(
+        self,
+        search_dict: Dict[str, Any],
+        max_workers: int,
+        ordered: bool,
+        concurrency: Optional[AdaptiveConcurrency],
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Yield search_parallel() rows; arguments are already validated."""
+        limit, offset = search_dict["limit"], search_dict["offset"]
+        total = self.search_raw(**{**search_dict, "limit": 0}).get("total", 0)
+
+        last_offset = min(total - 1, MAX_SEARCH_OFFSET)
+        if total - 1 > MAX_SEARCH_OFFSET:
+            warnings.warn(
+                f"search matched {total} rows; only offsets up to {MAX_SEARCH_OFFSET} "
+                "can be fetched in parallel, use search(cursor=True) for the rest",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+        offsets = range(offset, last_offset + 1, limit)
+
+        def fetch(page_offset: int) -> List[Dict[str, Any]]:
+            page = self._fetch_search_page({**search_dict, "offset": page_offset})
+            rows: List[Dict[str, Any]] = page.get("rows", [])
+            return rows
+
+        seen_ids = set()
+        pages = _run_concurrently(
+            fetch,
+            offsets,
+            max_workers,
+            ordered=ordered,
+            concurrency=concurrency,
+            thread_name_prefix="hypothesisapi-search",
+            pool_maxsize=self.transport.pool_maxsize,
         )
-        return self._handle_response(response)
+        try:
+            for rows in pages:
+                for row in rows:
+                    row_id = row.get("id")
+                    if row_id is not None:
+                        if row_id in seen_ids:
+                            continue
+                        seen_ids.add(row_id)
+                    yield row
+        finally:
+            pages.close()
 
     # ========== Bulk Endpoints ==========
 
@@ -627,12 +982,7 @@ class API:
             LMS (Learning Management System) integrations. Regular users
             will receive a 404 error.
         """
-        response = requests.post(
-            f"{self.api_url}/bulk",
-            headers=self._get_headers(),
-            json=operations,
-            timeout=DEFAULT_TIMEOUT,
-        )
+        response = self._request("POST", f"{self.api_url}/bulk", json=operations)
         return self._handle_response(response)
 
     def bulk_annotations(
@@ -676,12 +1026,7 @@ class API:
         if uri:
             payload["uri"] = uri
 
-        response = requests.post(
-            f"{self.api_url}/bulk/annotation",
-            headers=self._get_headers(),
-            json=payload,
-            timeout=DEFAULT_TIMEOUT,
-        )
+        response = self._request("POST", f"{self.api_url}/bulk/annotation", json=payload)
         return self._handle_response(response)
 
     def bulk_groups(
@@ -718,12 +1063,7 @@ class API:
         if expand:
             payload["expand"] = expand
 
-        response = requests.post(
-            f"{self.api_url}/bulk/group",
-            headers=self._get_headers(),
-            json=payload,
-            timeout=DEFAULT_TIMEOUT,
-        )
+        response = self._request("POST", f"{self.api_url}/bulk/group", json=payload)
         return self._handle_response(response)
 
     def bulk_lms_annotations(
@@ -760,14 +1100,451 @@ class API:
         if course_id:
             payload["course_id"] = course_id
 
-        response = requests.post(
-            f"{self.api_url}/bulk/lms/annotations",
-            headers=self._get_headers(),
-            json=payload,
-            timeout=DEFAULT_TIMEOUT,
-        )
+        response = self._request("POST", f"{self.api_url}/bulk/lms/annotations", json=payload)
         return self._handle_response(response)
 
+    # ========== Batch Methods ==========
+
+    def get_annotations(
+        self,
+        annotation_ids: Iterable[str],
+        max_workers: int = 8,
+        authenticated: bool = True,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+    ) -> List[ItemResult]:
+        """
+        Retrieve many annotations by ID.
+
+        Uses bulk_annotations() when this account may call it, and otherwise
+        fetches the annotations concurrently with get_annotation() over the
+        shared connection pool. Whether the bulk endpoint works is probed
+        once per client.
+
+        Args:
+            annotation_ids: Annotation IDs to fetch. Duplicates are fetched once.
+            max_workers: Number of concurrent requests (default: 8). Keep it
+                at or below the transport's ``pool_maxsize``.
+            authenticated: Whether to send authentication headers (default: True).
+            concurrency: AdaptiveConcurrency governor; replaces max_workers
+                when given.
+
+        Returns:
+            One ItemResult per input ID, in input order. IDs that do not exist
+            or are not visible carry a NotFoundError or ForbiddenError instead
+            of a value.
+
+        Raises:
+            ValueError: If max_workers is less than 1.
+            HypothesisAPIError: For failures other than not-found and
+                permission errors, such as an invalid API key.
+
+        Example:
+            >>> for result in api.get_annotations(ids):
+            ...     if result.ok:
+            ...         print(result.value["text"])
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        ids = list(annotation_ids)
+        unique_ids = list(dict.fromkeys(ids))
+
+        results: Dict[str, ItemResult] = {}
+        if authenticated:
+            results.update(self._get_annotations_bulk(unique_ids))
+
+        def fetch(annotation_id: str) -> ItemResult:
+            try:
+                annotation = self.get_annotation(annotation_id, authenticated=authenticated)
+                return ItemResult(annotation_id, annotation)
+            except (NotFoundError, ForbiddenError) as exc:
+                return ItemResult(annotation_id, error=exc)
+
+        missing = [annotation_id for annotation_id in unique_ids if annotation_id not in results]
+        fetched = _run_concurrently(
+            fetch,
+            missing,
+            max_workers,
+            concurrency=concurrency,
+            thread_name_prefix="hypothesisapi-get",
+            pool_maxsize=self.transport.pool_maxsize,
+        )
+        for result in fetched:
+            results[result.key] = result  # type: ignore[index]
+        return [results[annotation_id] for annotation_id in ids]
+
+    def create_many(
+        self,
+        payloads: Iterable[Dict[str, Any]],
+        group: str = "__world__",
+        max_workers: int = 8,
+        ordered: bool = True,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+    ) -> Generator[ItemResult, None, None]:
+        """
+        Create many annotations.
+
+        Each payload is completed exactly as create() does (user, group,
+        default permissions, empty document). Payloads are sent through the
+        bulk() endpoint when this account may use it, and otherwise created
+        concurrently with one request each. Whether bulk() works is probed
+        once per client.
+
+        Args:
+            payloads: Annotation payloads, consumed lazily. Each must include 'uri'.
+            group: Group for payloads that do not name one (default: "__world__").
+            max_workers: Number of concurrent requests (default: 8).
+            ordered: Yield results in input order (default: True). When False,
+                results are yielded as requests complete.
+            concurrency: AdaptiveConcurrency governor; replaces max_workers
+                when given.
+
+        Yields:
+            One ItemResult per payload, keyed by its position in payloads. The
+            value is the created annotation; the error is a HypothesisAPIError,
+            or ValueError for a payload without 'uri'. Items sent through
+            bulk() fail with a HypothesisAPIError when the response does not
+            confirm they were created, one row per payload.
+
+        Raises:
+            ValueError: If max_workers is less than 1.
+            AuthenticationError: If the API key is rejected.
+
+        Note:
+            Creates are POST requests, which are not retried after 429/5xx
+            responses; a failed item is reported and can be resubmitted.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        return self._create_many(payloads, group, max_workers, ordered, concurrency)
+
+    def _create_many(
+        self,
+        payloads: Iterable[Dict[str, Any]],
+        group: str,
+        max_workers: int,
+        ordered: bool,
+        concurrency: Optional[AdaptiveConcurrency],
+    ) -> Generator[ItemResult, None, None]:
+        """Yield create_many() results; arguments are already validated."""
+
+        def create_one(item: Tuple[int, Dict[str, Any]]) -> ItemResult:
+            index, payload = item
+            try:
+                return ItemResult(index, self.create(payload, group=group))
+            except AuthenticationError:
+                raise
+            except (HypothesisAPIError, ValueError) as exc:
+                return ItemResult(index, error=exc)
+
+        items: Iterator[Tuple[int, Dict[str, Any]]] = enumerate(payloads)
+        while self._bulk_available.get("bulk", True):
+            chunk = list(islice(items, BULK_OPERATIONS_CHUNK))
+            if not chunk:
+                return
+            bulk_results = self._create_bulk(chunk, group)
+            if bulk_results is None:
+                items = chain(chunk, items)
+                break
+            yield from bulk_results
+
+        results = _run_concurrently(
+            create_one,
+            items,
+            max_workers,
+            ordered=ordered,
+            concurrency=concurrency,
+            thread_name_prefix="hypothesisapi-create",
+            pool_maxsize=self.transport.pool_maxsize,
+        )
+        try:
+            yield from results
+        finally:
+            results.close()
+
+    def _create_bulk(
+        self,
+        chunk: List[Tuple[int, Dict[str, Any]]],
+        group: str,
+    ) -> Optional[List[ItemResult]]:
+        """
+        Create a chunk of annotations with one bulk() call.
+
+        Returns None, having created nothing, if bulk() answers with a 4xx
+        error, which means it is unavailable to this account. A 5xx error,
+        or a reply whose rows cannot be matched to the operations, fails
+        every item of the chunk: the annotations may or may not exist.
+        """
+        results: Dict[int, ItemResult] = {}
+        operations: List[Dict[str, Any]] = []
+        indexes: List[int] = []
+        for index, payload in chunk:
+            try:
+                operation = self._build_create_payload(payload, group)
+                operations.append({"action": "create", **operation})
+                indexes.append(index)
+            except ValueError as exc:
+                results[index] = ItemResult(index, error=exc)
+
+        if operations:
+            try:
+                data = self.bulk(operations)
+            except AuthenticationError:
+                raise
+            except HypothesisAPIError as exc:
+                if exc.status_code is not None and 400 <= exc.status_code < 500:
+                    self._bulk_available["bulk"] = False
+                    return None
+                # The chunk may have been partly applied; resending could
+                # create duplicates, so report it as failed
+                for index in indexes:
+                    results[index] = ItemResult(index, error=exc)
+                return [results[index] for index, _ in chunk]
+            self._bulk_available["bulk"] = True
+            rows = data if isinstance(data, list) else data.get("rows", data.get("results"))
+            if not isinstance(rows, list) or len(rows) != len(operations):
+                error = HypothesisAPIError(
+                    "bulk() response did not confirm the annotations were created"
+                )
+                for index in indexes:
+                    results[index] = ItemResult(index, error=error)
+            else:
+                for index, row in zip(indexes, rows):
+                    results[index] = ItemResult(index, row)
+        return [results[index] for index, _ in chunk]
+
+    def update_many(
+        self,
+        updates: Union[Mapping[str, Dict[str, Any]], Iterable[Tuple[str, Dict[str, Any]]]],
+        max_workers: int = 8,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+    ) -> BatchReport:
+        """
+        Update many annotations concurrently.
+
+        Transient failures (429/5xx, connection errors) are retried by the
+        transport's RetryPolicy before an item counts as failed.
+
+        Args:
+            updates: Mapping of annotation ID to the fields to update, or an
+                iterable of (annotation_id, payload) pairs, consumed lazily.
+                Items with an empty payload are skipped.
+            max_workers: Number of concurrent requests (default: 8).
+            concurrency: AdaptiveConcurrency governor; replaces max_workers
+                when given.
+
+        Returns:
+            A BatchReport of succeeded, failed and skipped IDs.
+
+        Raises:
+            ValueError: If max_workers is less than 1.
+            AuthenticationError: If the API key is rejected.
+
+        Example:
+            >>> report = api.update_many({"abc123": {"text": "new"}, "def456": {"tags": []}})
+            >>> report.failed
+            {}
+        """
+        items = updates.items() if isinstance(updates, Mapping) else updates
+
+        def update_one(item: Tuple[str, Dict[str, Any]]) -> Tuple[str, Optional[Exception], bool]:
+            annotation_id, payload = item
+            if not payload:
+                return annotation_id, None, True
+            try:
+                self.update(annotation_id, payload)
+            except AuthenticationError:
+                raise
+            except HypothesisAPIError as exc:
+                return annotation_id, exc, False
+            return annotation_id, None, False
+
+        return self._run_batch(update_one, items, max_workers, concurrency, "hypothesisapi-update")
+
+    def delete_many(
+        self,
+        annotation_ids: Iterable[str],
+        max_workers: int = 8,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+    ) -> BatchReport:
+        """
+        Delete many annotations concurrently.
+
+        Transient failures (429/5xx, connection errors) are retried by the
+        transport's RetryPolicy before an item counts as failed.
+
+        Args:
+            annotation_ids: IDs to delete, consumed lazily. Duplicates are
+                deleted once.
+            max_workers: Number of concurrent requests (default: 8).
+            concurrency: AdaptiveConcurrency governor; replaces max_workers
+                when given.
+
+        Returns:
+            A BatchReport of succeeded, failed and skipped IDs. IDs that no
+            longer exist (404) are skipped, so a cleanup job can be re-run.
+
+        Raises:
+            ValueError: If max_workers is less than 1.
+            AuthenticationError: If the API key is rejected.
+        """
+        seen = set()
+
+        def unique_ids() -> Generator[str, None, None]:
+            for annotation_id in annotation_ids:
+                if annotation_id not in seen:
+                    seen.add(annotation_id)
+                    yield annotation_id
+
+        def delete_one(annotation_id: str) -> Tuple[str, Optional[Exception], bool]:
+            try:
+                self.delete(annotation_id)
+            except NotFoundError:
+                return annotation_id, None, True
+            except AuthenticationError:
+                raise
+            except HypothesisAPIError as exc:
+                return annotation_id, exc, False
+            return annotation_id, None, False
+
+        return self._run_batch(
+            delete_one, unique_ids(), max_workers, concurrency, "hypothesisapi-delete"
+        )
+
+    def retag(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        add: Optional[List[str]] = None,
+        remove: Optional[List[str]] = None,
+        max_workers: int = 8,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+    ) -> BatchReport:
+        """
+        Add and remove tags on every annotation matching a search.
+
+        The new tag list is computed from each search result, so no extra
+        GET is needed, and results whose tags would not change are skipped
+        without a request. Updates are sent concurrently while the search
+        is still streaming.
+
+        Args:
+            query: Search filters, as accepted by search() (e.g.
+                ``{"user": "me", "tag": "draft"}``).
+            add: Tags to add, appended in order if not already present.
+            remove: Tags to remove.
+            max_workers: Number of concurrent updates (default: 8).
+            concurrency: AdaptiveConcurrency governor; replaces max_workers
+                when given.
+
+        Returns:
+            A BatchReport of updated (succeeded), failed and unchanged
+            (skipped) annotation IDs.
+
+        Raises:
+            ValueError: If a tag is both added and removed, or the query sets
+                its own sort, order, offset or cursor.
+            HypothesisAPIError: If the search fails.
+
+        Example:
+            >>> api.retag({"user": "me", "tag": "todo"}, add=["done"], remove=["todo"])
+
+        Note:
+            Matches are read with cursor pagination in ``created`` order,
+            which updates do not change. Offset pages would shift as tags
+            used in the query are removed, skipping annotations.
+        """
+        add_tags = list(add or [])
+        remove_tags = set(remove or [])
+        if remove_tags & set(add_tags):
+            raise ValueError("a tag cannot be both added and removed")
+        query = dict(query or {})
+        reserved = {"sort", "order", "offset", "search_after", "cursor"} & set(query)
+        if reserved:
+            raise ValueError(f"retag() manages {', '.join(sorted(reserved))} itself")
+
+        def updates() -> Generator[Tuple[str, Dict[str, Any]], None, None]:
+            for row in self.search(cursor=True, sort="created", **query):
+                tags = row.get("tags") or []
+                new_tags = [tag for tag in tags if tag not in remove_tags]
+                new_tags += [tag for tag in add_tags if tag not in new_tags]
+                # An empty payload is counted as skipped by update_many()
+                yield row["id"], ({"tags": new_tags} if new_tags != tags else {})
+
+        return self.update_many(updates(), max_workers=max_workers, concurrency=concurrency)
+
+    def _run_batch(
+        self,
+        fn: Callable[[Any], Tuple[str, Optional[Exception], bool]],
+        items: Iterable[Any],
+        max_workers: int,
+        concurrency: Optional[AdaptiveConcurrency],
+        thread_name_prefix: str,
+    ) -> BatchReport:
+        """Apply fn, which returns (id, error, skipped), to every item concurrently."""
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        report = BatchReport()
+        outcomes = _run_concurrently(
+            fn,
+            items,
+            max_workers,
+            ordered=False,
+            concurrency=concurrency,
+            thread_name_prefix=thread_name_prefix,
+            pool_maxsize=self.transport.pool_maxsize,
+        )
+        for annotation_id, error, skipped in outcomes:
+            if error is not None:
+                report.failed[annotation_id] = error
+            elif skipped:
+                report.skipped.append(annotation_id)
+            else:
+                report.succeeded.append(annotation_id)
+        return report
+
+    def _get_annotations_bulk(self, annotation_ids: List[str]) -> Dict[str, ItemResult]:
+        """
+        Fetch what bulk_annotations() returns for the given IDs.
+
+        Returns results only for IDs found in its response; the caller fetches
+        the rest one by one, including every ID of a chunk whose bulk request
+        failed. Stops using the endpoint for this client if it answers with a
+        4xx error or its rows cannot be matched to IDs.
+        """
+        found: Dict[str, ItemResult] = {}
+        for start in range(0, len(annotation_ids), BULK_ANNOTATIONS_CHUNK):
+            if not self._bulk_available.get("annotations", True):
+                break
+            chunk = annotation_ids[start:start + BULK_ANNOTATIONS_CHUNK]
+            try:
+                data = self.bulk_annotations(annotation_ids=chunk)
+            except AuthenticationError:
+                raise
+            except HypothesisAPIError as exc:
+                # Fetch this chunk one by one; a 4xx means the endpoint will
+                # not work for this client, a 5xx may be transient
+                if exc.status_code is not None and 400 <= exc.status_code < 500:
+                    self._bulk_available["annotations"] = False
+                    break
+                continue
+            rows = data if isinstance(data, list) else data.get("rows", data.get("annotations", []))
+            wanted = set(chunk)
+            matched = {
+                row["id"]: row
+                for row in rows
+                if isinstance(row, dict) and row.get("id") in wanted
+            }
+            if rows and not matched:
+                # Rows without IDs (e.g. LMS metadata only) cannot stand in for
+                # get_annotation() results
+                self._bulk_available["annotations"] = False
+                break
+            self._bulk_available["annotations"] = True
+            found.update(
+                (annotation_id, ItemResult(annotation_id, row))
+                for annotation_id, row in matched.items()
+            )
+        return found
+
     # ========== Group Endpoints ==========
 
     def get_groups(
@@ -799,8 +1576,7 @@ class API:
         if params:
             url += f"?{urlencode(params, doseq=True)}"
 
-        response = requests.get(url, headers=self._get_headers(), timeout=DEFAULT_TIMEOUT)
-        return self._handle_response(response)
+        return self._get(url)
 
     def create_group(
         self,
@@ -825,12 +1601,7 @@ class API:
         if groupid:
             payload["groupid"] = groupid
 
-        response = requests.post(
-            f"{self.api_url}/groups",
-            headers=self._get_headers(),
-            json=payload,
-            timeout=DEFAULT_TIMEOUT,
-        )
+        response = self._request("POST", f"{self.api_url}/groups", json=payload)
         return self._handle_response(response)
 
     def get_group(
@@ -856,8 +1627,7 @@ class API:
         if params:
             url += f"?{urlencode(params, doseq=True)}"
 
-        response = requests.get(url, headers=self._get_headers(), timeout=DEFAULT_TIMEOUT)
-        return self._handle_response(response)
+        return self._get(url)
 
     def update_group(
         self,
@@ -888,12 +1658,7 @@ class API:
         if not payload:
             raise ValueError("At least one of 'name' or 'description' must be provided")
 
-        response = requests.patch(
-            f"{self.api_url}/groups/{group_id}",
-            headers=self._get_headers(),
-            json=payload,
-            timeout=DEFAULT_TIMEOUT,
-        )
+        response = self._request("PATCH", f"{self.api_url}/groups/{group_id}", json=payload)
         return self._handle_response(response)
 
     def get_group_members(self, group_id: str) -> List[Dict[str, Any]]:
@@ -906,12 +1671,7 @@ class API:
         Returns:
             List of member objects.
         """
-        response = requests.get(
-            f"{self.api_url}/groups/{group_id}/members",
-            headers=self._get_headers(),
-            timeout=DEFAULT_TIMEOUT,
-        )
-        return self._handle_response(response)
+        return self._get(f"{self.api_url}/groups/{group_id}/members")
 
     def leave_group(self, group_id: str) -> Dict[str, Any]:
         """
@@ -923,11 +1683,7 @@ class API:
         Returns:
             Empty dict on success.
         """
-        response = requests.delete(
-            f"{self.api_url}/groups/{group_id}/members/me",
-            headers=self._get_headers(),
-            timeout=DEFAULT_TIMEOUT,
-        )
+        response = self._request("DELETE", f"{self.api_url}/groups/{group_id}/members/me")
         return self._handle_response(response)
 
     def get_group_annotations(
@@ -963,8 +1719,7 @@ class API:
         encoded_group_id = quote(group_id, safe="")
         url = f"{self.api_url}/groups/{encoded_group_id}/annotations?{urlencode(params)}"
 
-        response = requests.get(url, headers=self._get_headers(), timeout=DEFAULT_TIMEOUT)
-        return self._handle_response(response)
+        return self._get(url)
 
     def add_group_member(
         self,
@@ -993,11 +1748,10 @@ class API:
 
         encoded_group_id = quote(group_id, safe="")
         encoded_userid = quote(userid, safe="")
-        response = requests.post(
+        response = self._request(
+            "POST",
             f"{self.api_url}/groups/{encoded_group_id}/members/{encoded_userid}",
-            headers=self._get_headers(),
             json=payload,  # Always send JSON body (empty dict if no roles)
-            timeout=DEFAULT_TIMEOUT,
         )
         return self._handle_response(response)
 
@@ -1017,12 +1771,7 @@ class API:
         """
         encoded_group_id = quote(group_id, safe="")
         encoded_userid = quote(userid, safe="")
-        response = requests.get(
-            f"{self.api_url}/groups/{encoded_group_id}/members/{encoded_userid}",
-            headers=self._get_headers(),
-            timeout=DEFAULT_TIMEOUT,
-        )
-        return self._handle_response(response)
+        return self._get(f"{self.api_url}/groups/{encoded_group_id}/members/{encoded_userid}")
 
     def update_group_member(
         self,
@@ -1047,11 +1796,10 @@ class API:
         """
         encoded_group_id = quote(group_id, safe="")
         encoded_userid = quote(userid, safe="")
-        response = requests.patch(
+        response = self._request(
+            "PATCH",
             f"{self.api_url}/groups/{encoded_group_id}/members/{encoded_userid}",
-            headers=self._get_headers(),
             json={"roles": roles},
-            timeout=DEFAULT_TIMEOUT,
         )
         return self._handle_response(response)
 
@@ -1072,10 +1820,9 @@ class API:
         """
         encoded_group_id = quote(group_id, safe="")
         encoded_userid = quote(userid, safe="")
-        response = requests.delete(
+        response = self._request(
+            "DELETE",
             f"{self.api_url}/groups/{encoded_group_id}/members/{encoded_userid}",
-            headers=self._get_headers(),
-            timeout=DEFAULT_TIMEOUT,
         )
         return self._handle_response(response)
 
@@ -1088,12 +1835,7 @@ class API:
         Returns:
             Profile object with user information.
         """
-        response = requests.get(
-            f"{self.api_url}/profile",
-            headers=self._get_headers(),
-            timeout=DEFAULT_TIMEOUT,
-        )
-        return self._handle_response(response)
+        return self._get(f"{self.api_url}/profile")
 
     def get_profile_groups(
         self,
@@ -1124,8 +1866,7 @@ class API:
         if params:
             url += f"?{urlencode(params, doseq=True)}"
 
-        response = requests.get(url, headers=self._get_headers(), timeout=DEFAULT_TIMEOUT)
-        return self._handle_response(response)
+        return self._get(url)
 
     def update_profile(self, preferences: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -1141,11 +1882,10 @@ class API:
         Raises:
             HypothesisAPIError: If the update fails.
         """
-        response = requests.patch(
+        response = self._request(
+            "PATCH",
             f"{self.api_url}/profile",
-            headers=self._get_headers(),
             json={"preferences": preferences},
-            timeout=DEFAULT_TIMEOUT,
         )
         return self._handle_response(response)
 
@@ -1185,12 +1925,7 @@ class API:
         if identities:
             payload["identities"] = identities
 
-        response = requests.post(
-            f"{self.api_url}/users",
-            headers=self._get_headers(),
-            json=payload,
-            timeout=DEFAULT_TIMEOUT,
-        )
+        response = self._request("POST", f"{self.api_url}/users", json=payload)
         return self._handle_response(response)
 
     def get_user(self, userid: str) -> Dict[str, Any]:
@@ -1203,12 +1938,7 @@ class API:
         Returns:
             The user object.
         """
-        response = requests.get(
-            f"{self.api_url}/users/{userid}",
-            headers=self._get_headers(),
-            timeout=DEFAULT_TIMEOUT,
-        )
-        return self._handle_response(response)
+        return self._get(f"{self.api_url}/users/{userid}")
 
     def update_user(
         self,
@@ -1233,12 +1963,7 @@ class API:
         if display_name is not None:
             payload["display_name"] = display_name
 
-        response = requests.patch(
-            f"{self.api_url}/users/{userid}",
-            headers=self._get_headers(),
-            json=payload,
-            timeout=DEFAULT_TIMEOUT,
-        )
+        response = self._request("PATCH", f"{self.api_url}/users/{userid}", json=payload)
         return self._handle_response(response)
 
     # ========== Analytics Endpoints ==========
@@ -1275,12 +2000,7 @@ class API:
         if properties:
             payload["properties"] = properties
 
-        response = requests.post(
-            f"{self.api_url}/analytics/events",
-            headers=self._get_headers(),
-            json=payload,
-            timeout=DEFAULT_TIMEOUT,
-        )
+        response = self._request("POST", f"{self.api_url}/analytics/events", json=payload)
         return self._handle_response(response)
 
     # ========== Links Endpoints ==========
@@ -1295,12 +2015,7 @@ class API:
         Returns:
             Dictionary of URL templates with placeholders.
         """
-        response = requests.get(
-            f"{self.api_url}/links",
-            headers=self._get_headers(authenticated=False),
-            timeout=DEFAULT_TIMEOUT,
-        )
-        return self._handle_response(response)
+        return self._get(f"{self.api_url}/links", authenticated=False)
 
     # ========== Deprecated Methods (for backward compatibility) ==========
 
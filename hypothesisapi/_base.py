@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+Request building and response handling shared by API and AsyncAPI.
+
+Nothing in this module performs I/O; the sync and async clients only differ
+in how they send the requests built here.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Union
+
+from .codec import JSONCodec
+from .exceptions import AuthenticationError, ForbiddenError, HypothesisAPIError, NotFoundError
+from .interning import Interner
+from .models import Annotation
+from .transport import IDEMPOTENCY_KEY_HEADER
+
+APP_URL = "https://hypothes.is/app"
+API_URL = "https://hypothes.is/api"
+DEFAULT_TIMEOUT = 30  # seconds
+MAX_SEARCH_OFFSET = 9800  # largest offset the search endpoint accepts
+DEFAULT_SORT = "updated"  # the search endpoint's default sort field
+# Sort fields whose values are (nearly) unique, so "after this value" cannot
+# skip rows that share a value with the last row of a page
+CURSOR_SORT_FIELDS = ("updated", "created", "id")
+
+
+def _remove_none(d: Dict[str, Any]) -> Dict[str, Any]:
+    """Remove keys with None values from a dictionary."""
+    return {k: v for k, v in d.items() if v is not None}
+
+
+class _BaseClient:
+    """Helpers shared by the sync and async clients."""
+
+    username: str
+    api_key: str
+    codec: JSONCodec
+
+    def _get_user_acct(self, user: Optional[str] = None, authority: str = "hypothes.is") -> str:
+        """Format a username as a Hypothesis account identifier."""
+        username = user or self.username
+        return f"acct:{username}@{authority}"
+
+    def _get_headers(
+        self,
+        authenticated: bool = True,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """Get HTTP headers for API requests."""
+        headers = {
+            "Content-Type": "application/json;charset=UTF-8",
+            "Accept": "application/json",
+        }
+        if authenticated:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        if idempotency_key is not None:
+            headers[IDEMPOTENCY_KEY_HEADER] = idempotency_key
+        return headers
+
+    def _handle_response(self, response: Any) -> Any:
+        """Handle API response and raise appropriate exceptions."""
+        if response.status_code in (200, 201):
+            return self._decode(response)
+        elif response.status_code == 204:
+            return {}
+        elif response.status_code == 401:
+            raise AuthenticationError(
+                "Authentication failed. Check your API key.",
+                status_code=response.status_code,
+                response=response.text,
+            )
+        elif response.status_code == 403:
+            raise ForbiddenError(
+                "Permission denied for this action.",
+                status_code=response.status_code,
+                response=response.text,
+            )
+        elif response.status_code == 404:
+            raise NotFoundError(
+                "Resource not found.",
+                status_code=response.status_code,
+                response=response.text,
+            )
+        else:
+            raise HypothesisAPIError(
+                f"API request failed with status {response.status_code}",
+                status_code=response.status_code,
+                response=response.text,
+            )
+
+    def _decode(self, response: Any) -> Any:
+        """Parse a JSON response body with the client's codec."""
+        return self.codec.loads(response.content)
+
+    def _output_row(
+        self,
+        row: Dict[str, Any],
+        as_model: bool,
+        interner: Optional[Interner],
+    ) -> Union[Dict[str, Any], Annotation]:
+        """Intern a search row and convert it to an Annotation, as requested."""
+        if as_model:
+            return Annotation.from_dict(row, self.codec, interner)
+        return interner.annotation(row) if interner is not None else row
+
+    def _build_create_payload(self, payload: Dict[str, Any], group: str) -> Dict[str, Any]:
+        """Fill in user, group, default permissions and document for create()."""
+        if "uri" not in payload:
+            raise ValueError("Payload must include 'uri'")
+
+        user_acct = self._get_user_acct()
+        payload_out = payload.copy()
+        payload_out["user"] = user_acct
+        # Only set group if not already in payload
+        if "group" not in payload_out:
+            payload_out["group"] = group
+        effective_group = payload_out["group"]
+
+        if "permissions" not in payload:
+            if effective_group == "__world__":
+                read_permissions = ["group:__world__"]
+            else:
+                read_permissions = [f"group:{effective_group}"]
+            payload_out["permissions"] = {
+                "read": read_permissions,
+                "update": [user_acct],
+                "delete": [user_acct],
+                "admin": [user_acct],
+            }
+
+        if "document" not in payload:
+            payload_out["document"] = {}
+
+        return payload_out
+
+    def _build_search_params(
+        self,
+        user: Optional[str] = None,
+        authority: Optional[str] = None,
+        uri: Optional[str] = None,
+        url: Optional[str] = None,
+        wildcard_uri: Optional[str] = None,
+        text: Optional[str] = None,
+        any_field: Optional[str] = None,
+        tag: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        group: Optional[str] = None,
+        quote: Optional[str] = None,
+        references: Optional[str] = None,
+        sort: Optional[str] = None,
+        order: str = "asc",
+        offset: int = 0,
+        limit: int = 200,
+        search_after: Optional[str] = None,
+        cursor: bool = False,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Build the query parameters for search() (see search() for arguments)."""
+        cursor = cursor or search_after is not None
+        if cursor:
+            # The cursor is a value of the sort field, so the sort must be explicit
+            sort = sort or DEFAULT_SORT
+            if sort not in CURSOR_SORT_FIELDS:
+                raise ValueError(
+                    f"cursor pagination requires sort to be one of {', '.join(CURSOR_SORT_FIELDS)}"
+                )
+
+        # Handle user parameter - support both username and full acct: format
+        user_acct: Optional[str] = None
+        if user:
+            if user.startswith("acct:"):
+                user_acct = user
+            else:
+                user_acct = self._get_user_acct(user, authority=authority or "hypothes.is")
+
+        search_dict: Dict[str, Any] = {
+            "user": user_acct,
+            "uri": uri or url,
+            "wildcard_uri": wildcard_uri,
+            "text": text,
+            "any": any_field,
+            "group": group,
+            "quote": quote,
+            "references": references,
+            "sort": sort,
+            "order": order,
+            "limit": limit,
+        }
+
+        # Handle tags - Hypothesis API expects repeated tag= parameters, not tags=
+        # Build a list under "tag" key for urlencode with doseq=True
+        tag_list: List[str] = []
+        if tag:
+            tag_list.append(tag)
+        if tags:
+            tag_list.extend(tags)
+        if tag_list:
+            search_dict["tag"] = tag_list
+
+        # Handle pagination mode: cursor-based (search_after) vs offset-based.
+        # Cursor searches carry no offset at all, so they never page deeply.
+        if cursor:
+            search_dict["search_after"] = search_after
+        else:
+            search_dict["offset"] = offset
+
+        search_dict.update(kwargs)
+        return _remove_none(search_dict)
+
+    @staticmethod
+    def _is_cursor_search(search_dict: Dict[str, Any]) -> bool:
+        """Return True if search_dict pages by search_after rather than offset."""
+        return "offset" not in search_dict
+
+    @staticmethod
+    def _advance_search_params(search_dict: Dict[str, Any], rows: List[Dict[str, Any]]) -> None:
+        """Move search parameters on to the page after ``rows``."""
+        if _BaseClient._is_cursor_search(search_dict):
+            # The cursor is the last row's value for the active sort field
+            sort = search_dict["sort"]
+            value = rows[-1].get(sort)
+            if value is None:
+                raise HypothesisAPIError(
+                    f"Search result has no '{sort}' field to continue cursor pagination from"
+                )
+            search_dict["search_after"] = value
+        else:
+            # For offset-based pagination, increment offset
+            search_dict["offset"] = search_dict.get("offset", 0) + search_dict["limit"]
@@ -0,0 +1,864 @@
+# -*- coding: utf-8 -*-
+"""
+Native asyncio client for the Hypothesis API.
+
+:class:`AsyncAPI` mirrors every endpoint of :class:`hypothesisapi.API` as a
+coroutine and sends all requests through one ``httpx.AsyncClient`` connection
+pool, so a single event loop can keep many requests in flight::
+
+    async with AsyncAPI(username="me", api_key="key") as api:
+        annotations = await asyncio.gather(*(api.get_annotation(i) for i in ids))
+        async for row in api.search(tag="example"):
+            ...
+
+Requires the optional ``httpx`` dependency (``pip install hypothesisapi[async]``).
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncGenerator, Deque, Dict, List, Literal, Optional, Union, cast, overload
+from urllib.parse import quote, urlencode
+
+from ._base import API_URL, APP_URL, DEFAULT_TIMEOUT, _BaseClient, _remove_none
+from .codec import JSONCodec, default_codec
+from .exceptions import HypothesisAPIError
+from .interning import Interner, _resolve_interner
+from .models import Annotation
+from .ratelimit import RateLimiter
+from .streaming import STREAM_CHUNK_SIZE, RowParser
+from .transport import RetryPolicy
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - exercised only without httpx
+    httpx = None  # type: ignore[assignment]
+
+__all__ = ["AsyncAPI"]
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 5.0  # seconds
+
+
+class AsyncAPI(_BaseClient):
+    """
+    Asyncio interface for Hypothesis API interactions.
+
+    Methods take the same arguments and return the same data as their
+    :class:`hypothesisapi.API` counterparts, and raise the same exceptions.
+
+    Attributes:
+        api_url: Base URL for the Hypothesis API.
+        app_url: Base URL for the Hypothesis web app.
+        username: Hypothesis username.
+        api_key: API key (bearer token) for authentication.
+        client: The shared ``httpx.AsyncClient``.
+        timeout: Per-request timeout in seconds.
+        retry: Retry policy applied to every request.
+        rate_limiter: Rate limiter consulted before each attempt, if any.
+        codec: JSON codec for request and response bodies.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        api_key: str,
+        api_url: str = API_URL,
+        app_url: str = APP_URL,
+        client: Optional[Any] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        timeout: float = DEFAULT_TIMEOUT,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        codec: Optional[JSONCodec] = None,
+    ) -> None:
+        """
+        Initialize the async client.
+
+        Args:
+            username: Hypothesis username.
+            api_key: API key (bearer token).
+            api_url: Base URL for the API (default: https://hypothes.is/api).
+            app_url: Base URL for the web app (default: https://hypothes.is/app).
+            client: An existing ``httpx.AsyncClient`` to share. The pool
+                arguments below are ignored when it is given.
+            max_connections: Maximum concurrent connections in the pool.
+            max_keepalive_connections: Maximum idle connections kept open.
+            keepalive_expiry: Seconds an idle connection is kept open.
+            timeout: Per-request timeout in seconds (default: 30).
+            retry: Retry policy (default: ``RetryPolicy()``). See
+                :class:`hypothesisapi.RetryPolicy`.
+            rate_limiter: Token bucket shared with other clients (sync or
+                async) using the same API key.
+            codec: JSON codec for request and response bodies (default:
+                orjson if installed, else the standard library).
+
+        Raises:
+            ImportError: If httpx is not installed.
+        """
+        if httpx is None:
+            raise ImportError(
+                "AsyncAPI requires httpx. Install it with: pip install hypothesisapi[async]"
+            )
+        self.api_url = api_url
+        self.app_url = app_url
+        self.username = username
+        self.api_key = api_key
+        self.timeout = timeout
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.codec = codec if codec is not None else default_codec()
+        if client is None:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+            )
+        self.client = client
+
+    async def aclose(self) -> None:
+        """Close the pooled connections held by this client."""
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncAPI":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        authenticated: bool = True,
+        idempotency_key: Optional[str] = None,
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Send a request through the shared connection pool, retrying per the policy.
+
+        With ``stream=True`` the body is not read; the caller must close the response.
+        """
+        headers = self._get_headers(authenticated=authenticated, idempotency_key=idempotency_key)
+        if "json" in kwargs:
+            kwargs["content"] = self.codec.dumps(kwargs.pop("json"))
+        retryable = self.retry.is_retryable(method, headers)
+        attempt = 1
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+            try:
+                request = self.client.build_request(
+                    method,
+                    url,
+                    headers=headers,
+                    timeout=self.timeout,
+                    **kwargs,
+                )
+                response = await self.client.send(request, stream=stream)
+            except httpx.TransportError:
+                if not retryable or attempt >= self.retry.max_attempts:
+                    raise
+                delay = self.retry.backoff(attempt)
+            else:
+                retry_delay = self.retry.retry_delay(attempt, response) if retryable else None
+                if retry_delay is None:
+                    return response
+                delay = retry_delay
+                await response.aclose()
+                if response.status_code == 429 and self.rate_limiter is not None:
+                    self.rate_limiter.pause(delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    # ========== Root Endpoint ==========
+
+    async def root(self) -> Dict[str, Any]:
+        """Get API root with hypermedia links. See :meth:`API.root`."""
+        response = await self._request("GET", self.api_url, authenticated=False)
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    # ========== Annotation Endpoints ==========
+
+    async def create(
+        self,
+        payload: Dict[str, Any],
+        group: str = "__world__",
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Create a new annotation. See :meth:`API.create`."""
+        payload_out = self._build_create_payload(payload, group)
+
+        response = await self._request(
+            "POST",
+            f"{self.api_url}/annotations",
+            idempotency_key=idempotency_key,
+            json=payload_out,
+        )
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    @overload
+    async def get_annotation(
+        self,
+        annotation_id: str,
+        authenticated: bool = True,
+        as_model: Literal[False] = False,
+    ) -> Dict[str, Any]: ...
+
+    @overload
+    async def get_annotation(
+        self,
+        annotation_id: str,
+        authenticated: bool = True,
+        *,
+        as_model: Literal[True],
+    ) -> Annotation: ...
+
+    async def get_annotation(
+        self,
+        annotation_id: str,
+        authenticated: bool = True,
+        as_model: bool = False,
+    ) -> Union[Dict[str, Any], Annotation]:
+        """Retrieve a single annotation by ID. See :meth:`API.get_annotation`."""
+        response = await self._request(
+            "GET",
+            f"{self.api_url}/annotations/{annotation_id}",
+            authenticated=authenticated,
+        )
+        annotation = self._handle_response(response)
+        return Annotation.from_dict(annotation, self.codec) if as_model else annotation
+
+    async def update(self, annotation_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Update an existing annotation. See :meth:`API.update`."""
+        response = await self._request(
+            "PATCH",
+            f"{self.api_url}/annotations/{annotation_id}",
+            json=payload,
+        )
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def delete(self, annotation_id: str) -> Dict[str, Any]:
+        """Delete an annotation. See :meth:`API.delete`."""
+        response = await self._request("DELETE", f"{self.api_url}/annotations/{annotation_id}")
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def flag(self, annotation_id: str) -> Dict[str, Any]:
+        """Flag an annotation for review by moderators. See :meth:`API.flag`."""
+        response = await self._request("PUT", f"{self.api_url}/annotations/{annotation_id}/flag")
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def hide(self, annotation_id: str) -> Dict[str, Any]:
+        """Hide an annotation (moderator action). See :meth:`API.hide`."""
+        response = await self._request("PUT", f"{self.api_url}/annotations/{annotation_id}/hide")
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def unhide(self, annotation_id: str) -> Dict[str, Any]:
+        """Unhide an annotation (moderator action). See :meth:`API.unhide`."""
+        response = await self._request(
+            "DELETE",
+            f"{self.api_url}/annotations/{annotation_id}/hide",
+        )
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def reindex(self, annotation_id: str) -> Dict[str, Any]:
+        """Reindex an annotation (admin action). See :meth:`API.reindex`."""
+        response = await self._request(
+            "POST",
+            f"{self.api_url}/annotations/{annotation_id}/reindex",
+        )
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def moderation(
+        self,
+        annotation_id: str,
+        moderation_status: str,
+        annotation_updated: bool = True,
+    ) -> Dict[str, Any]:
+        """Update moderation status of an annotation. See :meth:`API.moderation`."""
+        response = await self._request(
+            "PATCH",
+            f"{self.api_url}/annotations/{annotation_id}/moderation",
+            json={
+                "moderation_status": moderation_status,
+                "annotation_updated": annotation_updated,
+            },
+        )
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    @overload
+    def search(
+        self,
+        user: Optional[str] = None,
+        authority: Optional[str] = None,
+        uri: Optional[str] = None,
+        url: Optional[str] = None,
+        wildcard_uri: Optional[str] = None,
+        text: Optional[str] = None,
+        any_field: Optional[str] = None,
+        tag: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        group: Optional[str] = None,
+        quote: Optional[str] = None,
+        references: Optional[str] = None,
+        sort: Optional[str] = None,
+        order: str = "asc",
+        offset: int = 0,
+        limit: int = 200,
+        search_after: Optional[str] = None,
+        cursor: bool = False,
+        prefetch: int = 0,
+        stream: bool = False,
+        as_model: Literal[False] = False,
+        intern: Union[bool, Interner] = False,
+        **kwargs: Any,
+    ) -> AsyncGenerator[Dict[str, Any], None]: ...
+
+    @overload
+    def search(
+        self,
+        user: Optional[str] = None,
+        authority: Optional[str] = None,
+        uri: Optional[str] = None,
+        url: Optional[str] = None,
+        wildcard_uri: Optional[str] = None,
+        text: Optional[str] = None,
+        any_field: Optional[str] = None,
+        tag: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        group: Optional[str] = None,
+        quote: Optional[str] = None,
+        references: Optional[str] = None,
+        sort: Optional[str] = None,
+        order: str = "asc",
+        offset: int = 0,
+        limit: int = 200,
+        search_after: Optional[str] = None,
+        cursor: bool = False,
+        prefetch: int = 0,
+        stream: bool = False,
+        *,
+        as_model: Literal[True],
+        intern: Union[bool, Interner] = False,
+        **kwargs: Any,
+    ) -> AsyncGenerator[Annotation, None]: ...
+
+    async def search(
+        self,
+        user: Optional[str] = None,
+        authority: Optional[str] = None,
+        uri: Optional[str] = None,
+        url: Optional[str] = None,
+        wildcard_uri: Optional[str] = None,
+        text: Optional[str] = None,
+        any_field: Optional[str] = None,
+        tag: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        group: Optional[str] = None,
+        quote: Optional[str] = None,
+        references: Optional[str] = None,
+        sort: Optional[str] = None,
+        order: str = "asc",
+        offset: int = 0,
+        limit: int = 200,
+        search_after: Optional[str] = None,
+        cursor: bool = False,
+        prefetch: int = 0,
+        stream: bool = False,
+        as_model: bool = False,
+        intern: Union[bool, Interner] = False,
+        **kwargs: Any,
+    ) -> AsyncGenerator[Union[Dict[str, Any], Annotation], None]:
+        """
+        Search for annotations with pagination.
+
+        An async generator version of :meth:`API.search`; use it with
+        ``async for``. With ``prefetch=N`` the next N pages are requested as
+        background tasks while the current page is consumed. With
+        ``stream=True`` rows are yielded as each page downloads, with
+        ``as_model=True`` as :class:`Annotation` records, and with
+        ``intern=True`` with repeated values shared between rows.
+        """
+        if stream and prefetch > 0:
+            raise ValueError("stream cannot be combined with prefetch")
+        interner = _resolve_interner(intern)
+        search_dict = self._build_search_params(
+            user=user,
+            authority=authority,
+            uri=uri,
+            url=url,
+            wildcard_uri=wildcard_uri,
+            text=text,
+            any_field=any_field,
+            tag=tag,
+            tags=tags,
+            group=group,
+            quote=quote,
+            references=references,
+            sort=sort,
+            order=order,
+            offset=offset,
+            limit=limit,
+            search_after=search_after,
+            cursor=cursor,
+            **kwargs,
+        )
+
+        last_seen_id: Optional[str] = None
+
+        if stream:
+            while True:
+                last_row: Optional[Dict[str, Any]] = None
+                page = self._stream_search_page(search_dict)
+                try:
+                    async for row in page:
+                        if last_row is None:
+                            # Guard against infinite loops - stop if seeing same first result
+                            first_id = row.get("id")
+                            if first_id and first_id == last_seen_id:
+                                return
+                            last_seen_id = first_id
+                        last_row = row
+                        yield self._output_row(row, as_model, interner)
+                finally:
+                    await page.aclose()
+                if last_row is None:
+                    return
+                self._advance_search_params(search_dict, [last_row])
+
+        pages = self._iter_search_pages(search_dict, prefetch=prefetch)
+        try:
+            async for rows in pages:
+                # Guard against infinite loops - break if seeing same first result
+                first_id = rows[0].get("id")
+                if first_id and first_id == last_seen_id:
+                    break
+                last_seen_id = first_id
+
+                for row in rows:
+                    yield self._output_row(row, as_model, interner)
+        finally:
+            await pages.aclose()
+
+    async def _fetch_search_page(self, search_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch one page of search results."""
+        url_str = f"{self.api_url}/search?{urlencode(search_dict, doseq=True)}"
+        response = await self._request("GET", url_str)
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def _stream_search_page(
+        self,
+        search_dict: Dict[str, Any],
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Yield the rows of one page of search results as they download."""
+        url_str = f"{self.api_url}/search?{urlencode(search_dict, doseq=True)}"
+        response = await self._request("GET", url_str, stream=True)
+        try:
+            if response.status_code != 200:
+                await response.aread()
+                self._handle_response(response)
+                return
+            parser = RowParser()
+            async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                for raw in parser.feed(chunk):
+                    yield self.codec.loads(raw)
+            try:
+                parser.close()
+            except ValueError as e:
+                raise HypothesisAPIError(str(e), status_code=response.status_code) from e
+        finally:
+            await response.aclose()
+
+    async def _iter_search_pages(
+        self,
+        search_dict: Dict[str, Any],
+        prefetch: int = 0,
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Yield non-empty pages of rows, optionally fetching ahead as tasks."""
+        if prefetch <= 0:
+            while True:
+                rows = (await self._fetch_search_page(search_dict)).get("rows", [])
+                if not rows:
+                    return
+                yield rows
+                self._advance_search_params(search_dict, rows)
+
+        cursor = self._is_cursor_search(search_dict)
+        total: Optional[int] = None
+        pending: Deque["asyncio.Task[Dict[str, Any]]"] = deque()
+
+        def submit() -> None:
+            # Offset pages past the reported total are known to be empty
+            if not cursor and total is not None and search_dict["offset"] >= total:
+                return
+            pending.append(asyncio.ensure_future(self._fetch_search_page(dict(search_dict))))
+            if not cursor:
+                self._advance_search_params(search_dict, [])
+
+        try:
+            for _ in range(1 if cursor else prefetch + 1):
+                submit()
+            while pending:
+                data = await pending.popleft()
+                rows = data.get("rows", [])
+                if not rows:
+                    return
+                if total is None:
+                    total = data.get("total")
+                if cursor:
+                    # The next cursor is known now; fetch it while rows are consumed
+                    self._advance_search_params(search_dict, rows)
+                    submit()
+                yield rows
+                if not cursor:
+                    submit()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def search_raw(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Perform a raw search and return the full response. See :meth:`API.search_raw`."""
+        search_dict = {"limit": limit, "offset": offset, **kwargs}
+        search_dict = _remove_none(search_dict)
+
+        url = f"{self.api_url}/search?{urlencode(search_dict, doseq=True)}"
+        response = await self._request("GET", url)
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    # ========== Bulk Endpoints ==========
+
+    async def bulk(self, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Perform multiple operations in a single API call. See :meth:`API.bulk`."""
+        response = await self._request("POST", f"{self.api_url}/bulk", json=operations)
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def bulk_annotations(
+        self,
+        annotation_ids: Optional[List[str]] = None,
+        group: Optional[str] = None,
+        user: Optional[str] = None,
+        uri: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Retrieve a large number of annotations in one call. See :meth:`API.bulk_annotations`."""
+        payload: Dict[str, Any] = {}
+        if annotation_ids:
+            payload["ids"] = annotation_ids
+        if group:
+            payload["group"] = group
+        if user:
+            payload["user"] = user
+        if uri:
+            payload["uri"] = uri
+
+        response = await self._request("POST", f"{self.api_url}/bulk/annotation", json=payload)
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def bulk_groups(
+        self,
+        group_ids: Optional[List[str]] = None,
+        authority: Optional[str] = None,
+        expand: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Retrieve a large number of groups in one call. See :meth:`API.bulk_groups`."""
+        payload: Dict[str, Any] = {}
+        if group_ids:
+            payload["ids"] = group_ids
+        if authority:
+            payload["authority"] = authority
+        if expand:
+            payload["expand"] = expand
+
+        response = await self._request("POST", f"{self.api_url}/bulk/group", json=payload)
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def bulk_lms_annotations(
+        self,
+        group_ids: List[str],
+        assignment_id: Optional[str] = None,
+        course_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Retrieve annotations for LMS metrics. See :meth:`API.bulk_lms_annotations`."""
+        payload: Dict[str, Any] = {"group_ids": group_ids}
+        if assignment_id:
+            payload["assignment_id"] = assignment_id
+        if course_id:
+            payload["course_id"] = course_id
+
+        response = await self._request(
+            "POST",
+            f"{self.api_url}/bulk/lms/annotations",
+            json=payload,
+        )
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    # ========== Group Endpoints ==========
+
+    async def get_groups(
+        self,
+        authority: Optional[str] = None,
+        document_uri: Optional[str] = None,
+        expand: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get a list of groups. See :meth:`API.get_groups`."""
+        params: Dict[str, Any] = {}
+        if authority:
+            params["authority"] = authority
+        if document_uri:
+            params["document_uri"] = document_uri
+        if expand:
+            params["expand"] = expand
+
+        url = f"{self.api_url}/groups"
+        if params:
+            url += f"?{urlencode(params, doseq=True)}"
+
+        response = await self._request("GET", url)
+        return cast(List[Dict[str, Any]], self._handle_response(response))
+
+    async def create_group(
+        self,
+        name: str,
+        description: Optional[str] = None,
+        groupid: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Create a new private group. See :meth:`API.create_group`."""
+        payload: Dict[str, Any] = {"name": name}
+        if description:
+            payload["description"] = description
+        if groupid:
+            payload["groupid"] = groupid
+
+        response = await self._request("POST", f"{self.api_url}/groups", json=payload)
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def get_group(
+        self,
+        group_id: str,
+        expand: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Get a specific group by ID. See :meth:`API.get_group`."""
+        params: Dict[str, Any] = {}
+        if expand:
+            params["expand"] = expand
+
+        url = f"{self.api_url}/groups/{group_id}"
+        if params:
+            url += f"?{urlencode(params, doseq=True)}"
+
+        response = await self._request("GET", url)
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def update_group(
+        self,
+        group_id: str,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Update a group's properties. See :meth:`API.update_group`."""
+        payload: Dict[str, Any] = {}
+        if name is not None:
+            payload["name"] = name
+        if description is not None:
+            payload["description"] = description
+
+        if not payload:
+            raise ValueError("At least one of 'name' or 'description' must be provided")
+
+        response = await self._request("PATCH", f"{self.api_url}/groups/{group_id}", json=payload)
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def get_group_members(self, group_id: str) -> List[Dict[str, Any]]:
+        """Get members of a group. See :meth:`API.get_group_members`."""
+        response = await self._request("GET", f"{self.api_url}/groups/{group_id}/members")
+        return cast(List[Dict[str, Any]], self._handle_response(response))
+
+    async def leave_group(self, group_id: str) -> Dict[str, Any]:
+        """Leave a group. See :meth:`API.leave_group`."""
+        response = await self._request("DELETE", f"{self.api_url}/groups/{group_id}/members/me")
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def get_group_annotations(
+        self,
+        group_id: str,
+        limit: int = 200,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """Get all annotations in a group. See :meth:`API.get_group_annotations`."""
+        params: Dict[str, Any] = {"limit": limit, "offset": offset}
+        encoded_group_id = quote(group_id, safe="")
+        url = f"{self.api_url}/groups/{encoded_group_id}/annotations?{urlencode(params)}"
+
+        response = await self._request("GET", url)
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def add_group_member(
+        self,
+        group_id: str,
+        userid: str,
+        roles: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Add a user to a group. See :meth:`API.add_group_member`."""
+        payload: Dict[str, Any] = {}
+        if roles:
+            payload["roles"] = roles
+
+        encoded_group_id = quote(group_id, safe="")
+        encoded_userid = quote(userid, safe="")
+        response = await self._request(
+            "POST",
+            f"{self.api_url}/groups/{encoded_group_id}/members/{encoded_userid}",
+            json=payload,  # Always send JSON body (empty dict if no roles)
+        )
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def get_group_member(self, group_id: str, userid: str) -> Dict[str, Any]:
+        """Get a specific member's information in a group. See :meth:`API.get_group_member`."""
+        encoded_group_id = quote(group_id, safe="")
+        encoded_userid = quote(userid, safe="")
+        response = await self._request(
+            "GET",
+            f"{self.api_url}/groups/{encoded_group_id}/members/{encoded_userid}",
+        )
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def update_group_member(
+        self,
+        group_id: str,
+        userid: str,
+        roles: List[str],
+    ) -> Dict[str, Any]:
+        """Update a member's role in a group. See :meth:`API.update_group_member`."""
+        encoded_group_id = quote(group_id, safe="")
+        encoded_userid = quote(userid, safe="")
+        response = await self._request(
+            "PATCH",
+            f"{self.api_url}/groups/{encoded_group_id}/members/{encoded_userid}",
+            json={"roles": roles},
+        )
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def remove_group_member(self, group_id: str, userid: str) -> Dict[str, Any]:
+        """Remove a user from a group. See :meth:`API.remove_group_member`."""
+        encoded_group_id = quote(group_id, safe="")
+        encoded_userid = quote(userid, safe="")
+        response = await self._request(
+            "DELETE",
+            f"{self.api_url}/groups/{encoded_group_id}/members/{encoded_userid}",
+        )
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    # ========== Profile Endpoints ==========
+
+    async def get_profile(self) -> Dict[str, Any]:
+        """Get the current user's profile. See :meth:`API.get_profile`."""
+        response = await self._request("GET", f"{self.api_url}/profile")
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def get_profile_groups(
+        self,
+        authority: Optional[str] = None,
+        document_uri: Optional[str] = None,
+        expand: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get groups for the current user's profile. See :meth:`API.get_profile_groups`."""
+        params: Dict[str, Any] = {}
+        if authority:
+            params["authority"] = authority
+        if document_uri:
+            params["document_uri"] = document_uri
+        if expand:
+            params["expand"] = expand
+
+        url = f"{self.api_url}/profile/groups"
+        if params:
+            url += f"?{urlencode(params, doseq=True)}"
+
+        response = await self._request("GET", url)
+        return cast(List[Dict[str, Any]], self._handle_response(response))
+
+    async def update_profile(self, preferences: Dict[str, Any]) -> Dict[str, Any]:
+        """Update the current user's profile preferences. See :meth:`API.update_profile`."""
+        response = await self._request(
+            "PATCH",
+            f"{self.api_url}/profile",
+            json={"preferences": preferences},
+        )
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    # ========== User Endpoints (Admin) ==========
+
+    async def create_user(
+        self,
+        authority: str,
+        username: str,
+        email: str,
+        display_name: Optional[str] = None,
+        identities: Optional[List[Dict[str, str]]] = None,
+    ) -> Dict[str, Any]:
+        """Create a new user (requires admin authority). See :meth:`API.create_user`."""
+        payload: Dict[str, Any] = {
+            "authority": authority,
+            "username": username,
+            "email": email,
+        }
+        if display_name:
+            payload["display_name"] = display_name
+        if identities:
+            payload["identities"] = identities
+
+        response = await self._request("POST", f"{self.api_url}/users", json=payload)
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def get_user(self, userid: str) -> Dict[str, Any]:
+        """Get a user by ID (requires admin authority). See :meth:`API.get_user`."""
+        response = await self._request("GET", f"{self.api_url}/users/{userid}")
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    async def update_user(
+        self,
+        userid: str,
+        email: Optional[str] = None,
+        display_name: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Update a user (requires admin authority). See :meth:`API.update_user`."""
+        payload: Dict[str, Any] = {}
+        if email is not None:
+            payload["email"] = email
+        if display_name is not None:
+            payload["display_name"] = display_name
+
+        response = await self._request("PATCH", f"{self.api_url}/users/{userid}", json=payload)
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    # ========== Analytics Endpoints ==========
+
+    async def create_analytics_event(
+        self,
+        event: str,
+        properties: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Create an analytics event. See :meth:`API.create_analytics_event`."""
+        payload: Dict[str, Any] = {"event": event}
+        if properties:
+            payload["properties"] = properties
+
+        response = await self._request("POST", f"{self.api_url}/analytics/events", json=payload)
+        return cast(Dict[str, Any], self._handle_response(response))
+
+    # ========== Links Endpoints ==========
+
+    async def get_links(self) -> Dict[str, Any]:
+        """Get URL templates for generating URLs to HTML pages. See :meth:`API.get_links`."""
+        response = await self._request("GET", f"{self.api_url}/links", authenticated=False)
+        return cast(Dict[str, Any], self._handle_response(response))
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Result types for the batch methods (``API.get_annotations`` and friends).
+
+Batch methods never abort because one item failed in an expected way (for
+example a deleted or private annotation). Each item gets its own result, which
+either carries a value or the exception raised for that item.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional
+
+__all__ = ["ItemResult", "BatchReport"]
+
+BULK_ANNOTATIONS_CHUNK = 200  # annotation IDs per bulk_annotations() call
+BULK_OPERATIONS_CHUNK = 100  # operations per bulk() call
+
+
+@dataclass
+class ItemResult:
+    """
+    Outcome of one item of a batch call.
+
+    Attributes:
+        key: What the item is identified by: the annotation ID, or for
+            inputs without one (such as payloads to create), their position.
+        value: The API's response for the item, if it succeeded.
+        error: The exception raised for the item, if it failed: usually a
+            HypothesisAPIError, or ValueError for an invalid input.
+    """
+
+    key: Hashable
+    value: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the item succeeded."""
+        return self.error is None
+
+    def unwrap(self) -> Dict[str, Any]:
+        """Return the value, or raise the item's error."""
+        if self.error is not None:
+            raise self.error
+        return self.value if self.value is not None else {}
+
+
+@dataclass
+class BatchReport:
+    """
+    Summary of a batch of writes, such as ``API.update_many``.
+
+    Attributes:
+        succeeded: IDs the operation was applied to.
+        failed: Exception raised for each ID the operation failed for.
+        skipped: IDs that needed no request, e.g. an empty update or a
+            delete of an annotation that was already gone.
+    """
+
+    succeeded: List[str] = field(default_factory=list)
+    failed: Dict[str, Exception] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """True if no item failed."""
+        return not self.failed
+
+    @property
+    def total(self) -> int:
+        """Number of items processed."""
+        return len(self.succeeded) + len(self.failed) + len(self.skipped)
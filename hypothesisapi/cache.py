@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory read cache for annotations.
+
+An :class:`AnnotationCache` keeps recently read annotations for a bounded time
+(``ttl``) and in bounded number (``maxsize``, least recently used first out)::
+
+    api = API(username="me", api_key="key", annotation_cache=AnnotationCache(maxsize=5000, ttl=60))
+    api.get_annotation("abc123")   # network
+    api.get_annotation("abc123")   # cache hit
+    api.update("abc123", {...})    # invalidates "abc123"
+    print(api.annotation_cache.hits, api.annotation_cache.misses)
+
+Entries are keyed by annotation ID and whether the read was authenticated,
+since authenticated reads can see private annotations. Writes made through
+the same client invalidate the annotation; writes made elsewhere show up once
+the entry expires.
+"""
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+__all__ = ["AnnotationCache"]
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_CACHE_TTL = 300.0  # seconds
+
+
+class AnnotationCache:
+    """
+    Thread-safe LRU cache with per-entry expiry.
+
+    Attributes:
+        maxsize: Maximum number of entries kept.
+        ttl: Seconds an entry stays valid after it is stored.
+        hits: Lookups answered from the cache.
+        misses: Lookups that found no valid entry.
+        evictions: Entries dropped to stay within maxsize.
+        invalidations: Entries removed by invalidate() or clear().
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE, ttl: float = DEFAULT_CACHE_TTL) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries (default: 1024).
+            ttl: Seconds an entry stays valid (default: 300).
+
+        Raises:
+            ValueError: If maxsize is less than 1 or ttl is not positive.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # key -> (expires_at, value), least recently used first
+        self._entries: "OrderedDict[Tuple[Hashable, bool], Tuple[float, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, annotation_id: Hashable, authenticated: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Return a copy of the cached annotation, or None if absent or expired.
+        """
+        key = (annotation_id, authenticated)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry[1]
+        # Callers may modify what they get back; the cached copy stays intact
+        return copy.deepcopy(value)
+
+    def set(
+        self,
+        annotation_id: Hashable,
+        value: Dict[str, Any],
+        authenticated: bool = True,
+    ) -> None:
+        """Store a copy of an annotation, evicting the least recently used entry if full."""
+        key = (annotation_id, authenticated)
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, annotation_id: Hashable) -> None:
+        """Drop an annotation in both authenticated and anonymous modes."""
+        with self._lock:
+            for authenticated in (True, False):
+                if self._entries.pop((annotation_id, authenticated), None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry. Statistics are kept."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache (0.0 before any lookup)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the counters and current size as a dict."""
+        with self._lock:
+            size = len(self._entries)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "size": size,
+            "hit_rate": self.hit_rate,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+"""
+Adaptive concurrency for bulk workloads.
+
+:class:`AdaptiveConcurrency` is an AIMD (additive increase, multiplicative
+decrease) governor, the same scheme TCP uses for its congestion window. Each
+healthy completion raises the in-flight limit by ``1 / limit``, i.e. by about
+one per round of requests. Each throttled (429) or failed (5xx) response
+multiplies it by ``backoff``::
+
+    governor = AdaptiveConcurrency(initial=4, max_limit=32)
+    for row in api.search_parallel(concurrency=governor, tag="example"):
+        ...
+    print(governor.limit)
+
+Responses are reported by the transport for every attempt, including attempts
+that are later retried successfully, so throttling is seen even when retries
+hide it from the caller.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, Deque, Generator, Iterable, Iterator, Optional, Tuple, TypeVar
+
+__all__ = ["AdaptiveConcurrency"]
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_DONE: Any = object()  # end-of-input marker for _run_concurrently
+
+# The governor running the current task, and when that task started
+_active: ContextVar[Optional[Tuple["AdaptiveConcurrency", float]]] = ContextVar(
+    "hypothesisapi_concurrency", default=None
+)
+
+
+def _observe_response(status_code: int) -> None:
+    """Report a response status to the governor running the current task, if any."""
+    active = _active.get()
+    if active is not None and (status_code == 429 or status_code >= 500):
+        governor, started = active
+        governor.on_throttle(started)
+
+
+class AdaptiveConcurrency:
+    """
+    Thread-safe AIMD limit on the number of requests in flight.
+
+    Attributes:
+        min_limit: The limit never drops below this.
+        max_limit: The limit never rises above this; also the number of
+            worker threads used by the bulk helpers. Lowered to the
+            transport's ``pool_maxsize`` when the governor is used with a
+            smaller connection pool.
+        latency_target: Completions slower than this many seconds do not
+            raise the limit (None: latency is ignored).
+        backoff: Factor the limit is multiplied by on throttling.
+        throttle_count: Number of times the limit has been cut.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        latency_target: Optional[float] = None,
+        backoff: float = 0.5,
+    ) -> None:
+        """
+        Initialize the governor.
+
+        Args:
+            initial: Starting in-flight limit (default: 4).
+            min_limit: Lowest limit (default: 1).
+            max_limit: Highest limit (default: 32).
+            latency_target: Seconds per task above which the limit stops
+                growing (default: no target).
+            backoff: Multiplicative decrease on 429/5xx (default: 0.5).
+
+        Raises:
+            ValueError: If the limits are not ordered
+                ``1 <= min_limit <= initial <= max_limit`` or backoff is not
+                between 0 and 1.
+        """
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= initial <= max_limit")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.throttle_count = 0
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Current maximum number of requests in flight."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of tasks currently running."""
+        return self._in_flight
+
+    def acquire(self) -> float:
+        """
+        Block until a slot is free and take it.
+
+        Returns:
+            The monotonic start time to pass to :meth:`release`.
+        """
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+        return time.monotonic()
+
+    def release(self, started: float, healthy: bool = True) -> None:
+        """
+        Give back a slot taken by :meth:`acquire`.
+
+        Args:
+            started: Start time returned by acquire().
+            healthy: Whether the task succeeded. Only healthy tasks that met
+                the latency target raise the limit.
+        """
+        latency = time.monotonic() - started
+        with self._cond:
+            self._in_flight -= 1
+            if (
+                healthy
+                and started >= self._last_decrease
+                and (self.latency_target is None or latency <= self.latency_target)
+            ):
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self._cond.notify_all()
+
+    def on_throttle(self, started: float) -> None:
+        """
+        Cut the limit after a 429/5xx response.
+
+        Tasks started before the previous cut are ignored, so one burst of
+        throttled responses cuts the limit once rather than once per task.
+        """
+        with self._cond:
+            if started < self._last_decrease:
+                return
+            self._limit = max(self.min_limit, self._limit * self.backoff)
+            self._last_decrease = time.monotonic()
+            self.throttle_count += 1
+
+    def _cap(self, ceiling: int) -> None:
+        """Lower max_limit, and the limit with it, to ceiling (but not below min_limit)."""
+        with self._cond:
+            self.max_limit = max(self.min_limit, min(self.max_limit, ceiling))
+            self._limit = min(self._limit, float(self.max_limit))
+
+    def run(self, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        """Call ``fn`` in a slot, reporting its responses and latency."""
+        started = self.acquire()
+        token = _active.set((self, started))
+        healthy = False
+        try:
+            result = fn(*args, **kwargs)
+            healthy = True
+            return result
+        finally:
+            _active.reset(token)
+            self.release(started, healthy)
+
+
+def _run_concurrently(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int,
+    ordered: bool = True,
+    concurrency: Optional[AdaptiveConcurrency] = None,
+    thread_name_prefix: str = "hypothesisapi",
+    pool_maxsize: Optional[int] = None,
+) -> Generator[R, None, None]:
+    """
+    Yield ``fn(item)`` for every item, computed on a thread pool.
+
+    At most twice the worker count of results are held at once. With a
+    governor, the pool has ``concurrency.max_limit`` threads and the governor
+    decides how many of them run at a time; its max_limit is first lowered
+    to pool_maxsize, so threads never wait for (or overflow) the
+    transport's connection pool.
+
+    Args:
+        fn: Function to apply.
+        items: Inputs, consumed lazily.
+        max_workers: Thread count when no governor is given.
+        ordered: Yield results in input order (True) or as they complete.
+        concurrency: Optional AIMD governor.
+        thread_name_prefix: Name prefix for the worker threads.
+        pool_maxsize: Connections the transport keeps per host, if known.
+
+    Raises:
+        Exception: The first exception raised by fn, when its result is reached.
+    """
+    if concurrency is not None:
+        if pool_maxsize is not None:
+            concurrency._cap(pool_maxsize)
+        max_workers = concurrency.max_limit
+        task: Callable[[T], Any] = lambda item: concurrency.run(fn, item)  # noqa: E731
+    else:
+        task = fn
+
+    items = iter(items)
+    window = max_workers * 2
+    pending: Deque[Future] = deque()
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+
+    def fill() -> None:
+        while len(pending) < window:
+            item = next(items, _DONE)
+            if item is _DONE:
+                return
+            # Run in a copy of the caller's context, so settings such as
+            # HTTPCache.bypass() reach the worker
+            pending.append(executor.submit(copy_context().run, task, item))
+
+    try:
+        fill()
+        while pending:
+            if ordered:
+                future = pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = done.pop()
+                pending.remove(future)
+            result = future.result()
+            fill()
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _chain_concurrently(
+    fn: Callable[[T], Iterator[R]],
+    items: Iterable[T],
+    max_workers: int,
+    buffer: int = 2,
+    concurrency: Optional[AdaptiveConcurrency] = None,
+    thread_name_prefix: str = "hypothesisapi",
+    pool_maxsize: Optional[int] = None,
+) -> Generator[R, None, None]:
+    """
+    Yield every value of ``fn(item)`` for every item, item by item in input order.
+
+    Up to max_workers iterators run at once on a thread pool, each at most
+    ``buffer`` values ahead of the consumer, so values are yielded as they
+    are produced and at most ``max_workers * (buffer + 1)`` are held at
+    once. With a governor, each step of an iterator (typically one request)
+    runs in a governor slot, and the slot is released before the value is
+    handed over. As in :func:`_run_concurrently`, the governor's max_limit
+    is lowered to pool_maxsize.
+
+    Args:
+        fn: Function returning an iterator for an item.
+        items: Inputs, consumed lazily.
+        max_workers: Iterators run at once when no governor is given.
+        buffer: Values each iterator may produce ahead of the consumer.
+        concurrency: Optional AIMD governor.
+        thread_name_prefix: Name prefix for the worker threads.
+        pool_maxsize: Connections the transport keeps per host, if known.
+
+    Raises:
+        Exception: The first exception raised by an iterator, when its
+            position in the output is reached.
+    """
+    if concurrency is not None:
+        if pool_maxsize is not None:
+            concurrency._cap(pool_maxsize)
+        max_workers = concurrency.max_limit
+
+    items = iter(items)
+    stopped = threading.Event()
+    streams: Deque["queue.Queue[Tuple[bool, Any]]"] = deque()
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+
+    def put(out: "queue.Queue[Tuple[bool, Any]]", entry: Tuple[bool, Any]) -> bool:
+        while not stopped.is_set():
+            try:
+                out.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(item: T, out: "queue.Queue[Tuple[bool, Any]]") -> None:
+        try:
+            iterator = fn(item)
+            while True:
+                if concurrency is not None:
+                    value = concurrency.run(next, iterator, _DONE)
+                else:
+                    value = next(iterator, _DONE)
+                if not put(out, (True, value)) or value is _DONE:
+                    return
+        except BaseException as exc:
+            put(out, (False, exc))
+
+    def fill() -> None:
+        while len(streams) < max_workers:
+            item = next(items, _DONE)
+            if item is _DONE:
+                return
+            out: "queue.Queue[Tuple[bool, Any]]" = queue.Queue(maxsize=buffer)
+            executor.submit(copy_context().run, produce, item, out)
+            streams.append(out)
+
+    try:
+        fill()
+        while streams:
+            ok, value = streams[0].get()
+            if not ok:
+                raise value
+            if value is _DONE:
+                streams.popleft()
+                fill()
+                continue
+            yield value
+    finally:
+        stopped.set()
+        executor.shutdown(wait=False)
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+Time-window partitioned crawling of very large search result sets.
+
+The search endpoint has no date-range filters, but with ``sort=created`` (or
+``updated``) and ``order=asc`` a ``search_after`` value marks where a time
+window starts. :func:`crawl` splits a query's time span into windows, keeps
+splitting any window whose estimated row count is too high, walks the windows
+concurrently with cursor pagination, and merges them into one de-duplicated
+stream::
+
+    for annotation in crawl(api, wildcard_uri="https://en.wikipedia.org/*"):
+        ...
+
+The ``total`` the API reports ignores ``search_after``, so window sizes are
+estimated from the rows themselves: how much of a window the first page after
+its start covers.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Generator, Iterator, List, Optional, Tuple, Union
+
+from .concurrency import AdaptiveConcurrency, _chain_concurrently
+
+if TYPE_CHECKING:  # pragma: no cover
+    from . import API
+
+__all__ = ["crawl", "DEFAULT_MAX_WINDOW_ROWS"]
+
+DEFAULT_MAX_WINDOW_ROWS = 5000
+WINDOW_FIELDS = ("created", "updated")
+
+TimeBound = Union[datetime, str, int]
+Window = Tuple[int, int]  # (after_ms, until_ms]: after is exclusive, until inclusive
+
+
+def _to_millis(value: TimeBound) -> int:
+    """Convert a datetime, ISO 8601 string or epoch milliseconds to epoch milliseconds."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+def _edge_millis(api: "API", params: Dict[str, Any], field: str, order: str) -> Optional[int]:
+    """Window field of the first row in the given order, or None if nothing matches."""
+    rows = api._fetch_search_page({**params, "limit": 1, "order": order}).get("rows", [])
+    return _to_millis(rows[0][field]) if rows else None
+
+
+def _plan_windows(
+    api: "API",
+    params: Dict[str, Any],
+    field: str,
+    after: int,
+    until: int,
+    initial: int,
+    max_window_rows: int,
+) -> List[Tuple[Window, List[Dict[str, Any]]]]:
+    """
+    Split (after, until] into windows of at most about max_window_rows rows.
+
+    A window's size is read off the first page of rows after its start: the
+    rows up to ``until`` if the page gets past it, otherwise (a full page
+    whose last row is at time t) an estimate of ``len(page) * (until -
+    after) / (t - after)`` rows. Each window is returned with that page, so
+    walking it does not fetch the page again.
+    """
+    step = max((until - after) // initial, 1)
+    edges = list(range(after, until, step))[:initial] + [until]
+    pending = [(a, b) for a, b in zip(edges, edges[1:])]
+    page_size = params["limit"]
+
+    first_pages: Dict[int, List[Dict[str, Any]]] = {}
+
+    def first_page(edge: int) -> List[Dict[str, Any]]:
+        if edge not in first_pages:
+            page = api._fetch_search_page({**params, "search_after": edge})
+            first_pages[edge] = page.get("rows", [])
+        return first_pages[edge]
+
+    windows: List[Tuple[Window, List[Dict[str, Any]]]] = []
+    while pending:
+        a, b = pending.pop()
+        page = first_page(a)
+        covered = _to_millis(page[-1][field]) if page else b
+        if len(page) < page_size or covered > b:
+            rows = sum(1 for row in page if _to_millis(row[field]) <= b)
+        else:
+            rows = len(page) * (b - a) // max(covered - a, 1)
+        if rows > max_window_rows and b - a > 1:
+            middle = (a + b) // 2
+            pending.extend([(a, middle), (middle, b)])
+        else:
+            windows.append(((a, b), page))
+    windows.sort(key=lambda planned: planned[0])
+    return windows
+
+
+def _walk_window(
+    api: "API",
+    params: Dict[str, Any],
+    field: str,
+    window: Window,
+    first_page: List[Dict[str, Any]],
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield the rows of a window page by page, fetching pages with cursor pagination."""
+    after, until = window
+    page_params = {**params, "search_after": after}
+    rows = first_page
+    while rows:
+        in_window = [row for row in rows if _to_millis(row[field]) <= until]
+        if in_window:
+            yield in_window
+        if len(in_window) < len(rows):
+            return
+        page_params["search_after"] = rows[-1][field]
+        rows = api._fetch_search_page(page_params).get("rows", [])
+
+
+def crawl(
+    api: "API",
+    field: str = "created",
+    start: Optional[TimeBound] = None,
+    end: Optional[TimeBound] = None,
+    max_window_rows: int = DEFAULT_MAX_WINDOW_ROWS,
+    max_workers: int = 4,
+    limit: int = 200,
+    concurrency: Optional[AdaptiveConcurrency] = None,
+    **query: Any,
+) -> Generator[Dict[str, Any], None, None]:
+    """
+    Crawl every annotation matching a query, one time window per worker.
+
+    Args:
+        api: The API client to search with.
+        field: Timestamp field to partition on, "created" (default) or
+            "updated". Rows updated during a crawl can move between "updated"
+            windows, so prefer "created" for full harvests.
+        start: Earliest timestamp to include (datetime, ISO 8601 string or
+            epoch milliseconds). Defaults to the earliest matching row.
+        end: Latest timestamp to include. Defaults to the latest matching row.
+        max_window_rows: Split windows estimated to hold more rows than this
+            (default: 5000). Rows are yielded as pages arrive; windows ahead
+            of the one being yielded buffer at most two pages each.
+        max_workers: Number of windows crawled at once (default: 4).
+        limit: Rows per page (max 200).
+        concurrency: AdaptiveConcurrency governor deciding how many windows
+            are crawled at once. Replaces max_workers when given.
+        **query: Search filters, as accepted by API.search().
+
+    Yields:
+        Annotation objects in ``field`` order, de-duplicated by ``id``.
+
+    Raises:
+        ValueError: If field is not "created" or "updated", or if the query
+            sets its own sort, order, offset or cursor.
+        HypothesisAPIError: If a search request fails.
+    """
+    if field not in WINDOW_FIELDS:
+        raise ValueError(f"field must be one of {', '.join(WINDOW_FIELDS)}")
+    reserved = {"sort", "order", "offset", "search_after", "cursor"} & set(query)
+    if reserved:
+        raise ValueError(f"crawl() manages {', '.join(sorted(reserved))} itself")
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    params = api._build_search_params(cursor=True, sort=field, order="asc", limit=limit, **query)
+    return _crawl(api, params, field, start, end, max_window_rows, max_workers, concurrency)
+
+
+def _crawl(
+    api: "API",
+    params: Dict[str, Any],
+    field: str,
+    start: Optional[TimeBound],
+    end: Optional[TimeBound],
+    max_window_rows: int,
+    max_workers: int,
+    concurrency: Optional[AdaptiveConcurrency],
+) -> Generator[Dict[str, Any], None, None]:
+    """Yield crawl() rows; arguments are already validated."""
+    # Windows are (after, until]; start one millisecond early so it is included
+    first = _to_millis(start) if start is not None else _edge_millis(api, params, field, "asc")
+    last = _to_millis(end) if end is not None else _edge_millis(api, params, field, "desc")
+    if first is None or last is None or last < first:
+        return
+
+    workers = concurrency.limit if concurrency is not None else max_workers
+    windows = _plan_windows(api, params, field, first - 1, last, workers, max_window_rows)
+
+    seen_ids = set()
+    pages = _chain_concurrently(
+        lambda planned: _walk_window(api, params, field, *planned),
+        windows,
+        max_workers,
+        concurrency=concurrency,
+        thread_name_prefix="hypothesisapi-crawl",
+        pool_maxsize=api.transport.pool_maxsize,
+    )
+    try:
+        for rows in pages:
+            for row in rows:
+                row_id = row.get("id")
+                if row_id is not None:
+                    if row_id in seen_ids:
+                        continue
+                    seen_ids.add(row_id)
+                yield row
+    finally:
+        pages.close()
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Exceptions raised by the Hypothesis API clients.
+
+All exceptions are re-exported from the top-level ``hypothesisapi`` package.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+__all__ = [
+    "HypothesisAPIError",
+    "AuthenticationError",
+    "NotFoundError",
+    "ForbiddenError",
+]
+
+
+class HypothesisAPIError(Exception):
+    """Base exception for Hypothesis API errors."""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        response: Optional[str] = None,
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = response
+
+
+class AuthenticationError(HypothesisAPIError):
+    """Raised when authentication fails."""
+    pass
+
+
+class NotFoundError(HypothesisAPIError):
+    """Raised when a resource is not found."""
+    pass
+
+
+class ForbiddenError(HypothesisAPIError):
+    """Raised when user lacks permission for an action (403 Forbidden)."""
+    pass
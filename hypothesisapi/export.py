@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming export of search results.
+
+:func:`export_jsonl` writes every annotation matching a query to a JSON Lines
+file as the pages arrive, so memory use does not grow with the number of
+rows::
+
+    export_jsonl(api, "group.jsonl.gz", group="abc123", checkpoint="group.ckpt")
+
+:func:`export_parquet` writes the same rows to a Parquet file with a fixed,
+flattened schema (see :data:`PARQUET_COLUMNS`), one row group at a time; it
+requires the optional ``pyarrow`` package (``pip install hypothesisapi[parquet]``)::
+
+    export_parquet(api, "group.parquet", group="abc123")
+
+Output can be compressed with gzip or, with the optional ``zstandard``
+package (``pip install hypothesisapi[zstd]``), zstd. Rows are read with
+``sort=created``, ``order=asc`` and cursor pagination. With a checkpoint file,
+each page is completed (as its own gzip member or zstd frame) before the
+checkpoint records the page's cursor and the file size, so an interrupted
+export resumes after the last complete page. Running it again with the same
+checkpoint appends annotations created since.
+"""
+from __future__ import annotations
+
+import io
+import json
+import os
+import zlib
+from dataclasses import dataclass
+from itertools import islice
+from typing import IO, TYPE_CHECKING, Any, Dict, Generator, List, Optional, Union
+
+from .interning import Interner
+from .mirror import RESERVED_QUERY_KEYS, SYNC_PAGE_SIZE, _query_key
+from .models import _parse_timestamp
+from .selectors import extract_quote
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only without zstandard
+    zstandard = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pyarrow = None
+
+if TYPE_CHECKING:  # pragma: no cover
+    from . import API
+
+__all__ = [
+    "export_jsonl",
+    "export_parquet",
+    "flatten_annotation",
+    "ExportReport",
+    "PARQUET_COLUMNS",
+]
+
+COMPRESSIONS = ("gzip", "zstd")
+# File suffixes that select a compression when compression="auto"
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+DEFAULT_COMPRESSION_LEVEL = {"gzip": 6, "zstd": 3}
+
+DEFAULT_ROW_GROUP_SIZE = 100_000  # rows per Parquet row group
+# Parquet columns, in order, and their Arrow types
+PARQUET_COLUMNS = (
+    ("id", "string"),
+    ("created", "timestamp[us, tz=UTC]"),
+    ("updated", "timestamp[us, tz=UTC]"),
+    ("user", "string"),
+    ("uri", "string"),
+    ("group", "string"),
+    ("tags", "list<item: string>"),
+    ("text", "string"),
+    ("quote", "string"),
+)
+
+Destination = Union[str, "os.PathLike[str]", IO[Any]]
+
+
+@dataclass
+class ExportReport:
+    """
+    Outcome of one export.
+
+    Attributes:
+        rows: Rows written by this call.
+        total_rows: Rows in the output, including those written by earlier
+            runs that this one resumed.
+        resumed: Whether the export continued from a checkpoint.
+        search_after: ``created`` of the last row written, the cursor a
+            resumed export starts after.
+    """
+
+    rows: int = 0
+    total_rows: int = 0
+    resumed: bool = False
+    search_after: Optional[str] = None
+
+
+class _SegmentWriter:
+    """
+    Writes bytes to a binary file, compressing each segment into a
+    self-contained gzip member or zstd frame.
+
+    Concatenated members and frames are valid gzip and zstd files, so the
+    output can be cut after any finished segment and appended to later.
+    """
+
+    def __init__(self, raw: IO[bytes], compression: Optional[str], level: Optional[int]) -> None:
+        self.raw = raw
+        self.compression = compression
+        if level is None:
+            level = DEFAULT_COMPRESSION_LEVEL.get(compression or "", 0)
+        self.level = level
+        self._compressor: Any = None
+
+    def _start(self) -> Any:
+        if self.compression == "gzip":
+            return zlib.compressobj(self.level, zlib.DEFLATED, 31)  # wbits 31: gzip framing
+        return zstandard.ZstdCompressor(level=self.level).compressobj()
+
+    def write(self, data: bytes) -> None:
+        if self.compression is None:
+            self.raw.write(data)
+            return
+        if self._compressor is None:
+            self._compressor = self._start()
+        self.raw.write(self._compressor.compress(data))
+
+    def end_segment(self) -> None:
+        """Finish the current member or frame and flush it to the file."""
+        if self._compressor is not None:
+            self.raw.write(self._compressor.flush())
+            self._compressor = None
+        self.raw.flush()
+
+
+def _resolve_compression(destination: Destination, compression: Optional[str]) -> Optional[str]:
+    if compression == "auto":
+        if not isinstance(destination, (str, os.PathLike)):
+            return None
+        suffix = os.path.splitext(os.fspath(destination))[1].lower()
+        compression = COMPRESSION_SUFFIXES.get(suffix)
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"compression must be one of {', '.join(COMPRESSIONS)}, 'auto' or None")
+    if compression == "zstd" and zstandard is None:
+        raise ImportError(
+            "zstd compression requires zstandard. Install it with: pip install hypothesisapi[zstd]"
+        )
+    return compression
+
+
+def _read_checkpoint(path: str, query_key: str) -> Optional[dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            state: dict = json.load(f)
+    except FileNotFoundError:
+        return None
+    if state.get("query") != query_key:
+        raise ValueError(f"checkpoint {path} belongs to a different query: {state.get('query')}")
+    return state
+
+
+def _write_checkpoint(path: str, state: dict) -> None:
+    """Replace the checkpoint atomically, so it is never seen half-written."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def _check_query(function: str, query: Dict[str, Any]) -> None:
+    reserved = sorted(set(query) & set(RESERVED_QUERY_KEYS))
+    if reserved:
+        raise ValueError(f"{function}() sets these search parameters itself: {', '.join(reserved)}")
+
+
+def _search_pages(
+    api: "API",
+    query: Dict[str, Any],
+    search_after: Optional[str] = None,
+) -> Generator[List[Dict[str, Any]], None, None]:
+    """Pages of search results in ``created`` order, after ``search_after``."""
+    rows = api.search(
+        sort="created",
+        order="asc",
+        search_after=search_after,
+        cursor=True,
+        limit=SYNC_PAGE_SIZE,
+        **query,
+    )
+    while True:
+        page = list(islice(rows, SYNC_PAGE_SIZE))
+        if not page:
+            return
+        yield page
+
+
+def export_jsonl(
+    api: "API",
+    destination: Destination,
+    compression: Optional[str] = "auto",
+    checkpoint: Optional[str] = None,
+    compression_level: Optional[int] = None,
+    **query: Any,
+) -> ExportReport:
+    """
+    Stream the annotations matching a query to a JSON Lines file or stream.
+
+    Args:
+        api: Client to search with.
+        destination: Output path, or an open binary stream (or text stream,
+            when uncompressed).
+        compression: "gzip", "zstd", None, or "auto" (default) to choose from
+            the file suffix (.gz, .zst).
+        checkpoint: Path of a checkpoint file enabling resume. Only valid
+            with a path destination.
+        compression_level: Compression level (default: 6 for gzip, 3 for zstd).
+        **query: Search filters, as for API.search() (user, group, tag,
+            uri, ...).
+
+    Returns:
+        An ExportReport.
+
+    Raises:
+        ValueError: If the query sets sort, order, offset, limit,
+            search_after, cursor, prefetch or as_model; if compression is unknown or
+            used with a text stream; if a checkpoint is given for a stream or
+            belongs to another query.
+        ImportError: If zstd compression is requested without zstandard.
+        HypothesisAPIError: If a search request fails. With a checkpoint,
+            rerunning resumes after the last complete page.
+    """
+    _check_query("export_jsonl", query)
+    compression = _resolve_compression(destination, compression)
+    is_path = isinstance(destination, (str, os.PathLike))
+    if checkpoint is not None and not is_path:
+        raise ValueError("checkpoint requires a file path destination")
+    text_stream = isinstance(destination, io.TextIOBase)
+    if text_stream and compression is not None:
+        raise ValueError("compressed output needs a binary stream")
+
+    query_key = _query_key(query)
+    state = _read_checkpoint(checkpoint, query_key) if checkpoint else None
+    if state is not None and not os.path.exists(os.fspath(destination)):  # type: ignore[arg-type]
+        state = None  # output was removed: start over
+    report = ExportReport(resumed=state is not None)
+    if state is not None:
+        report.total_rows = state["rows"]
+        report.search_after = state["search_after"]
+
+    if is_path:
+        path = os.fspath(destination)  # type: ignore[arg-type]
+        raw: IO[Any] = open(path, "r+b" if state is not None else "wb")
+        if state is not None:
+            # Drop anything written after the last checkpoint
+            raw.truncate(state["offset"])
+            raw.seek(state["offset"])
+    else:
+        raw = destination  # type: ignore[assignment]
+
+    writer = _SegmentWriter(raw, compression, compression_level)
+    try:
+        for page in _search_pages(api, query, report.search_after):
+            lines = b"".join(api.codec.dumps(annotation) + b"\n" for annotation in page)
+            if text_stream:
+                raw.write(lines.decode("utf-8"))
+            else:
+                writer.write(lines)
+                writer.end_segment()
+            report.rows += len(page)
+            report.total_rows += len(page)
+            report.search_after = page[-1].get("created") or report.search_after
+            if checkpoint:
+                _write_checkpoint(checkpoint, {
+                    "query": query_key,
+                    "search_after": report.search_after,
+                    "rows": report.total_rows,
+                    "offset": raw.tell(),
+                })
+        if checkpoint and state is None and report.rows == 0:
+            _write_checkpoint(
+                checkpoint, {"query": query_key, "search_after": None, "rows": 0, "offset": 0}
+            )
+    finally:
+        if is_path:
+            raw.close()
+    return report
+
+
+def flatten_annotation(annotation: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce an annotation to the flat columns of :data:`PARQUET_COLUMNS`.
+
+    Timestamps are parsed into timezone-aware datetimes, tags default to an
+    empty list and the quote is taken from the text selectors.
+    """
+    return {
+        "id": annotation.get("id"),
+        "created": _parse_timestamp(annotation.get("created")),
+        "updated": _parse_timestamp(annotation.get("updated")),
+        "user": annotation.get("user"),
+        "uri": annotation.get("uri"),
+        "group": annotation.get("group"),
+        "tags": list(annotation.get("tags") or []),
+        "text": annotation.get("text"),
+        "quote": extract_quote(annotation),
+    }
+
+
+def _arrow_schema() -> Any:
+    return pyarrow.schema([
+        ("id", pyarrow.string()),
+        ("created", pyarrow.timestamp("us", tz="UTC")),
+        ("updated", pyarrow.timestamp("us", tz="UTC")),
+        ("user", pyarrow.string()),
+        ("uri", pyarrow.string()),
+        ("group", pyarrow.string()),
+        ("tags", pyarrow.list_(pyarrow.string())),
+        ("text", pyarrow.string()),
+        ("quote", pyarrow.string()),
+    ])
+
+
+def export_parquet(
+    api: "API",
+    path: Union[str, "os.PathLike[str]"],
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    compression: str = "zstd",
+    **query: Any,
+) -> ExportReport:
+    """
+    Stream the annotations matching a query to a Parquet file.
+
+    Rows are flattened by :func:`flatten_annotation` into typed columns
+    (see :data:`PARQUET_COLUMNS`). Each row group is collected column by
+    column and written once full, so memory is bounded by row_group_size.
+
+    Args:
+        api: Client to search with.
+        path: Output file.
+        row_group_size: Rows per Parquet row group (default: 100000).
+        compression: Parquet codec, e.g. "zstd" (default), "snappy" or "none".
+        **query: Search filters, as for API.search().
+
+    Returns:
+        An ExportReport.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+        ValueError: If the query sets sort, order, offset, limit,
+            search_after, cursor, prefetch or as_model, or row_group_size is not positive.
+        HypothesisAPIError: If a search request fails. The file is closed
+            holding the row groups completed before the failure.
+    """
+    if pyarrow is None:
+        raise ImportError(
+            "export_parquet requires pyarrow. Install it with: pip install hypothesisapi[parquet]"
+        )
+    _check_query("export_parquet", query)
+    if row_group_size < 1:
+        raise ValueError("row_group_size must be at least 1")
+
+    schema = _arrow_schema()
+    names = [name for name, _ in PARQUET_COLUMNS]
+    report = ExportReport()
+    columns: Dict[str, List[Any]] = {name: [] for name in names}
+    # Buffered rows share their repeated user/group/uri/tag strings
+    interner = Interner()
+
+    def write_row_group() -> None:
+        table = pyarrow.Table.from_pydict(columns, schema=schema)
+        writer.write_table(table, row_group_size=row_group_size)
+        for values in columns.values():
+            values.clear()
+        interner.clear()
+
+    with pyarrow.parquet.ParquetWriter(os.fspath(path), schema, compression=compression) as writer:
+        for page in _search_pages(api, query):
+            for annotation in page:
+                flat = flatten_annotation(interner.annotation(annotation))
+                for name in names:
+                    columns[name].append(flat[name])
+                report.rows += 1
+                if len(columns["id"]) >= row_group_size:
+                    write_row_group()
+            report.search_after = page[-1].get("created") or report.search_after
+        if columns["id"]:
+            write_row_group()
+    report.total_rows = report.rows
+    return report
@@ -0,0 +1,476 @@
+# -*- coding: utf-8 -*-
+"""
+Conditional-request HTTP cache used by the transport.
+
+The cache keeps the body and validators (``ETag``, ``Last-Modified``) of GET
+responses. While an entry is fresh it is served without a request. Once it
+goes stale, the next GET is sent with ``If-None-Match`` / ``If-Modified-Since``,
+and a ``304 Not Modified`` reply is answered from the stored body, so the
+payload is not downloaded again::
+
+    cache = HTTPCache(freshness={"get_groups": 300, "get_profile": 60})
+    api = API(username="me", api_key="key", http_cache=cache)
+
+Freshness is configured per endpoint, named after the API method that calls it
+(see :data:`ENDPOINTS`), with ``"default"`` for everything else. The default
+freshness is 0: every read is revalidated, which is always correct and still
+saves the download when nothing changed.
+
+Entries are stored in a pluggable backend; :class:`MemoryCacheBackend` is used
+unless another is given. :class:`SQLiteCacheBackend` keeps them in a file, so a
+new process or notebook kernel starts warm::
+
+    cache = HTTPCache(
+        backend=SQLiteCacheBackend("~/.cache/hypothesisapi.sqlite"),
+        freshness={"search": 3600, "default": 600},
+    )
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Generator, Iterable, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+__all__ = ["HTTPCache", "MemoryCacheBackend", "SQLiteCacheBackend", "CacheEntry", "ENDPOINTS"]
+
+# Endpoint names (API method names) and the URL paths they read, matched in order
+ENDPOINTS: Tuple[Tuple[str, "re.Pattern[str]"], ...] = (
+    ("get_profile_groups", re.compile(r"/profile/groups$")),
+    ("get_profile", re.compile(r"/profile$")),
+    ("get_group_members", re.compile(r"/groups/[^/]+/members$")),
+    ("get_group_member", re.compile(r"/groups/[^/]+/members/[^/]+$")),
+    ("get_group_annotations", re.compile(r"/groups/[^/]+/annotations$")),
+    ("get_group", re.compile(r"/groups/[^/]+$")),
+    ("get_groups", re.compile(r"/groups$")),
+    ("get_annotation", re.compile(r"/annotations/[^/]+$")),
+    ("get_user", re.compile(r"/users/[^/]+$")),
+    ("get_links", re.compile(r"/links$")),
+    ("search", re.compile(r"/search$")),
+    ("root", re.compile(r"/api/?$")),
+)
+DEFAULT_ENDPOINT = "default"
+
+# Response headers kept with a cached body
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control", "Date")
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_SQLITE_MAX_ENTRIES = 100_000
+SQLITE_BUSY_TIMEOUT = 30.0  # seconds a writer waits for another process's lock
+SQLITE_ACCESS_RESOLUTION = 60.0  # seconds between accessed_at updates for an entry
+
+_bypass: ContextVar[bool] = ContextVar("hypothesisapi_cache_bypass", default=False)
+
+
+def endpoint_for(url: str) -> str:
+    """Name the endpoint a URL belongs to, or "default"."""
+    path = urlsplit(url).path
+    for name, pattern in ENDPOINTS:
+        if pattern.search(path):
+            return name
+    return DEFAULT_ENDPOINT
+
+
+@dataclass
+class CacheEntry:
+    """
+    A stored GET response.
+
+    Attributes:
+        url: Request URL.
+        status: HTTP status of the stored response.
+        headers: Stored response headers (see STORED_HEADERS).
+        body: Raw response body.
+        stored_at: Wall-clock time (epoch seconds) the body was last confirmed.
+    """
+
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    stored_at: float = field(default_factory=time.time)
+
+    @property
+    def etag(self) -> Optional[str]:
+        return CaseInsensitiveDict(self.headers).get("ETag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return CaseInsensitiveDict(self.headers).get("Last-Modified")
+
+    def to_response(self) -> requests.Response:
+        """Build a response carrying the stored body, marked ``from_cache``."""
+        response = requests.Response()
+        response.status_code = self.status
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        # Marked consumed so iter_content() replays the stored body
+        response._content_consumed = True  # type: ignore[attr-defined]
+        response.url = self.url
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.from_cache = True  # type: ignore[attr-defined]
+        return response
+
+
+class MemoryCacheBackend:
+    """Thread-safe in-process storage, least recently used entries evicted first."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete_urls(self, urls: Iterable[str]) -> None:
+        """Drop the entries for these URLs under every credential."""
+        urls = set(urls)
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e.url in urls]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """
+    Persistent storage in an SQLite file, shared by threads and processes.
+
+    The database runs in WAL mode, so readers never block the writer, and
+    writers from other processes wait up to ``timeout`` seconds for the lock.
+    Each thread uses its own connection. Once more than ``max_entries`` are
+    stored, the least recently read ones are deleted. To keep reads and
+    writes cheap, an entry's read time is only rewritten once it is
+    ``SQLITE_ACCESS_RESOLUTION`` seconds old, and the entry count is only
+    checked every ``max_entries // 100`` writes, so the cache can briefly
+    hold about 1% more entries than ``max_entries``.
+    """
+
+    _SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            status INTEGER NOT NULL,
+            headers TEXT NOT NULL,
+            body BLOB NOT NULL,
+            stored_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS responses_url ON responses (url)",
+        "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = DEFAULT_SQLITE_MAX_ENTRIES,
+        timeout: float = SQLITE_BUSY_TIMEOUT,
+    ) -> None:
+        """
+        Open (creating if needed) a cache database.
+
+        Args:
+            path: Database file; ``~`` is expanded and missing parent
+                directories are created.
+            max_entries: Entries kept before the least recently read are
+                evicted (default: 100000).
+            timeout: Seconds to wait for a lock held by another connection.
+
+        Raises:
+            ValueError: If max_entries is less than 1.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.path = os.path.expanduser(path)
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._evict_every = max(1, max_entries // 100)
+        self._writes = 0
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        for statement in self._SCHEMA:
+            conn.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit: every statement is its own short transaction
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT url, status, headers, body, stored_at, accessed_at"
+            " FROM responses WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        url, status, headers, body, stored_at, accessed_at = row
+        now = time.time()
+        if now - accessed_at >= SQLITE_ACCESS_RESOLUTION:
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return CacheEntry(
+            url=url,
+            status=status,
+            headers=json.loads(headers),
+            body=bytes(body),
+            stored_at=stored_at,
+        )
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                entry.url,
+                entry.status,
+                json.dumps(entry.headers),
+                entry.body,
+                entry.stored_at,
+                time.time(),
+            ),
+        )
+        with self._lock:
+            self._writes += 1
+            if self._writes % self._evict_every:
+                return
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+
+    def delete_urls(self, urls: Iterable[str]) -> None:
+        """Drop the entries for these URLs under every credential."""
+        self._connection().executemany(
+            "DELETE FROM responses WHERE url = ?", [(url,) for url in set(urls)]
+        )
+
+    def purge(self, older_than: float) -> int:
+        """
+        Delete entries last confirmed more than ``older_than`` seconds ago.
+
+        Returns:
+            Number of entries deleted.
+        """
+        cursor = self._connection().execute(
+            "DELETE FROM responses WHERE stored_at < ?", (time.time() - older_than,)
+        )
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Close every thread's connection."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def __len__(self) -> int:
+        count: int = self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return count
+
+
+class HTTPCache:
+    """
+    Conditional-request cache for GET responses.
+
+    Attributes:
+        backend: Where entries are stored.
+        freshness: Seconds an entry is served without revalidation, by
+            endpoint name; ``"default"`` covers unlisted endpoints.
+        hits: GETs answered from a fresh entry without a request.
+        revalidations: GETs answered by a 304 reply and the stored body.
+        misses: GETs that downloaded a body.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[Any] = None,
+        freshness: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            backend: Entry storage (default: a new MemoryCacheBackend). Any
+                object with get(key), set(key, entry), delete_urls(urls) and
+                clear() methods works.
+            freshness: Seconds each endpoint's entries may be served without
+                asking the server, e.g. ``{"get_groups": 300, "default": 0}``.
+                Endpoint names are the keys of :data:`ENDPOINTS`.
+
+        Raises:
+            ValueError: If freshness names an unknown endpoint.
+        """
+        known = {name for name, _ in ENDPOINTS} | {DEFAULT_ENDPOINT}
+        unknown = set(freshness or {}) - known
+        if unknown:
+            raise ValueError(f"unknown endpoints in freshness: {', '.join(sorted(unknown))}")
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.freshness: Dict[str, float] = {DEFAULT_ENDPOINT: 0.0, **(freshness or {})}
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, headers: Optional[Mapping[str, str]]) -> str:
+        """Cache key for a URL read with the given credentials (never stored in clear)."""
+        authorization = (headers or {}).get("Authorization")
+        if authorization is None:
+            return f"anonymous {url}"
+        digest = hashlib.sha256(authorization.encode("utf-8")).hexdigest()[:16]
+        return f"{digest} {url}"
+
+    def freshness_for(self, url: str) -> float:
+        """Seconds an entry for this URL is served without revalidation."""
+        endpoint = endpoint_for(url)
+        return self.freshness.get(endpoint, self.freshness[DEFAULT_ENDPOINT])
+
+    @contextmanager
+    def bypass(self) -> Generator[None, None, None]:
+        """
+        Read from the network inside this block, refreshing stored entries.
+
+        Example:
+            >>> with api.transport.http_cache.bypass():
+            ...     groups = api.get_groups()
+        """
+        token = _bypass.set(True)
+        try:
+            yield
+        finally:
+            _bypass.reset(token)
+
+    def lookup(self, url: str, headers: Optional[Mapping[str, str]]) -> Optional[CacheEntry]:
+        """Return the stored entry for a GET, unless bypassed."""
+        if _bypass.get():
+            return None
+        return self.backend.get(self.key(url, headers))
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.stored_at < self.freshness_for(entry.url)
+
+    @staticmethod
+    def conditional_headers(entry: CacheEntry) -> Dict[str, str]:
+        """Validators to send when revalidating an entry."""
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def record_hit(self) -> None:
+        """Count a GET answered from a fresh entry; safe to call from any thread."""
+        with self._stats_lock:
+            self.hits += 1
+
+    def record_revalidation(self) -> None:
+        """Count a GET answered by a 304 reply; safe to call from any thread."""
+        with self._stats_lock:
+            self.revalidations += 1
+
+    def record_miss(self) -> None:
+        """Count a GET that downloaded a body; safe to call from any thread."""
+        with self._stats_lock:
+            self.misses += 1
+
+    def store(self, url: str, headers: Optional[Mapping[str, str]], response: Any) -> None:
+        """Keep a 200 response if it can be revalidated or served while fresh."""
+        cache_control = response.headers.get("Cache-Control", "")
+        if response.status_code != 200 or "no-store" in cache_control:
+            return
+        stored = {
+            name: response.headers[name] for name in STORED_HEADERS if name in response.headers
+        }
+        has_validator = "ETag" in stored or "Last-Modified" in stored
+        if not has_validator and self.freshness_for(url) <= 0:
+            return
+        entry = CacheEntry(
+            url=url, status=200, headers=stored, body=response.content, stored_at=time.time()
+        )
+        self.backend.set(self.key(url, headers), entry)
+
+    def refresh(
+        self,
+        entry: CacheEntry,
+        headers: Optional[Mapping[str, str]],
+        response: Any,
+    ) -> CacheEntry:
+        """Record that a 304 reply confirmed an entry, taking any updated validators."""
+        updated = dict(entry.headers)
+        for name in STORED_HEADERS:
+            if name in response.headers:
+                updated[name] = response.headers[name]
+        entry = replace(entry, headers=updated, stored_at=time.time())
+        self.backend.set(self.key(entry.url, headers), entry)
+        return entry
+
+    def invalidate(self, url: str) -> None:
+        """
+        Drop entries made stale by a write to ``url``: the URL itself and its
+        parent resource (a write to ``/annotations/abc/hide`` changes
+        ``/annotations/abc``).
+        """
+        base = url.split("?", 1)[0]
+        self.backend.delete_urls({url, base, base.rsplit("/", 1)[0]})
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self.backend.clear()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Sharing of repeated values between annotations.
+
+In a bulk result set the same ``user``, ``group``, ``uri``, tags,
+``document.title`` and ``permissions`` occur on thousands of rows, and each
+decoded row holds its own copy. An :class:`Interner` replaces every such
+value with one shared instance, so memory grows with the number of distinct
+values rather than the number of rows::
+
+    rows = list(api.search(group="abc123", intern=True))
+
+Shared permissions dicts and title lists are the same object on every row
+that has them: copy one before modifying it.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Hashable, List, Optional, Union
+
+__all__ = ["Interner"]
+
+
+class Interner:
+    """
+    Table of shared strings and structures.
+
+    One interner can be passed to several searches so that they share
+    values; its tables are kept until it is discarded or cleared.
+
+    Attributes:
+        strings: Number of distinct strings held.
+        structures: Number of distinct permissions dicts and title lists held.
+    """
+
+    def __init__(self) -> None:
+        self._strings: Dict[str, str] = {}
+        self._structures: Dict[Hashable, Any] = {}
+
+    @property
+    def strings(self) -> int:
+        return len(self._strings)
+
+    @property
+    def structures(self) -> int:
+        return len(self._structures)
+
+    def string(self, value: Any) -> Any:
+        """Return the shared copy of a string; other values are returned as is."""
+        if value.__class__ is not str:
+            return value
+        return self._strings.setdefault(value, value)
+
+    def annotation(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Replace repeated values in an annotation with shared ones, in place.
+
+        Interns ``user``, ``group``, ``uri``, tags, and each target's
+        ``source`` and selector types, and shares equal ``permissions``
+        dicts and ``document.title`` lists.
+
+        Args:
+            row: An annotation as returned by the API.
+
+        Returns:
+            The same dict.
+        """
+        string = self.string
+        for key in ("user", "group", "uri"):
+            if key in row:
+                row[key] = string(row[key])
+        tags = row.get("tags")
+        if tags.__class__ is list:
+            for i, tag in enumerate(tags):
+                tags[i] = string(tag)
+        for target in row.get("target") or ():
+            if target.__class__ is not dict:
+                continue
+            if "source" in target:
+                target["source"] = string(target["source"])
+            for selector in target.get("selector") or ():
+                if selector.__class__ is dict and "type" in selector:
+                    selector["type"] = string(selector["type"])
+        permissions = row.get("permissions")
+        if permissions.__class__ is dict:
+            row["permissions"] = self._share_permissions(permissions)
+        document = row.get("document")
+        if document.__class__ is dict and document.get("title").__class__ is list:
+            document["title"] = self._share_list(document["title"])
+        return row
+
+    def _share_permissions(self, permissions: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            key = ("permissions",) + tuple(
+                (name, tuple(value) if value.__class__ is list else value)
+                for name, value in permissions.items()
+            )
+            shared = self._structures.get(key)
+        except TypeError:  # unhashable contents; keep the row's own copy
+            return permissions
+        if shared is None:
+            string = self.string
+            shared = self._structures[key] = {
+                string(name): [string(p) for p in value] if value.__class__ is list else value
+                for name, value in permissions.items()
+            }
+        return shared
+
+    def _share_list(self, values: List[Any]) -> List[Any]:
+        try:
+            key = ("list",) + tuple(values)
+            shared = self._structures.get(key)
+        except TypeError:
+            return values
+        if shared is None:
+            shared = self._structures[key] = [self.string(value) for value in values]
+        return shared
+
+    def clear(self) -> None:
+        """Drop every shared value (rows already interned keep theirs)."""
+        self._strings.clear()
+        self._structures.clear()
+
+    def __len__(self) -> int:
+        return len(self._strings) + len(self._structures)
+
+
+def _resolve_interner(intern: Union[bool, Interner]) -> Optional[Interner]:
+    """Turn an ``intern=`` argument into an interner, or None when disabled."""
+    if isinstance(intern, Interner):
+        return intern
+    return Interner() if intern else None
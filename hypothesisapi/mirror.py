@@ -0,0 +1,573 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental local mirror of search results in SQLite.
+
+A :class:`Mirror` copies the annotations matching a query into a local
+database. The first sync loads everything; later syncs ask only for rows whose
+``updated`` is later than the newest one already stored (``sort=updated``,
+``order=asc``, ``search_after``), so keeping a large mirror current costs one
+request per 200 changed annotations::
+
+    mirror = Mirror("~/hypothesis/mirror.sqlite")
+    mirror.sync(api, group="abc123")       # full load the first time
+    mirror.sync(api, group="abc123")       # only what changed since
+    mirror.prune(api, group="abc123")      # drop annotations deleted upstream
+
+Each query keeps its own high-water mark; rows from several queries share one
+annotation table. Rows are committed a page at a time together with the mark,
+so an interrupted sync resumes where it stopped.
+
+Search results never include deleted annotations, so deletions are only
+detected on request, by :meth:`Mirror.prune`.
+
+Once mirrored, annotations can be queried locally with :meth:`Mirror.search`,
+which takes the filters of ``API.search()`` plus date ranges and answers them
+from secondary indexes (user, uri, group, tag, created, updated) and an FTS5
+full-text index over the text and highlighted quote::
+
+    for annotation in mirror.search(tag="climate", text="sea level",
+                                    created_after="2024-01-01"):
+        ...
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, Generator, Iterable, List, Optional, Tuple, Union
+
+from .exceptions import NotFoundError
+from .interning import Interner, _resolve_interner
+from .selectors import extract_quote
+
+if TYPE_CHECKING:  # pragma: no cover
+    from . import API
+
+__all__ = ["Mirror", "SyncReport"]
+
+SYNC_PAGE_SIZE = 200  # rows per search page and per committed transaction
+# Search parameters the mirror controls itself
+RESERVED_QUERY_KEYS = (
+    "sort", "order", "offset", "limit", "search_after", "cursor", "prefetch", "as_model",
+)
+# search() sort fields and the columns they order by
+SORT_COLUMNS = {
+    "created": "created",
+    "updated": "updated",
+    "id": "id",
+    "group": "group_id",
+    "user": "user",
+}
+
+TimeBound = Union[datetime, str]
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS annotations (
+        id TEXT PRIMARY KEY,
+        created TEXT,
+        updated TEXT,
+        user TEXT,
+        uri TEXT,
+        group_id TEXT,
+        text TEXT,
+        quote TEXT,
+        tags TEXT NOT NULL,
+        data TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS annotations_updated ON annotations (updated)",
+    "CREATE INDEX IF NOT EXISTS annotations_created ON annotations (created)",
+    "CREATE INDEX IF NOT EXISTS annotations_user ON annotations (user, updated)",
+    "CREATE INDEX IF NOT EXISTS annotations_uri ON annotations (uri, updated)",
+    "CREATE INDEX IF NOT EXISTS annotations_group ON annotations (group_id, updated)",
+    # Tags, lowercased, one row per annotation and tag; kept in step by triggers
+    """CREATE TABLE IF NOT EXISTS annotation_tags (
+        tag TEXT NOT NULL,
+        id TEXT NOT NULL,
+        PRIMARY KEY (tag, id)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS annotation_tags_id ON annotation_tags (id)",
+    """CREATE TRIGGER IF NOT EXISTS annotations_tags_insert AFTER INSERT ON annotations BEGIN
+        INSERT OR IGNORE INTO annotation_tags SELECT lower(value), new.id FROM json_each(new.tags);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS annotations_tags_update AFTER UPDATE ON annotations BEGIN
+        DELETE FROM annotation_tags WHERE id = old.id;
+        INSERT OR IGNORE INTO annotation_tags SELECT lower(value), new.id FROM json_each(new.tags);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS annotations_tags_delete AFTER DELETE ON annotations BEGIN
+        DELETE FROM annotation_tags WHERE id = old.id;
+    END""",
+    """CREATE TABLE IF NOT EXISTS sync_state (
+        query TEXT PRIMARY KEY,
+        high_water TEXT,
+        synced_at REAL NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS deletions (
+        id TEXT PRIMARY KEY,
+        deleted_at REAL NOT NULL
+    )""",
+)
+
+# Full-text index over text and quote, sharing rowids with annotations.
+# Only created where SQLite was built with FTS5.
+_FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS annotations_fts USING fts5(text, quote)",
+    """CREATE TRIGGER IF NOT EXISTS annotations_fts_insert AFTER INSERT ON annotations BEGIN
+        INSERT INTO annotations_fts (rowid, text, quote) VALUES (new.rowid, new.text, new.quote);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS annotations_fts_update AFTER UPDATE ON annotations BEGIN
+        DELETE FROM annotations_fts WHERE rowid = old.rowid;
+        INSERT INTO annotations_fts (rowid, text, quote) VALUES (new.rowid, new.text, new.quote);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS annotations_fts_delete AFTER DELETE ON annotations BEGIN
+        DELETE FROM annotations_fts WHERE rowid = old.rowid;
+    END""",
+)
+
+_UPSERT = (
+    "INSERT INTO annotations (id, created, updated, user, uri, group_id, text, quote, tags, data) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (id) DO UPDATE SET created = excluded.created, updated = excluded.updated, "
+    "user = excluded.user, uri = excluded.uri, group_id = excluded.group_id, text = excluded.text, "
+    "quote = excluded.quote, tags = excluded.tags, data = excluded.data"
+)
+
+
+@dataclass
+class SyncReport:
+    """
+    Outcome of one :meth:`Mirror.sync`.
+
+    Attributes:
+        upserted: Rows inserted or replaced.
+        full: Whether every matching row was requested (first sync or
+            ``full=True``) rather than only those updated since the last one.
+        high_water: ``updated`` of the newest stored row after the sync.
+    """
+
+    upserted: int = 0
+    full: bool = False
+    high_water: Optional[str] = None
+
+
+def _query_key(query: Dict[str, Any]) -> str:
+    """Canonical text form of a query, used to keep its sync state."""
+    return json.dumps({k: v for k, v in query.items() if v is not None}, sort_keys=True)
+
+
+def _row_values(annotation: Dict[str, Any]) -> tuple:
+    return (
+        annotation["id"],
+        annotation.get("created"),
+        annotation.get("updated"),
+        annotation.get("user"),
+        annotation.get("uri"),
+        annotation.get("group"),
+        annotation.get("text"),
+        extract_quote(annotation),
+        json.dumps(annotation.get("tags") or []),
+        json.dumps(annotation),
+    )
+
+
+def _to_iso(value: TimeBound) -> str:
+    """Format a bound the way the API formats timestamps (UTC, ISO 8601)."""
+    if isinstance(value, str):
+        return value
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+def _wildcard_to_glob(pattern: str) -> str:
+    """Translate a wildcard_uri pattern (``*`` any run, ``_`` one character) to GLOB."""
+    special = {"*": "*", "_": "?", "?": "[?]", "[": "[[]", "]": "[]]"}
+    return "".join(special.get(char, char) for char in pattern)
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class Mirror:
+    """
+    Local SQLite copy of the annotations matching one or more queries.
+
+    The database runs in WAL mode, so it can be read (for example by a
+    notebook) while a sync writes to it. Each thread uses its own connection.
+
+    Attributes:
+        path: Database file.
+        full_text: Whether text filters use the FTS5 index (False where
+            SQLite lacks FTS5; substring matching is used instead).
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open (creating if needed) a mirror database.
+
+        Args:
+            path: Database file; ``~`` is expanded and missing parent
+                directories are created.
+        """
+        self.path = os.path.expanduser(path)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        try:
+            for statement in _FTS_SCHEMA:
+                conn.execute(statement)
+            self.full_text = True
+        except sqlite3.OperationalError:
+            # No FTS5: text filters fall back to substring matches
+            self.full_text = False
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self) -> None:
+        """Close every thread's connection."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def __enter__(self) -> "Mirror":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # ========== Syncing ==========
+
+    def high_water(self, **query: Any) -> Optional[str]:
+        """``updated`` of the newest row synced for this query, or None if never synced."""
+        row = self._connection().execute(
+            "SELECT high_water FROM sync_state WHERE query = ?", (_query_key(query),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def sync(self, api: "API", full: bool = False, **query: Any) -> SyncReport:
+        """
+        Bring the mirror up to date for a query.
+
+        Args:
+            api: Client to search with.
+            full: Request every matching row even if the query was synced
+                before (default: only rows updated since the last sync).
+            **query: Search filters, as for API.search() (user, group, tag,
+                uri, wildcard_uri, ...).
+
+        Returns:
+            A SyncReport.
+
+        Raises:
+            ValueError: If query sets a parameter the mirror controls (sort,
+                order, offset, limit, search_after, cursor, prefetch, as_model).
+            HypothesisAPIError: If a search request fails. Pages committed
+                before the failure are kept.
+        """
+        reserved = sorted(set(query) & set(RESERVED_QUERY_KEYS))
+        if reserved:
+            raise ValueError(f"sync() sets these search parameters itself: {', '.join(reserved)}")
+        key = _query_key(query)
+        mark = None if full else self.high_water(**query)
+        report = SyncReport(full=mark is None, high_water=mark)
+
+        rows = api.search(
+            sort="updated",
+            order="asc",
+            search_after=mark,
+            cursor=True,
+            limit=SYNC_PAGE_SIZE,
+            **query,
+        )
+        conn = self._connection()
+        while True:
+            page = list(islice(rows, SYNC_PAGE_SIZE))
+            if not page:
+                break
+            report.high_water = page[-1].get("updated") or report.high_water
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(_UPSERT, [_row_values(annotation) for annotation in page])
+                self._save_state(conn, key, report.high_water)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            report.upserted += len(page)
+        if report.upserted == 0:
+            self._save_state(conn, key, report.high_water)
+        return report
+
+    @staticmethod
+    def _save_state(conn: sqlite3.Connection, key: str, high_water: Optional[str]) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+            (key, high_water, time.time()),
+        )
+
+    def prune(
+        self,
+        api: "API",
+        ids: Optional[Iterable[str]] = None,
+        max_workers: int = 8,
+        **query: Any,
+    ) -> List[str]:
+        """
+        Remove annotations that no longer exist upstream and record them as deleted.
+
+        Each candidate is looked up with API.get_annotations(); those answered
+        with 404 are deleted locally and listed in the ``deletions`` table.
+        Annotations that became unreadable (403) are kept.
+
+        Args:
+            api: Client to look annotations up with.
+            ids: Annotation IDs to check (default: every mirrored row matching
+                ``query``).
+            max_workers: Concurrent lookups.
+            **query: Filters, as for search(), selecting the rows to check
+                when ids is not given.
+
+        Returns:
+            The removed IDs.
+        """
+        if ids is None:
+            where, params = self._where(**self._normalize(query))
+            rows = self._connection().execute(f"SELECT id FROM annotations{where}", params)
+            ids = [row[0] for row in rows]
+        deleted = [
+            str(result.key)
+            for result in api.get_annotations(list(ids), max_workers=max_workers)
+            if isinstance(result.error, NotFoundError)
+        ]
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("DELETE FROM annotations WHERE id = ?", [(i,) for i in deleted])
+            conn.executemany(
+                "INSERT OR REPLACE INTO deletions VALUES (?, ?)", [(i, now) for i in deleted]
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return deleted
+
+    # ========== Local queries ==========
+
+    def get(self, annotation_id: str) -> Optional[Dict[str, Any]]:
+        """Return a mirrored annotation, or None."""
+        row = self._connection().execute(
+            "SELECT data FROM annotations WHERE id = ?", (annotation_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def search(
+        self,
+        user: Optional[str] = None,
+        authority: Optional[str] = None,
+        uri: Optional[str] = None,
+        url: Optional[str] = None,
+        wildcard_uri: Optional[str] = None,
+        text: Optional[str] = None,
+        any_field: Optional[str] = None,
+        tag: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        group: Optional[str] = None,
+        quote: Optional[str] = None,
+        references: Optional[str] = None,
+        sort: Optional[str] = None,
+        order: str = "asc",
+        offset: int = 0,
+        limit: Optional[int] = None,
+        created_after: Optional[TimeBound] = None,
+        created_before: Optional[TimeBound] = None,
+        updated_after: Optional[TimeBound] = None,
+        updated_before: Optional[TimeBound] = None,
+        intern: Union[bool, Interner] = False,
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Search the mirror without touching the network.
+
+        Takes the filters of API.search() and answers them from the local
+        indexes: ``user``, ``uri``, ``group`` and the date ranges are
+        indexed columns, each tag is looked up in a tag index, and ``text``,
+        ``quote`` and ``any_field`` are full-text matches (every word must
+        occur) over the annotation text and its highlighted quote.
+
+        Args:
+            user, authority, uri, url, wildcard_uri, tag, tags, group,
+            references, sort, order, offset: As for API.search().
+            text: Words that must all occur in the annotation text.
+            any_field: Words that must all occur in the text or the quote.
+            quote: Words that must all occur in the highlighted quote.
+            limit: Maximum rows returned (default: all matches). Unlike
+                API.search() this is not a page size.
+            created_after, created_before, updated_after, updated_before:
+                Exclusive bounds on ``created``/``updated``, as datetimes or
+                ISO 8601 strings.
+            intern: Share repeated values between the rows, as for
+                API.search().
+
+        Yields:
+            Matching annotations, ordered by ``sort`` (default: updated).
+
+        Raises:
+            ValueError: If sort or order is not supported.
+        """
+        sort = sort or "updated"
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_COLUMNS)}")
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be 'asc' or 'desc'")
+        where, params = self._where(
+            user=user,
+            authority=authority,
+            uri=uri or url,
+            wildcard_uri=wildcard_uri,
+            text=text,
+            any_field=any_field,
+            tags=([tag] if tag else []) + list(tags or []),
+            group=group,
+            quote=quote,
+            references=references,
+            created_after=created_after,
+            created_before=created_before,
+            updated_after=updated_after,
+            updated_before=updated_before,
+        )
+        direction = order.upper()
+        sql = (
+            f"SELECT data FROM annotations{where} "
+            f"ORDER BY {SORT_COLUMNS[sort]} {direction}, id {direction} LIMIT ? OFFSET ?"
+        )
+        cursor = self._connection().execute(sql, [*params, -1 if limit is None else limit, offset])
+        interner = _resolve_interner(intern)
+        for (data,) in cursor:
+            row = json.loads(data)
+            yield interner.annotation(row) if interner is not None else row
+
+    def count(self, **filters: Any) -> int:
+        """Number of mirrored annotations matching search() filters."""
+        where, params = self._where(**self._normalize(filters))
+        cursor = self._connection().execute(f"SELECT COUNT(*) FROM annotations{where}", params)
+        count: int = cursor.fetchone()[0]
+        return count
+
+    @staticmethod
+    def _normalize(filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn search() keyword filters into _where() arguments."""
+        filters = dict(filters)
+        tag = filters.pop("tag", None)
+        filters["tags"] = ([tag] if tag else []) + list(filters.pop("tags", None) or [])
+        url = filters.pop("url", None)
+        filters["uri"] = filters.get("uri") or url
+        return filters
+
+    def _where(
+        self,
+        user: Optional[str] = None,
+        authority: Optional[str] = None,
+        uri: Optional[str] = None,
+        wildcard_uri: Optional[str] = None,
+        text: Optional[str] = None,
+        any_field: Optional[str] = None,
+        tags: Iterable[str] = (),
+        group: Optional[str] = None,
+        quote: Optional[str] = None,
+        references: Optional[str] = None,
+        created_after: Optional[TimeBound] = None,
+        created_before: Optional[TimeBound] = None,
+        updated_after: Optional[TimeBound] = None,
+        updated_before: Optional[TimeBound] = None,
+    ) -> Tuple[str, List[Any]]:
+        """Build the WHERE clause and parameters for search() filters."""
+        clauses: List[str] = []
+        params: List[Any] = []
+        if user:
+            clauses.append("user = ?")
+            if not user.startswith("acct:"):
+                user = f"acct:{user}@{authority or 'hypothes.is'}"
+            params.append(user)
+        if uri:
+            clauses.append("uri = ?")
+            params.append(uri)
+        if wildcard_uri:
+            clauses.append("uri GLOB ?")
+            params.append(_wildcard_to_glob(wildcard_uri))
+        if group:
+            clauses.append("group_id = ?")
+            params.append(group)
+        for tag in tags:
+            clauses.append("id IN (SELECT id FROM annotation_tags WHERE tag = lower(?))")
+            params.append(tag)
+        if references:
+            clauses.append(
+                "EXISTS (SELECT 1 FROM json_each(annotations.data, '$.references') WHERE value = ?)"
+            )
+            params.append(references)
+        for column, op, bound in (
+            ("created", ">", created_after),
+            ("created", "<", created_before),
+            ("updated", ">", updated_after),
+            ("updated", "<", updated_before),
+        ):
+            if bound is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(_to_iso(bound))
+        for columns, words in (("text", text), ("quote", quote), ("{text quote}", any_field)):
+            if words:
+                clause, values = self._match(columns, words)
+                clauses.append(clause)
+                params.extend(values)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def _match(self, columns: str, words: str) -> Tuple[str, List[Any]]:
+        """Clause requiring every word of ``words`` in the given columns."""
+        terms = words.split()
+        if self.full_text:
+            query = " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+            return (
+                "rowid IN (SELECT rowid FROM annotations_fts WHERE annotations_fts MATCH ?)",
+                [f"{columns} : ({query})"],
+            )
+        # Without FTS5: case-insensitive substring matches, one per word
+        names = columns.strip("{}").split()
+        clause = " AND ".join(
+            "(" + " OR ".join(f"{name} LIKE ? ESCAPE '\\'" for name in names) + ")" for _ in terms
+        )
+        values = [_like_pattern(term) for term in terms for _ in names]
+        return f"({clause})", values
+
+    def deleted_ids(self) -> List[str]:
+        """IDs prune() found deleted upstream."""
+        rows = self._connection().execute("SELECT id FROM deletions ORDER BY deleted_at")
+        return [row[0] for row in rows]
+
+    def __len__(self) -> int:
+        count: int = self._connection().execute("SELECT COUNT(*) FROM annotations").fetchone()[0]
+        return count
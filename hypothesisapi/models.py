@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+A compact record type for annotations.
+
+Search results are plain dicts by default, and a dict per row (with nested
+dicts and lists for ``target``, ``document`` and ``permissions``) costs
+several kilobytes. :class:`Annotation` keeps the commonly used fields in
+``__slots__``, typed on construction, and holds everything else as one
+encoded JSON blob that is decoded again the first time a nested field is
+read::
+
+    for annotation in api.search(group="abc123", as_model=True):
+        print(annotation.created.year, annotation.user, annotation.tags)
+        selectors = annotation.target  # decoded here, on first access
+
+Pass ``as_model=True`` to ``search()`` or ``get_annotation()`` to get them.
+
+This trades time for memory. Each row is still decoded in full from the
+response, and its nested fields are then re-encoded into the blob, so
+loading takes roughly 25-30% longer than with plain dicts (with orjson),
+while the records kept afterwards take about a third of the memory.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+from .codec import JSONCodec, default_codec
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .interning import Interner
+
+__all__ = ["Annotation"]
+
+# Fields stored in their own slots; the rest go in the encoded blob
+HOT_FIELDS = ("id", "created", "updated", "user", "uri", "group", "tags", "text")
+_LAZY_FIELDS = ("target", "document", "permissions")
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class Annotation:
+    """
+    One annotation, with hot fields typed and the rest kept encoded.
+
+    Attributes:
+        id: Annotation ID.
+        created: Creation time (timezone-aware), if present.
+        updated: Last update time (timezone-aware), if present.
+        user: Author, as ``acct:username@authority``.
+        uri: Annotated document URI.
+        group: Group ID.
+        tags: Tags, as a tuple.
+        text: Annotation body ("" when absent).
+    """
+
+    __slots__ = HOT_FIELDS + ("_rest", "_codec")
+
+    id: str
+    created: Optional[datetime]
+    updated: Optional[datetime]
+    user: Optional[str]
+    uri: Optional[str]
+    group: Optional[str]
+    tags: Tuple[str, ...]
+    text: str
+
+    def __init__(
+        self,
+        id: str,
+        created: Optional[datetime] = None,
+        updated: Optional[datetime] = None,
+        user: Optional[str] = None,
+        uri: Optional[str] = None,
+        group: Optional[str] = None,
+        tags: Tuple[str, ...] = (),
+        text: str = "",
+        rest: Union[bytes, Dict[str, Any], None] = None,
+        codec: Optional[JSONCodec] = None,
+    ) -> None:
+        """
+        Build an annotation from already typed fields.
+
+        Args:
+            rest: Every other field, as a dict or as JSON encoded with codec.
+            codec: Codec that decodes ``rest`` (default: :func:`default_codec`).
+        """
+        self.id = id
+        self.created = created
+        self.updated = updated
+        self.user = user
+        self.uri = uri
+        self.group = group
+        self.tags = tags
+        self.text = text
+        self._rest = rest if rest is not None else {}
+        self._codec = codec
+
+    @classmethod
+    def from_dict(
+        cls,
+        data: Dict[str, Any],
+        codec: Optional[JSONCodec] = None,
+        interner: Optional["Interner"] = None,
+    ) -> "Annotation":
+        """
+        Build an annotation from a decoded API response.
+
+        The fields without their own slot are encoded with ``codec`` here,
+        one extra encode per row, and decoded again on first access.
+
+        Args:
+            data: An annotation as returned by the API.
+            codec: Codec used to encode, and later decode, the fields without
+                their own slot (default: :func:`default_codec`).
+            interner: Interner for the ``user``, ``uri``, ``group`` and tag
+                strings. The other fields are stored encoded, so there is
+                nothing there to share.
+
+        Raises:
+            ValueError: If a timestamp is not ISO 8601.
+        """
+        codec = codec if codec is not None else default_codec()
+        rest = {key: value for key, value in data.items() if key not in HOT_FIELDS}
+        # orjson's output keeps its spare buffer capacity; store an exact-size copy
+        encoded = bytes(memoryview(codec.dumps(rest)))
+        string = interner.string if interner is not None else _identity
+        return cls(
+            id=data.get("id", ""),
+            created=_parse_timestamp(data.get("created")),
+            updated=_parse_timestamp(data.get("updated")),
+            user=string(data.get("user")),
+            uri=string(data.get("uri")),
+            group=string(data.get("group")),
+            tags=tuple(string(tag) for tag in data.get("tags") or ()),
+            text=data.get("text") or "",
+            rest=encoded,
+            codec=codec,
+        )
+
+    def _fields(self) -> Dict[str, Any]:
+        """The fields without a slot, decoded on first use and kept."""
+        rest = self._rest
+        if isinstance(rest, (bytes, bytearray)):
+            codec = self._codec if self._codec is not None else default_codec()
+            rest = self._rest = codec.loads(rest)
+        return rest
+
+    @property
+    def target(self) -> List[Dict[str, Any]]:
+        """Annotated sources and their selectors (decoded on first access)."""
+        target: List[Dict[str, Any]] = self._fields().get("target", [])
+        return target
+
+    @property
+    def document(self) -> Dict[str, Any]:
+        """Document metadata such as ``title`` (decoded on first access)."""
+        document: Dict[str, Any] = self._fields().get("document", {})
+        return document
+
+    @property
+    def permissions(self) -> Dict[str, List[str]]:
+        """Read/update/delete/admin principals (decoded on first access)."""
+        permissions: Dict[str, List[str]] = self._fields().get("permissions", {})
+        return permissions
+
+    @property
+    def extra(self) -> Dict[str, Any]:
+        """Every other field (``links``, ``references``, ``hidden``, ...)."""
+        return {key: value for key, value in self._fields().items() if key not in _LAZY_FIELDS}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Look up a field by its API name; slot fields return their typed value."""
+        if key in HOT_FIELDS:
+            return getattr(self, key)
+        return self._fields().get(key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return the annotation in the API's dict form.
+
+        Timestamps are formatted with ``datetime.isoformat()``.
+        """
+        data: Dict[str, Any] = {
+            "id": self.id,
+            "created": self.created.isoformat() if self.created else None,
+            "updated": self.updated.isoformat() if self.updated else None,
+            "user": self.user,
+            "uri": self.uri,
+            "group": self.group,
+            "tags": list(self.tags),
+            "text": self.text,
+        }
+        data.update(self._fields())
+        return data
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Annotation):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"Annotation(id={self.id!r}, user={self.user!r}, uri={self.uri!r})"
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Client-side rate limiting.
+
+A :class:`RateLimiter` is a token bucket: it refills at ``rate`` tokens per
+second up to ``burst`` tokens, and every request takes one token. Workers that
+find the bucket empty reserve a future token and sleep until it is due, so
+waiting callers are served in arrival order without polling.
+
+One limiter can be shared by every thread, task and client using an API key::
+
+    limiter = RateLimiter(rate=5, burst=10)
+    api1 = API(username="me", api_key="key", rate_limiter=limiter)
+    api2 = API(username="me", api_key="key", rate_limiter=limiter)
+
+When the server still answers 429, the transport calls :meth:`RateLimiter.pause`
+so all users of the limiter back off together.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+__all__ = ["RateLimiter"]
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket usable from both threads and asyncio tasks.
+
+    Attributes:
+        rate: Tokens added per second (sustained requests per second).
+        burst: Bucket capacity (requests that may be sent back to back).
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        """
+        Initialize the limiter with a full bucket.
+
+        Args:
+            rate: Sustained requests per second.
+            burst: Maximum requests sent at once after an idle period
+                (default: ``rate`` rounded down, at least 1).
+
+        Raises:
+            ValueError: If rate or burst is not positive.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst is None:
+            burst = max(int(rate), 1)
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        # Time the token count was last brought up to date; pause() moves it
+        # into the future so no tokens accrue until the pause ends
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accrued since the last update. Call with the lock held."""
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def _reserve(self, tokens: int) -> float:
+        """Take tokens (possibly going into debt) and return the seconds to wait."""
+        if tokens > self.burst:
+            raise ValueError("cannot acquire more tokens than the burst size")
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            ready_at = self._updated + max(-self._tokens, 0.0) / self.rate
+            return max(ready_at - now, 0.0)
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        Block until ``tokens`` may be spent.
+
+        Returns:
+            The number of seconds waited.
+        """
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, tokens: int = 1) -> float:
+        """Like :meth:`acquire`, but sleeps without blocking the event loop."""
+        delay = self._reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """Spend ``tokens`` if they are available now; never waits."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._updated > now or self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stop handing out tokens for ``seconds``, e.g. after a 429 response.
+
+        No tokens are handed out, to new or already waiting requests, until
+        the later of the current pause's end and ``now + seconds``; a pause
+        that ends before the one in effect changes nothing. Tokens saved up
+        before the pause are dropped, and refilling restarts when it ends.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            until = now + seconds
+            if until > self._updated:
+                self._tokens = min(self._tokens, 0.0)
+                self._updated = until
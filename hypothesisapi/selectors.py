@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers for reading annotation targets and their selectors.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+__all__ = ["extract_quote"]
+
+
+def extract_quote(annotation: Dict[str, Any]) -> str:
+    """
+    Return the highlighted text of an annotation.
+
+    Args:
+        annotation: Annotation object as returned by the API.
+
+    Returns:
+        The ``exact`` text of the first TextQuoteSelector, or an empty
+        string for page notes and replies.
+    """
+    for target in annotation.get("target") or []:
+        for selector in target.get("selector") or []:
+            if selector.get("type") == "TextQuoteSelector":
+                return selector.get("exact") or ""
+    return ""
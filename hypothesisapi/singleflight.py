@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Coalescing of concurrent identical calls.
+
+When several threads ask for the same key at once, only the first (the
+leader) runs the call; the others wait for it and receive its result or its
+exception. Once the call finishes the key is forgotten, so later callers run
+it again. This is what stops a burst of threads that all miss a cache at the
+same moment from sending the same request many times::
+
+    flight = SingleFlight()
+    value, shared = flight.do(url, lambda: fetch(url))
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+__all__ = ["SingleFlight"]
+
+
+class _Call:
+    """One in-flight call and the callers waiting on it."""
+
+    __slots__ = ("done", "value", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Thread-safe de-duplication of concurrent calls by key.
+
+    Attributes:
+        calls: Calls actually run.
+        coalesced: Calls answered by waiting on another caller's call.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run ``fn`` unless a call for ``key`` is already in flight.
+
+        Args:
+            key: Identifies calls that are interchangeable.
+            fn: The call to run; it takes no arguments.
+
+        Returns:
+            A ``(value, shared)`` pair. ``shared`` is True when the value was
+            (or may be) handed to more than one caller, who must then not
+            modify it in place.
+
+        Raises:
+            Whatever ``fn`` raised, in the leader and in every waiting caller.
+        """
+        with self._lock:
+            existing = self._calls.get(key)
+            if existing is None:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                existing.waiters += 1
+                self.coalesced += 1
+        if existing is not None:
+            existing.done.wait()
+            if existing.error is not None:
+                raise existing.error
+            return existing.value, True
+
+        try:
+            call.value = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                shared = call.waiters > 0
+            call.done.set()
+        return call.value, shared
+
+    def __len__(self) -> int:
+        """Number of calls in flight."""
+        return len(self._calls)
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental parsing of search responses.
+
+A search page is one JSON object whose ``rows`` array can run to several
+megabytes. :class:`RowParser` scans the body as it arrives and hands back the
+raw bytes of each row as soon as its closing brace is seen, so rows can be
+decoded and used while the rest of the page is still downloading, and only
+the unfinished row is held in memory::
+
+    parser = RowParser()
+    for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+        for raw in parser.feed(chunk):
+            handle(json.loads(raw))
+    parser.close()
+
+This is what ``API.search(stream=True)`` uses.
+"""
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+__all__ = ["RowParser", "iter_rows", "STREAM_CHUNK_SIZE"]
+
+STREAM_CHUNK_SIZE = 16 * 1024  # bytes read from the response at a time
+
+# A string (its closing quote, if already received, in group 1) or a bracket.
+# Brackets inside strings are consumed with the string and never seen alone.
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*("?)|[{}\[\]]', re.DOTALL)
+_QUOTE, _OPEN_OBJECT, _OPEN_ARRAY = ord('"'), ord("{"), ord("[")
+_ROWS_KEY = b'"rows"'
+_ROWS_DEPTH = 2  # inside the top-level object and its rows array
+
+
+class RowParser:
+    """
+    Split a streamed search response into the raw JSON of each row.
+
+    Only nesting and string boundaries are tracked; each row is validated
+    when it is decoded. Everything after the ``rows`` array (``total``, for
+    instance) is skipped.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._pos = 0  # next byte of the buffer to scan
+        self._depth = 0
+        self._key: Optional[bytes] = None  # last string seen in the top-level object
+        self._in_rows = False
+        self._row_start: Optional[int] = None
+        self._done = False
+        self._opened = False  # whether the top-level object has started
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """
+        Add the next chunk of the body.
+
+        Args:
+            chunk: Bytes received, of any length.
+
+        Returns:
+            The raw JSON of every row completed by this chunk, in order.
+        """
+        if self._done:
+            return []
+        buffer = self._buffer
+        buffer += chunk
+        rows: List[bytes] = []
+        pos = self._pos
+        search = _TOKEN.search
+        while True:
+            match = search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            token = buffer[match.start()]
+            if token == _QUOTE:
+                if not match.group(1):
+                    # The string continues in the next chunk; rescan it then
+                    pos = match.start()
+                    break
+                if self._depth == 1:
+                    self._key = match.group(0)
+            elif token == _OPEN_OBJECT or token == _OPEN_ARRAY:
+                if self._in_rows and self._depth == _ROWS_DEPTH:
+                    self._row_start = match.start()
+                elif self._depth == 1 and token == _OPEN_ARRAY and self._key == _ROWS_KEY:
+                    self._in_rows = True
+                self._depth += 1
+                self._opened = True
+            else:
+                self._depth -= 1
+                if self._in_rows and self._depth == _ROWS_DEPTH and self._row_start is not None:
+                    rows.append(bytes(buffer[self._row_start:match.end()]))
+                    self._row_start = None
+                elif self._in_rows and self._depth < _ROWS_DEPTH:
+                    self._done = True
+                    self._buffer = bytearray()
+                    return rows
+            pos = match.end()
+
+        # Drop what has been scanned, keeping any unfinished row
+        keep = self._row_start if self._row_start is not None else pos
+        del buffer[:keep]
+        self._pos = pos - keep
+        if self._row_start is not None:
+            self._row_start = 0
+        return rows
+
+    def close(self) -> None:
+        """
+        Check that the body was complete.
+
+        A body without a ``rows`` key counts as having no rows.
+
+        Raises:
+            ValueError: If the body ended inside the top-level object.
+        """
+        if not self._done and (self._depth != 0 or not self._opened):
+            raise ValueError("Search response ended before its rows were complete")
+
+
+def iter_rows(
+    chunks: Iterable[bytes],
+    loads: Callable[[bytes], Any] = json.loads,
+) -> Iterator[Any]:
+    """
+    Decode the rows of a search response as its chunks arrive.
+
+    Args:
+        chunks: The response body in pieces.
+        loads: Decoder for each row's JSON (e.g. a codec's ``loads``).
+
+    Yields:
+        Each decoded row.
+
+    Raises:
+        ValueError: If a row is invalid or the body is truncated.
+    """
+    parser = RowParser()
+    for chunk in chunks:
+        for raw in parser.feed(chunk):
+            yield loads(raw)
+    parser.close()
@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+"""
+HTTP transport shared by every API method.
+
+The transport owns a single :class:`requests.Session` whose connection pool is
+mounted for both ``http://`` and ``https://``. Reusing that session keeps TCP
+connections (and their TLS sessions) alive between calls instead of opening a
+new connection for every request.
+
+Throttled (429) and transient server (5xx) responses, and connection errors,
+are retried according to a :class:`RetryPolicy`. An optional
+:class:`~hypothesisapi.ratelimit.RateLimiter` is consulted before every
+attempt, and an optional :class:`~hypothesisapi.httpcache.HTTPCache` turns
+repeated GETs into conditional requests. JSON request bodies are encoded with
+the transport's codec (see :mod:`hypothesisapi.codec`).
+"""
+from __future__ import annotations
+
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Collection, Mapping, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .codec import JSONCodec, default_codec
+from .concurrency import _observe_response
+from .httpcache import HTTPCache
+from .ratelimit import RateLimiter
+
+__all__ = [
+    "Transport",
+    "RetryPolicy",
+    "DEFAULT_POOL_CONNECTIONS",
+    "DEFAULT_POOL_MAXSIZE",
+    "IDEMPOTENCY_KEY_HEADER",
+]
+
+DEFAULT_POOL_CONNECTIONS = 10  # number of per-host pools to cache
+DEFAULT_POOL_MAXSIZE = 10  # max connections kept per host
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+
+def _parse_retry_after(value: Any) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed request.
+
+    Delays grow exponentially (``backoff_factor * 2 ** (attempt - 1)``, capped
+    at ``max_backoff``) with full jitter, unless the server sends Retry-After.
+
+    Only idempotent methods are retried by default. POST requests are retried
+    only when they carry an ``Idempotency-Key`` header, e.g. from
+    ``API.create(..., idempotency_key=...)``.
+
+    Example:
+        >>> api = API(username="me", api_key="key", retry=RetryPolicy(max_attempts=5))
+        >>> api = API(username="me", api_key="key", retry=RetryPolicy(max_attempts=1))  # no retries
+    """
+
+    DEFAULT_RETRY_STATUSES = (429, 500, 502, 503, 504)
+    DEFAULT_RETRY_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "PATCH", "DELETE")
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        retry_statuses: Collection[int] = DEFAULT_RETRY_STATUSES,
+        retry_methods: Collection[str] = DEFAULT_RETRY_METHODS,
+        respect_retry_after: bool = True,
+        max_retry_after: float = 120.0,
+    ) -> None:
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts: Total attempts per request, including the first
+                (default: 3). 1 disables retries.
+            backoff_factor: Base delay in seconds (default: 0.5).
+            max_backoff: Upper bound for computed delays in seconds.
+            jitter: Randomize each delay between 0 and the computed value, so
+                many clients throttled at once don't retry in lockstep.
+            retry_statuses: HTTP statuses that are retried.
+            retry_methods: HTTP methods retried without an idempotency key.
+            respect_retry_after: Wait as long as the server's Retry-After
+                header asks instead of the computed delay.
+            max_retry_after: Give up instead of waiting when Retry-After asks
+                for longer than this many seconds.
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_methods = frozenset(m.upper() for m in retry_methods)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+    def is_retryable(self, method: str, headers: Optional[Mapping[str, str]] = None) -> bool:
+        """Return True if a request may safely be sent more than once."""
+        if method.upper() in self.retry_methods:
+            return True
+        return bool(headers) and IDEMPOTENCY_KEY_HEADER in headers  # type: ignore[operator]
+
+    def backoff(self, attempt: int) -> float:
+        """Delay in seconds before retry number ``attempt`` (1-based)."""
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** (attempt - 1)))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def retry_delay(self, attempt: int, response: Any) -> Optional[float]:
+        """
+        Delay before retrying after ``response``, or None to stop retrying.
+
+        Args:
+            attempt: Number of attempts made so far.
+            response: The response to the last attempt.
+        """
+        if attempt >= self.max_attempts or response.status_code not in self.retry_statuses:
+            return None
+        if self.respect_retry_after:
+            retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return retry_after if retry_after <= self.max_retry_after else None
+        return self.backoff(attempt)
+
+
+class _CodecSession(requests.Session):
+    """Session that encodes ``json=`` bodies with a codec instead of the stdlib."""
+
+    def __init__(self, codec: JSONCodec) -> None:
+        super().__init__()
+        self.codec = codec
+
+    def request(self, method: Any, url: Any, *args: Any, **kwargs: Any) -> requests.Response:
+        body = kwargs.pop("json", None)
+        if body is not None and not args and kwargs.get("data") is None:
+            headers = CaseInsensitiveDict(kwargs.get("headers") or {})
+            headers.setdefault("Content-Type", "application/json")
+            kwargs["headers"] = headers
+            kwargs["data"] = self.codec.dumps(body)
+        elif body is not None:
+            kwargs["json"] = body
+        return super().request(method, url, *args, **kwargs)
+
+
+class Transport:
+    """
+    Pooled, keep-alive HTTP transport.
+
+    Example:
+        >>> transport = Transport(pool_maxsize=32)
+        >>> api = API(username="me", api_key="key", transport=transport)
+
+    Attributes:
+        session: The underlying requests session.
+        keep_alive: Whether connections are kept open between requests.
+        retry: The retry policy.
+        rate_limiter: The rate limiter consulted before each attempt, if any.
+        http_cache: The GET response cache, if any.
+        codec: JSON codec for request bodies.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        keep_alive: bool = True,
+        pool_block: bool = False,
+        session: Optional[requests.Session] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        http_cache: Optional[HTTPCache] = None,
+        codec: Optional[JSONCodec] = None,
+    ) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            pool_connections: Number of per-host connection pools to cache.
+            pool_maxsize: Maximum number of connections kept per host. Set this
+                to at least the number of threads sharing the transport.
+            keep_alive: Keep connections open between requests (default: True).
+                When False, every request asks the server to close the
+                connection, which matches the old per-call behavior.
+            pool_block: Block when all ``pool_maxsize`` connections are in use
+                instead of opening (and then discarding) extra connections.
+            session: An existing session to use. Its adapters are replaced
+                with pooled adapters configured from the arguments above.
+            retry: Retry policy (default: ``RetryPolicy()``, up to 3 attempts).
+                Pass ``RetryPolicy(max_attempts=1)`` to disable retries.
+            rate_limiter: Token bucket to take a token from before every
+                attempt. Share one limiter between all transports using the
+                same API key. A 429 response pauses it for the retry delay.
+            http_cache: Cache for GET responses. Stale entries are
+                revalidated with If-None-Match / If-Modified-Since and a 304
+                reply is answered from the stored body.
+            codec: Encoder for ``json=`` request bodies (default: orjson if
+                installed, else the standard library). Not applied to a
+                session passed in, which encodes with the standard library.
+        """
+        if pool_connections < 1 or pool_maxsize < 1:
+            raise ValueError("pool_connections and pool_maxsize must be at least 1")
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.pool_block = pool_block
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.http_cache = http_cache
+        self.codec = codec if codec is not None else default_codec()
+
+        self.session = session if session is not None else _CodecSession(self.codec)
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a request, answering GETs from the HTTP cache where possible.
+
+        Args:
+            method: HTTP method (GET, POST, PATCH, PUT, DELETE).
+            url: Absolute request URL.
+            **kwargs: Passed through to the session (headers, json, timeout, ...).
+
+        Returns:
+            The HTTP response. Responses built from the cache have a
+            ``from_cache`` attribute set to True. Streamed GETs
+            (``stream=True``) are answered from the cache but never stored.
+        """
+        cache = self.http_cache
+        if cache is None:
+            return self._send(method, url, **kwargs)
+        if method.upper() != "GET":
+            try:
+                return self._send(method, url, **kwargs)
+            finally:
+                cache.invalidate(url)
+
+        headers = kwargs.get("headers")
+        entry = cache.lookup(url, headers)
+        if entry is not None:
+            if cache.is_fresh(entry):
+                cache.record_hit()
+                return entry.to_response()
+            kwargs["headers"] = {**(headers or {}), **cache.conditional_headers(entry)}
+
+        response = self._send(method, url, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            cache.record_revalidation()
+            response.close()
+            return cache.refresh(entry, headers, response).to_response()
+        cache.record_miss()
+        if not kwargs.get("stream"):
+            # Storing reads the whole body, which would defeat streaming
+            cache.store(url, headers, response)
+        return response
+
+    def _send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a request through the pooled session, retrying per the policy.
+
+        Args:
+            method: HTTP method (GET, POST, PATCH, PUT, DELETE).
+            url: Absolute request URL.
+            **kwargs: Passed through to the session (headers, json, timeout, ...).
+
+        Returns:
+            The HTTP response. After the last attempt this may still be a
+            429/5xx response; API._handle_response turns it into an error.
+
+        Raises:
+            requests.ConnectionError: If the connection fails on every attempt.
+            requests.Timeout: If the request times out on every attempt.
+        """
+        send: Callable[..., requests.Response] = getattr(self.session, method.lower())
+        retryable = self.retry.is_retryable(method, kwargs.get("headers"))
+        attempt = 1
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                response = send(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if not retryable or attempt >= self.retry.max_attempts:
+                    raise
+                delay = self.retry.backoff(attempt)
+            else:
+                _observe_response(response.status_code)
+                retry_delay = self.retry.retry_delay(attempt, response) if retryable else None
+                if retry_delay is None:
+                    return response
+                delay = retry_delay
+                response.close()
+                if response.status_code == 429 and self.rate_limiter is not None:
+                    self.rate_limiter.pause(delay)
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Shared helpers for tests that patch ``requests.Session`` methods.
+"""
+
+from unittest.mock import Mock
+from urllib.parse import parse_qs, urlparse
+
+from hypothesisapi.codec import default_codec
+
+
+def json_body(payload):
+    """Return ``payload`` encoded the way the client's codec reads it."""
+    return default_codec().dumps(payload)
+
+
+def make_response(status_code=200, payload=None):
+    """Return a mock ``requests.Response`` whose body is ``payload``."""
+    response = Mock()
+    response.status_code = status_code
+    response.content = json_body(payload if payload is not None else {})
+    response.text = "error"
+    response.headers = {}
+    return response
+
+
+def cursor_pages(rows, field="created", limit=None):
+    """
+    Return a ``Session.get`` side effect paging ``rows`` by ``search_after``.
+
+    Rows must be sorted by ``field``. Each page holds the rows after the
+    request's ``search_after`` value, up to ``limit`` of them (default: the
+    request's own ``limit``).
+    """
+    def side_effect(url, **kwargs):
+        params = parse_qs(urlparse(url).query)
+        after = params.get("search_after", [None])[0]
+        remaining = [row for row in rows if after is None or row[field] > after]
+        size = limit if limit is not None else int(params["limit"][0])
+        return make_response(200, {"rows": remaining[:size], "total": len(remaining)})
+    return side_effect
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+A tiny local HTTP/1.1 server for exercising the real transport.
+
+Each test supplies a handler ``handler(method, path, headers, body)`` that
+returns ``(status, headers, body)``. The server records every request and
+counts the TCP connections it accepted, which lets tests check pooling.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def json_handler(payload, status=200):
+    """Return a handler that always answers with the given JSON payload."""
+    body = json.dumps(payload).encode("utf-8")
+
+    def handler(method, path, headers, request_body):
+        return status, {"Content-Type": "application/json"}, body
+
+    return handler
+
+
+class StubServer:
+    """Threaded local server; use as a context manager."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Keep-alive clients otherwise stall on Nagle + delayed-ACK.
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def _dispatch(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                request_body = self.rfile.read(length) if length else b""
+                with stub._lock:
+                    stub.requests.append(
+                        (self.command, self.path, dict(self.headers), request_body)
+                    )
+                status, headers, body = stub.handler(
+                    self.command, self.path, self.headers, request_body
+                )
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                if self.close_connection:
+                    self.send_header("Connection", "close")
+                # Send headers and body in a single write.
+                self._headers_buffer.append(b"\r\n" + body)
+                self.flush_headers()
+
+            do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _dispatch
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_asyncapi
+----------------------------------
+
+Tests for the asyncio client, using httpx's mock transport.
+"""
+
+import asyncio
+import inspect
+import json
+import unittest
+
+from hypothesisapi import (
+    API,
+    AsyncAPI,
+    AuthenticationError,
+    ForbiddenError,
+    HypothesisAPIError,
+    NotFoundError,
+    RetryPolicy,
+)
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+def make_api(handler, **kwargs):
+    """Build an AsyncAPI whose client answers every request with handler."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncAPI(username="testuser", api_key="testkey", client=client, **kwargs)
+
+
+class TestAsyncAPISurface(unittest.TestCase):
+    """AsyncAPI should mirror every public API endpoint."""
+
+    # Sync-only lifecycle, deprecated and thread-pool helper methods
+    skipped = {
+        "close",
+        "search_id",
+        "search_parallel",
+        "get_annotations",
+        "create_many",
+        "update_many",
+        "delete_many",
+        "retag",
+    }
+
+    @unittest.skipIf(httpx is None, "httpx not installed")
+    def test_mirrors_every_endpoint(self):
+        for name, member in inspect.getmembers(API, inspect.isfunction):
+            if name.startswith("_") or name in self.skipped:
+                continue
+            with self.subTest(method=name):
+                self.assertTrue(hasattr(AsyncAPI, name), f"AsyncAPI lacks {name}")
+                async_member = getattr(AsyncAPI, name)
+                self.assertTrue(
+                    inspect.iscoroutinefunction(async_member)
+                    or inspect.isasyncgenfunction(async_member)
+                )
+                self.assertEqual(
+                    list(inspect.signature(member).parameters),
+                    list(inspect.signature(async_member).parameters),
+                )
+
+
+@unittest.skipIf(httpx is None, "httpx not installed")
+class TestAsyncAPIRequests(unittest.IsolatedAsyncioTestCase):
+    """Tests for requests sent by AsyncAPI."""
+
+    async def test_get_annotation(self):
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, json={"id": "abc123"})
+
+        async with make_api(handler) as api:
+            result = await api.get_annotation("abc123")
+        self.assertEqual(result["id"], "abc123")
+        self.assertEqual(seen[0].url.path, "/api/annotations/abc123")
+        self.assertEqual(seen[0].headers["Authorization"], "Bearer testkey")
+
+    async def test_get_links_unauthenticated(self):
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, json={})
+
+        async with make_api(handler) as api:
+            await api.get_links()
+        self.assertNotIn("Authorization", seen[0].headers)
+
+    async def test_create_builds_payload_like_api(self):
+        seen = []
+
+        def handler(request):
+            seen.append(json.loads(request.content))
+            return httpx.Response(200, json={"id": "new"})
+
+        async with make_api(handler) as api:
+            await api.create({"uri": "https://example.com"}, group="mygroup")
+        payload = seen[0]
+        self.assertEqual(payload["group"], "mygroup")
+        self.assertEqual(payload["user"], "acct:testuser@hypothes.is")
+        self.assertEqual(payload["permissions"]["read"], ["group:mygroup"])
+        self.assertEqual(payload["document"], {})
+
+    async def test_create_requires_uri(self):
+        async with make_api(lambda request: httpx.Response(200, json={})) as api:
+            with self.assertRaises(ValueError):
+                await api.create({"text": "no uri"})
+
+    async def test_error_mapping(self):
+        cases = [
+            (401, AuthenticationError),
+            (403, ForbiddenError),
+            (404, NotFoundError),
+            (500, HypothesisAPIError),
+        ]
+        for status, exc_type in cases:
+            with self.subTest(status=status):
+                no_retry = RetryPolicy(max_attempts=1)
+                handler = lambda request, s=status: httpx.Response(s, text="err")  # noqa: E731
+                async with make_api(handler, retry=no_retry) as api:
+                    with self.assertRaises(exc_type) as ctx:
+                        await api.get_annotation("abc")
+                self.assertEqual(ctx.exception.status_code, status)
+
+    async def test_retries_throttled_request(self):
+        statuses = [429, 503, 200]
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(statuses[len(seen) - 1], json={"id": "abc"})
+
+        policy = RetryPolicy(backoff_factor=0, respect_retry_after=False)
+        async with make_api(handler, retry=policy) as api:
+            result = await api.get_annotation("abc")
+        self.assertEqual(result["id"], "abc")
+        self.assertEqual(len(seen), 3)
+
+    async def test_create_retried_only_with_idempotency_key(self):
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(503 if len(seen) % 2 else 200, json={"id": "new"})
+
+        policy = RetryPolicy(backoff_factor=0)
+        async with make_api(handler, retry=policy) as api:
+            with self.assertRaises(HypothesisAPIError):
+                await api.create({"uri": "https://example.com"})
+            self.assertEqual(len(seen), 1)
+            seen.clear()
+            await api.create({"uri": "https://example.com"}, idempotency_key="key-1")
+        self.assertEqual(len(seen), 2)
+        self.assertEqual(seen[1].headers["Idempotency-Key"], "key-1")
+
+    async def test_delete_204_returns_empty_dict(self):
+        async with make_api(lambda request: httpx.Response(204)) as api:
+            self.assertEqual(await api.delete("abc"), {})
+
+    async def test_search_paginates(self):
+        pages = [
+            {"rows": [{"id": "1"}, {"id": "2"}], "total": 3},
+            {"rows": [{"id": "3"}], "total": 3},
+            {"rows": [], "total": 3},
+        ]
+        offsets = []
+
+        def handler(request):
+            offsets.append(request.url.params["offset"])
+            return httpx.Response(200, json=pages[len(offsets) - 1])
+
+        async with make_api(handler) as api:
+            ids = [row["id"] async for row in api.search(tags=["a", "b"], limit=2)]
+        self.assertEqual(ids, ["1", "2", "3"])
+        self.assertEqual(offsets, ["0", "2", "4"])
+
+    async def test_search_prefetch(self):
+        offsets = []
+
+        def handler(request):
+            start = int(request.url.params["offset"])
+            offsets.append(start)
+            rows = [{"id": str(i)} for i in range(start, min(start + 5, 12))]
+            return httpx.Response(200, json={"rows": rows, "total": 12})
+
+        async with make_api(handler) as api:
+            ids = [row["id"] async for row in api.search(limit=5, prefetch=2)]
+        self.assertEqual(ids, [str(i) for i in range(12)])
+        self.assertEqual(sorted(offsets), [0, 5, 10])
+
+    async def test_search_sends_repeated_tags(self):
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, json={"rows": [], "total": 0})
+
+        async with make_api(handler) as api:
+            [row async for row in api.search(user="someone", tags=["a", "b"])]
+        params = seen[0].url.params
+        self.assertEqual(params.get_list("tag"), ["a", "b"])
+        self.assertEqual(params["user"], "acct:someone@hypothes.is")
+
+    async def test_many_requests_in_flight(self):
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[-1]})
+
+        async with make_api(handler) as api:
+            results = await asyncio.gather(*(api.get_annotation(str(i)) for i in range(50)))
+        self.assertEqual([r["id"] for r in results], [str(i) for i in range(50)])
+        self.assertGreater(peak, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
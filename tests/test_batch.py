@@ -0,0 +1,393 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_batch
+----------------------------------
+
+Tests for the batch methods and their per-item results.
+"""
+
+import unittest
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from hypothesisapi import (
+    API,
+    AuthenticationError,
+    BatchReport,
+    ForbiddenError,
+    HypothesisAPIError,
+    ItemResult,
+    NotFoundError,
+)
+
+from .helpers import cursor_pages, make_response
+
+
+def annotation_responses(missing=(), forbidden=()):
+    """Return a Session.get side effect serving annotations by ID."""
+    def side_effect(url, **kwargs):
+        annotation_id = url.rsplit("/", 1)[-1]
+        if annotation_id in missing:
+            return make_response(404)
+        if annotation_id in forbidden:
+            return make_response(403)
+        return make_response(200, {"id": annotation_id, "text": f"text {annotation_id}"})
+    return side_effect
+
+
+class TestItemResult(unittest.TestCase):
+    """Tests for the per-item result type."""
+
+    def test_ok_and_unwrap(self):
+        result = ItemResult("abc", {"id": "abc"})
+        self.assertTrue(result.ok)
+        self.assertEqual(result.unwrap(), {"id": "abc"})
+
+    def test_error_unwrap_raises(self):
+        result = ItemResult("abc", error=NotFoundError("missing", status_code=404))
+        self.assertFalse(result.ok)
+        with self.assertRaises(NotFoundError):
+            result.unwrap()
+
+
+@patch("hypothesisapi.requests.Session.post", return_value=make_response(404))
+class TestGetAnnotations(unittest.TestCase):
+    """Tests for API.get_annotations()."""
+
+    def setUp(self):
+        self.api = API(username="testuser", api_key="testkey")
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_results_keep_input_order(self, mock_get, mock_post):
+        mock_get.side_effect = annotation_responses()
+        ids = [f"id{i}" for i in range(25)]
+        results = self.api.get_annotations(ids, max_workers=4)
+        self.assertEqual([r.key for r in results], ids)
+        self.assertEqual([r.value["id"] for r in results], ids)
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_missing_and_forbidden_ids_are_collected(self, mock_get, mock_post):
+        mock_get.side_effect = annotation_responses(missing={"b"}, forbidden={"c"})
+        results = self.api.get_annotations(["a", "b", "c", "d"])
+        self.assertEqual([r.ok for r in results], [True, False, False, True])
+        self.assertIsInstance(results[1].error, NotFoundError)
+        self.assertIsInstance(results[2].error, ForbiddenError)
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_authentication_error_aborts(self, mock_get, mock_post):
+        mock_get.return_value = make_response(401)
+        with self.assertRaises(AuthenticationError):
+            self.api.get_annotations(["a", "b"])
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_duplicates_fetched_once(self, mock_get, mock_post):
+        mock_get.side_effect = annotation_responses()
+        results = self.api.get_annotations(["a", "b", "a"])
+        self.assertEqual([r.key for r in results], ["a", "b", "a"])
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_unavailable_bulk_endpoint_probed_once(self, mock_get, mock_post):
+        mock_get.side_effect = annotation_responses()
+        self.api.get_annotations(["a"])
+        self.api.get_annotations(["b"])
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertIn("/bulk/annotation", mock_post.call_args[0][0])
+        self.assertFalse(self.api._bulk_available["annotations"])
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_bulk_rows_used_when_available(self, mock_get, mock_post):
+        mock_post.return_value = make_response(200, [{"id": "a", "text": "bulk"}])
+        mock_get.side_effect = annotation_responses()
+        results = self.api.get_annotations(["a", "b"])
+        self.assertEqual(results[0].value["text"], "bulk")
+        self.assertEqual(results[1].value["text"], "text b")
+        self.assertEqual(mock_post.call_args[1]["json"], {"ids": ["a", "b"]})
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertTrue(self.api._bulk_available["annotations"])
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_bulk_rows_without_ids_disable_bulk(self, mock_get, mock_post):
+        mock_post.return_value = make_response(200, [{"author": {"username": "x"}}])
+        mock_get.side_effect = annotation_responses()
+        results = self.api.get_annotations(["a", "b"])
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertFalse(self.api._bulk_available["annotations"])
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_bulk_client_error_falls_back_and_disables_bulk(self, mock_get, mock_post):
+        mock_post.return_value = make_response(400)
+        mock_get.side_effect = annotation_responses()
+        results = self.api.get_annotations(["a", "b"])
+        self.assertEqual([r.value["id"] for r in results], ["a", "b"])
+        self.assertFalse(self.api._bulk_available["annotations"])
+
+    @patch("hypothesisapi.transport.time.sleep")
+    @patch("hypothesisapi.requests.Session.get")
+    def test_bulk_server_error_falls_back_for_that_chunk(self, mock_get, mock_sleep, mock_post):
+        mock_post.return_value = make_response(503)
+        mock_get.side_effect = annotation_responses()
+        results = self.api.get_annotations(["a", "b"])
+        self.assertTrue(all(r.ok for r in results))
+        self.assertNotIn("annotations", self.api._bulk_available)
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_unauthenticated_skips_bulk(self, mock_get, mock_post):
+        mock_get.side_effect = annotation_responses()
+        self.api.get_annotations(["a"], authenticated=False)
+        mock_post.assert_not_called()
+        self.assertNotIn("Authorization", mock_get.call_args[1]["headers"])
+
+    def test_invalid_max_workers_raises(self, mock_post):
+        with self.assertRaises(ValueError):
+            self.api.get_annotations(["a"], max_workers=0)
+
+
+def create_responses(fail_uris=()):
+    """Return a Session.post side effect: bulk is unavailable, creates echo the payload."""
+    def side_effect(url, **kwargs):
+        if url.endswith("/bulk"):
+            return make_response(404)
+        payload = kwargs["json"]
+        if payload["uri"] in fail_uris:
+            return make_response(400)
+        return make_response(200, {"id": f"new-{payload['uri']}", **payload})
+    return side_effect
+
+
+@patch("hypothesisapi.requests.Session.post")
+class TestCreateMany(unittest.TestCase):
+    """Tests for API.create_many()."""
+
+    def setUp(self):
+        self.api = API(username="testuser", api_key="testkey")
+
+    def test_payloads_built_like_create(self, mock_post):
+        mock_post.side_effect = create_responses()
+        [result] = list(self.api.create_many([{"uri": "https://example.com"}], group="mygroup"))
+        self.assertTrue(result.ok)
+        sent = mock_post.call_args[1]["json"]
+        self.assertEqual(sent["user"], "acct:testuser@hypothes.is")
+        self.assertEqual(sent["group"], "mygroup")
+        self.assertEqual(sent["permissions"]["read"], ["group:mygroup"])
+        self.assertEqual(sent["document"], {})
+
+    def test_results_in_input_order_with_failures(self, mock_post):
+        mock_post.side_effect = create_responses(fail_uris={"u3"})
+        payloads = [{"uri": f"u{i}"} for i in range(6)] + [{"text": "no uri"}]
+        results = list(self.api.create_many(payloads, max_workers=3))
+        self.assertEqual([r.key for r in results], list(range(7)))
+        self.assertEqual([r.ok for r in results], [True, True, True, False, True, True, False])
+        self.assertEqual(results[0].value["id"], "new-u0")
+        self.assertEqual(results[3].error.status_code, 400)
+        self.assertIsInstance(results[6].error, ValueError)
+
+    def test_invalid_max_workers_raises_on_call(self, mock_post):
+        with self.assertRaises(ValueError):
+            self.api.create_many([{"uri": "u0"}], max_workers=0)
+
+    def test_unordered_yields_every_result(self, mock_post):
+        mock_post.side_effect = create_responses()
+        results = list(self.api.create_many(({"uri": f"u{i}"} for i in range(20)), ordered=False))
+        self.assertEqual(sorted(r.key for r in results), list(range(20)))
+
+    def test_authentication_error_aborts(self, mock_post):
+        def side_effect(url, **kwargs):
+            return make_response(404 if url.endswith("/bulk") else 401)
+
+        mock_post.side_effect = side_effect
+        with self.assertRaises(AuthenticationError):
+            list(self.api.create_many([{"uri": "u0"}]))
+
+    def test_bulk_used_when_available(self, mock_post):
+        def side_effect(url, **kwargs):
+            return make_response(200, [{"id": f"bulk-{op['uri']}"} for op in kwargs["json"]])
+
+        mock_post.side_effect = side_effect
+        payloads = [{"uri": f"u{i}"} for i in range(150)] + [{"text": "no uri"}]
+        results = list(self.api.create_many(payloads))
+        self.assertEqual(mock_post.call_count, 2)  # chunks of 100
+        first_chunk = mock_post.call_args_list[0][1]["json"]
+        self.assertEqual(first_chunk[0]["action"], "create")
+        self.assertEqual(first_chunk[0]["user"], "acct:testuser@hypothes.is")
+        self.assertEqual(results[149].value["id"], "bulk-u149")
+        self.assertIsInstance(results[150].error, ValueError)
+
+    def test_unavailable_bulk_probed_once(self, mock_post):
+        mock_post.side_effect = create_responses()
+        list(self.api.create_many([{"uri": "u0"}, {"uri": "u1"}]))
+        list(self.api.create_many([{"uri": "u2"}]))
+        bulk_calls = [c for c in mock_post.call_args_list if c[0][0].endswith("/bulk")]
+        self.assertEqual(len(bulk_calls), 1)
+        self.assertEqual(mock_post.call_count, 4)
+
+    def test_bulk_client_error_falls_back_to_create(self, mock_post):
+        def side_effect(url, **kwargs):
+            if url.endswith("/bulk"):
+                return make_response(422)
+            return make_response(200, {"id": "new-" + kwargs["json"]["uri"]})
+
+        mock_post.side_effect = side_effect
+        results = list(self.api.create_many([{"uri": "u0"}, {"uri": "u1"}]))
+        self.assertEqual([r.value["id"] for r in results], ["new-u0", "new-u1"])
+        self.assertFalse(self.api._bulk_available["bulk"])
+
+    def test_bulk_server_error_fails_chunk(self, mock_post):
+        mock_post.return_value = make_response(500)
+        results = list(self.api.create_many([{"uri": "u0"}, {"uri": "u1"}]))
+        self.assertEqual([r.error.status_code for r in results], [500, 500])
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertNotIn("bulk", self.api._bulk_available)
+
+    def test_unconfirmed_bulk_rows_fail(self, mock_post):
+        mock_post.return_value = make_response(200, {"status": "queued"})
+        results = list(self.api.create_many([{"uri": "u0"}, {"uri": "u1"}]))
+        self.assertFalse(any(r.ok for r in results))
+        self.assertIsInstance(results[0].error, HypothesisAPIError)
+
+
+def status_by_id(statuses):
+    """Return a side effect answering each annotation ID with statuses.get(id, 200)."""
+    def side_effect(url, **kwargs):
+        annotation_id = url.rsplit("/", 1)[-1]
+        return make_response(statuses.get(annotation_id, 200), {"id": annotation_id})
+    return side_effect
+
+
+class TestBatchReport(unittest.TestCase):
+    """Tests for the batch write summary."""
+
+    def test_counts(self):
+        report = BatchReport(succeeded=["a"], failed={"b": ValueError()}, skipped=["c", "d"])
+        self.assertEqual(report.total, 4)
+        self.assertFalse(report.ok)
+        self.assertTrue(BatchReport().ok)
+
+
+class TestUpdateMany(unittest.TestCase):
+    """Tests for API.update_many()."""
+
+    def setUp(self):
+        self.api = API(username="testuser", api_key="testkey")
+
+    @patch("hypothesisapi.transport.time.sleep")
+    @patch("hypothesisapi.requests.Session.patch")
+    def test_report_sorts_outcomes(self, mock_patch, mock_sleep):
+        mock_patch.side_effect = status_by_id({"b": 403, "c": 500})
+        report = self.api.update_many({
+            "a": {"text": "new"},
+            "b": {"text": "new"},
+            "c": {"text": "new"},
+            "d": {},
+        })
+        self.assertEqual(report.succeeded, ["a"])
+        self.assertEqual(sorted(report.failed), ["b", "c"])
+        self.assertIsInstance(report.failed["b"], ForbiddenError)
+        self.assertEqual(report.failed["c"].status_code, 500)
+        self.assertEqual(report.skipped, ["d"])
+        # The 500 was retried by the transport before counting as failed
+        patched_ids = [c[0][0].rsplit("/", 1)[-1] for c in mock_patch.call_args_list]
+        self.assertEqual(patched_ids.count("c"), 3)
+
+    @patch("hypothesisapi.requests.Session.patch")
+    def test_accepts_pairs(self, mock_patch):
+        mock_patch.side_effect = status_by_id({})
+        pairs = ((f"id{i}", {"tags": ["x"]}) for i in range(30))
+        report = self.api.update_many(pairs, max_workers=4)
+        self.assertEqual(sorted(report.succeeded), sorted(f"id{i}" for i in range(30)))
+        self.assertEqual(mock_patch.call_args[1]["json"], {"tags": ["x"]})
+
+    @patch("hypothesisapi.requests.Session.patch")
+    def test_authentication_error_aborts(self, mock_patch):
+        mock_patch.return_value = make_response(401)
+        with self.assertRaises(AuthenticationError):
+            self.api.update_many({"a": {"text": "new"}})
+
+    def test_invalid_max_workers_raises(self):
+        with self.assertRaises(ValueError):
+            self.api.update_many({"a": {"text": "new"}}, max_workers=0)
+
+
+class TestDeleteMany(unittest.TestCase):
+    """Tests for API.delete_many()."""
+
+    def setUp(self):
+        self.api = API(username="testuser", api_key="testkey")
+
+    @patch("hypothesisapi.requests.Session.delete")
+    def test_missing_ids_are_skipped(self, mock_delete):
+        mock_delete.side_effect = status_by_id({"gone": 404, "theirs": 403})
+        report = self.api.delete_many(["a", "gone", "theirs", "a"])
+        self.assertEqual(report.succeeded, ["a"])
+        self.assertEqual(report.skipped, ["gone"])
+        self.assertIsInstance(report.failed["theirs"], HypothesisAPIError)
+        self.assertEqual(mock_delete.call_count, 3)
+
+    @patch("hypothesisapi.transport.time.sleep")
+    @patch("hypothesisapi.requests.Session.delete")
+    def test_transient_failure_is_retried(self, mock_delete, mock_sleep):
+        responses = [make_response(503), make_response(200, {"id": "a", "deleted": True})]
+        mock_delete.side_effect = responses
+        report = self.api.delete_many(["a"])
+        self.assertEqual(report.succeeded, ["a"])
+        self.assertEqual(mock_delete.call_count, 2)
+
+
+class TestRetag(unittest.TestCase):
+    """Tests for API.retag()."""
+
+    def setUp(self):
+        self.api = API(username="testuser", api_key="testkey")
+        self.rows = [
+            {"id": "a", "created": "2024-01-01", "tags": ["todo"]},
+            {"id": "b", "created": "2024-01-02", "tags": ["todo", "done"]},
+            {"id": "c", "created": "2024-01-03", "tags": ["done"]},
+            {"id": "d", "created": "2024-01-04"},
+            {"id": "e", "created": "2024-01-05", "tags": ["other"]},
+        ]
+
+    @patch("hypothesisapi.requests.Session.patch")
+    @patch("hypothesisapi.requests.Session.get")
+    def test_tags_computed_from_search_rows(self, mock_get, mock_patch):
+        mock_get.side_effect = cursor_pages(self.rows, limit=2)
+        mock_patch.side_effect = status_by_id({})
+        report = self.api.retag({"user": "someone"}, add=["done"], remove=["todo"])
+
+        sent = {c[0][0].rsplit("/", 1)[-1]: c[1]["json"] for c in mock_patch.call_args_list}
+        self.assertEqual(sent, {
+            "a": {"tags": ["done"]},
+            "b": {"tags": ["done"]},
+            "d": {"tags": ["done"]},
+            "e": {"tags": ["other", "done"]},
+        })
+        self.assertEqual(sorted(report.succeeded), ["a", "b", "d", "e"])
+        self.assertEqual(report.skipped, ["c"])
+        # No per-annotation GETs: only search pages
+        for call in mock_get.call_args_list:
+            self.assertIn("/search?", call[0][0])
+
+    @patch("hypothesisapi.requests.Session.patch")
+    @patch("hypothesisapi.requests.Session.get")
+    def test_search_uses_created_cursor(self, mock_get, mock_patch):
+        mock_get.side_effect = cursor_pages(self.rows, limit=2)
+        mock_patch.side_effect = status_by_id({})
+        self.api.retag({"tag": "todo"}, remove=["todo"])
+        params = parse_qs(urlparse(mock_get.call_args_list[-1][0][0]).query)
+        self.assertEqual(params["sort"], ["created"])
+        self.assertEqual(params["tag"], ["todo"])
+        self.assertNotIn("offset", params)
+
+    def test_conflicting_tags_raise(self):
+        with self.assertRaises(ValueError):
+            self.api.retag({}, add=["x"], remove=["x"])
+
+    def test_reserved_query_keys_raise(self):
+        with self.assertRaises(ValueError):
+            self.api.retag({"sort": "updated"}, add=["x"])
+
+
+if __name__ == "__main__":
+    unittest.main()
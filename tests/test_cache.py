@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_cache
+----------------------------------
+
+Tests for the in-memory annotation read cache.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+
+from hypothesisapi import API, AnnotationCache, NotFoundError
+
+from .helpers import json_body
+
+
+def annotation_response(annotation_id="abc", text="hello"):
+    response = Mock()
+    response.status_code = 200
+    response.content = json_body({"id": annotation_id, "text": text})
+    return response
+
+
+class TestAnnotationCache(unittest.TestCase):
+    """Tests for the cache itself."""
+
+    def test_hit_and_miss_counts(self):
+        cache = AnnotationCache()
+        self.assertIsNone(cache.get("a"))
+        cache.set("a", {"id": "a"})
+        self.assertEqual(cache.get("a"), {"id": "a"})
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.hit_rate, 0.5)
+
+    def test_keyed_by_auth_mode(self):
+        cache = AnnotationCache()
+        cache.set("a", {"id": "a", "private": True}, authenticated=True)
+        self.assertIsNone(cache.get("a", authenticated=False))
+        self.assertIsNotNone(cache.get("a", authenticated=True))
+
+    def test_least_recently_used_is_evicted(self):
+        cache = AnnotationCache(maxsize=2)
+        cache.set("a", {"id": "a"})
+        cache.set("b", {"id": "b"})
+        cache.get("a")
+        cache.set("c", {"id": "c"})
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(len(cache), 2)
+
+    @patch("hypothesisapi.cache.time.monotonic")
+    def test_entries_expire(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        cache = AnnotationCache(ttl=10)
+        cache.set("a", {"id": "a"})
+        mock_monotonic.return_value = 109.0
+        self.assertIsNotNone(cache.get("a"))
+        mock_monotonic.return_value = 110.0
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_returned_values_are_copies(self):
+        cache = AnnotationCache()
+        original = {"id": "a", "tags": ["x"]}
+        cache.set("a", original)
+        original["tags"].append("changed")
+        cache.get("a")["tags"].append("changed")
+        self.assertEqual(cache.get("a")["tags"], ["x"])
+
+    def test_invalidate_and_stats(self):
+        cache = AnnotationCache()
+        cache.set("a", {"id": "a"}, authenticated=True)
+        cache.set("a", {"id": "a"}, authenticated=False)
+        cache.invalidate("a")
+        self.assertEqual(cache.stats()["invalidations"], 2)
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_invalid_settings_raise(self):
+        with self.assertRaises(ValueError):
+            AnnotationCache(maxsize=0)
+        with self.assertRaises(ValueError):
+            AnnotationCache(ttl=0)
+
+
+class TestAPIAnnotationCache(unittest.TestCase):
+    """Tests for get_annotation() with a cache."""
+
+    def setUp(self):
+        self.cache = AnnotationCache()
+        self.api = API(username="testuser", api_key="testkey", annotation_cache=self.cache)
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_repeated_reads_hit_cache(self, mock_get):
+        mock_get.return_value = annotation_response()
+        for _ in range(5):
+            self.assertEqual(self.api.get_annotation("abc")["text"], "hello")
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(self.cache.hits, 4)
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_auth_modes_cached_separately(self, mock_get):
+        mock_get.return_value = annotation_response()
+        self.api.get_annotation("abc")
+        self.api.get_annotation("abc", authenticated=False)
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_errors_are_not_cached(self, mock_get):
+        missing = Mock(status_code=404, text="missing")
+        mock_get.side_effect = [missing, annotation_response()]
+        with self.assertRaises(NotFoundError):
+            self.api.get_annotation("abc")
+        self.assertEqual(self.api.get_annotation("abc")["id"], "abc")
+
+    @patch("hypothesisapi.requests.Session.put")
+    @patch("hypothesisapi.requests.Session.patch")
+    @patch("hypothesisapi.requests.Session.delete")
+    @patch("hypothesisapi.requests.Session.get")
+    def test_writes_invalidate(self, mock_get, mock_delete, mock_patch, mock_put):
+        mock_get.return_value = annotation_response()
+        ok = annotation_response()
+        mock_delete.return_value = mock_patch.return_value = mock_put.return_value = ok
+        writes = [
+            lambda: self.api.update("abc", {"text": "new"}),
+            lambda: self.api.delete("abc"),
+            lambda: self.api.hide("abc"),
+            lambda: self.api.unhide("abc"),
+            lambda: self.api.moderation("abc", "APPROVED"),
+        ]
+        for write in writes:
+            self.api.get_annotation("abc")
+            write()
+            calls = mock_get.call_count
+            self.api.get_annotation("abc")
+            self.assertEqual(mock_get.call_count, calls + 1)
+
+    @patch("hypothesisapi.requests.Session.patch")
+    @patch("hypothesisapi.requests.Session.get")
+    def test_failed_write_still_invalidates(self, mock_get, mock_patch):
+        mock_get.return_value = annotation_response()
+        mock_patch.side_effect = ConnectionError("boom")
+        self.api.get_annotation("abc")
+        with self.assertRaises(ConnectionError):
+            self.api.update("abc", {"text": "new"})
+        self.assertIsNone(self.cache.get("abc"))
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_no_cache_by_default(self, mock_get):
+        mock_get.return_value = annotation_response()
+        api = API(username="testuser", api_key="testkey")
+        api.get_annotation("abc")
+        api.get_annotation("abc")
+        self.assertEqual(mock_get.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_codec
+----------------------------------
+
+Tests for the pluggable JSON codec.
+"""
+
+import asyncio
+import json
+import unittest
+from unittest.mock import patch
+
+from hypothesisapi import API, AsyncAPI, OrjsonCodec, StdlibCodec
+from hypothesisapi import codec as codec_module
+
+from .stub_server import StubServer
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+class RecordingCodec(StdlibCodec):
+    """Standard library codec that counts its calls."""
+
+    def __init__(self):
+        self.loaded = 0
+        self.dumped = []
+
+    def loads(self, data):
+        self.loaded += 1
+        return super().loads(data)
+
+    def dumps(self, obj):
+        self.dumped.append(obj)
+        return super().dumps(obj)
+
+
+def echo_handler(method, path, headers, body):
+    """Answer with the request's Content-Type and decoded body."""
+    payload = {
+        "content_type": headers.get("Content-Type"),
+        "body": json.loads(body) if body else None,
+    }
+    return 200, {"Content-Type": "application/json"}, json.dumps(payload).encode("utf-8")
+
+
+class TestCodecs(unittest.TestCase):
+    """Tests for the codec implementations."""
+
+    document = {"id": "abc", "text": "naïve ✓", "tags": ["a"], "n": 1.5, "flag": None}
+
+    def test_stdlib_round_trip(self):
+        codec = StdlibCodec()
+        encoded = codec.dumps(self.document)
+        expected = '{"id":"abc","text":"naïve ✓","tags":["a"],"n":1.5,"flag":null}'
+        self.assertEqual(encoded, expected.encode("utf-8"))
+        self.assertEqual(codec.loads(encoded), self.document)
+        self.assertEqual(codec.loads(encoded.decode("utf-8")), self.document)
+
+    @unittest.skipIf(codec_module.orjson is None, "orjson not installed")
+    def test_orjson_matches_stdlib(self):
+        encoded = StdlibCodec().dumps(self.document)
+        self.assertEqual(OrjsonCodec().dumps(self.document), encoded)
+        self.assertEqual(OrjsonCodec().loads(encoded), self.document)
+
+    def test_invalid_input_raises_value_error(self):
+        for codec in [StdlibCodec()] + ([OrjsonCodec()] if codec_module.orjson else []):
+            with self.subTest(codec=codec.name), self.assertRaises(ValueError):
+                codec.loads(b"{not json")
+
+    def test_default_falls_back_to_stdlib(self):
+        with patch.object(codec_module, "orjson", None):
+            self.assertIsInstance(codec_module.default_codec(), StdlibCodec)
+            with self.assertRaises(ImportError):
+                OrjsonCodec()
+
+
+class TestClientsUseCodec(unittest.TestCase):
+    """Request and response bodies go through the client's codec."""
+
+    def test_sync_api(self):
+        codec = RecordingCodec()
+        with StubServer(echo_handler) as server:
+            with API(username="me", api_key="key", api_url=server.url, codec=codec) as api:
+                result = api.update("abc", {"text": "ü"})
+        self.assertEqual(result["body"], {"text": "ü"})
+        self.assertEqual(result["content_type"], "application/json;charset=UTF-8")
+        self.assertEqual(codec.dumped, [{"text": "ü"}])
+        self.assertEqual(codec.loaded, 1)
+
+    def test_session_without_headers_gets_json_content_type(self):
+        codec = RecordingCodec()
+        with StubServer(echo_handler) as server:
+            api = API(username="me", api_key="key", api_url=server.url, codec=codec)
+            response = api.transport.session.post(f"{server.url}/x", json=[1, 2])
+            api.close()
+        self.assertEqual(response.json(), {"content_type": "application/json", "body": [1, 2]})
+
+    @unittest.skipIf(httpx is None, "httpx not installed")
+    def test_async_api(self):
+        codec = RecordingCodec()
+        received = []
+
+        def handler(request):
+            received.append(json.loads(request.content))
+            return httpx.Response(200, content=b'{"id": "abc"}')
+
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            async with AsyncAPI(username="me", api_key="key", client=client, codec=codec) as api:
+                return await api.update("abc", {"text": "new"})
+
+        self.assertEqual(asyncio.run(run()), {"id": "abc"})
+        self.assertEqual(received, [{"text": "new"}])
+        self.assertEqual((codec.dumped, codec.loaded), ([{"text": "new"}], 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_concurrency
+----------------------------------
+
+Tests for the AIMD concurrency governor and the shared thread-pool helper.
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlparse
+
+from hypothesisapi import API, AdaptiveConcurrency, HypothesisAPIError
+from hypothesisapi.concurrency import _chain_concurrently, _observe_response, _run_concurrently
+
+from .helpers import json_body
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+    """Tests for limit adjustments."""
+
+    def test_healthy_completions_raise_limit_additively(self):
+        governor = AdaptiveConcurrency(initial=4, max_limit=10)
+        for _ in range(4):
+            governor.run(lambda: None)
+        self.assertEqual(governor.limit, 4)  # 4 + 4 * ~1/4 stays just below 5
+        for _ in range(4):
+            governor.run(lambda: None)
+        self.assertEqual(governor.limit, 5)
+
+    def test_limit_is_capped_at_max(self):
+        governor = AdaptiveConcurrency(initial=2, max_limit=3)
+        for _ in range(100):
+            governor.run(lambda: None)
+        self.assertEqual(governor.limit, 3)
+
+    def test_throttle_cuts_limit_multiplicatively(self):
+        governor = AdaptiveConcurrency(initial=16, max_limit=32)
+        governor.run(_observe_response, 429)
+        self.assertEqual(governor.limit, 8)
+        governor.run(_observe_response, 503)
+        self.assertEqual(governor.limit, 4)
+        self.assertEqual(governor.throttle_count, 2)
+
+    def test_limit_never_drops_below_min(self):
+        governor = AdaptiveConcurrency(initial=4, min_limit=2)
+        for _ in range(5):
+            governor.run(_observe_response, 429)
+        self.assertEqual(governor.limit, 2)
+
+    def test_one_cut_per_burst(self):
+        governor = AdaptiveConcurrency(initial=16, max_limit=32)
+        started = [governor.acquire() for _ in range(3)]
+        for start in started:
+            governor.on_throttle(start)
+            governor.release(start, healthy=False)
+        self.assertEqual(governor.limit, 8)
+
+    def test_client_errors_and_outside_tasks_are_ignored(self):
+        governor = AdaptiveConcurrency(initial=8)
+        governor.run(_observe_response, 404)
+        _observe_response(429)  # no governor running this task
+        self.assertEqual(governor.throttle_count, 0)
+
+    def test_slow_tasks_hold_limit(self):
+        governor = AdaptiveConcurrency(initial=2, latency_target=0.001)
+        for _ in range(5):
+            governor.run(time.sleep, 0.005)
+        self.assertEqual(governor.limit, 2)
+
+    def test_failed_tasks_do_not_raise_limit(self):
+        governor = AdaptiveConcurrency(initial=2)
+
+        def fail():
+            raise ValueError("boom")
+
+        for _ in range(5):
+            with self.assertRaises(ValueError):
+                governor.run(fail)
+        self.assertEqual(governor.limit, 2)
+        self.assertEqual(governor.in_flight, 0)
+
+    def test_in_flight_never_exceeds_limit(self):
+        governor = AdaptiveConcurrency(initial=3, max_limit=3)
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        def work():
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+
+        threads = [threading.Thread(target=governor.run, args=(work,)) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(peak, 3)
+
+    def test_invalid_settings_raise(self):
+        with self.assertRaises(ValueError):
+            AdaptiveConcurrency(initial=8, max_limit=4)
+        with self.assertRaises(ValueError):
+            AdaptiveConcurrency(min_limit=0)
+        with self.assertRaises(ValueError):
+            AdaptiveConcurrency(backoff=1)
+
+
+class TestRunConcurrently(unittest.TestCase):
+    """Tests for the shared thread-pool helper."""
+
+    def test_ordered_results(self):
+        def slow_square(n):
+            time.sleep(0.001 * (10 - n))
+            return n * n
+
+        results = list(_run_concurrently(slow_square, range(10), 4))
+        self.assertEqual(results, [n * n for n in range(10)])
+
+    def test_unordered_results(self):
+        results = list(_run_concurrently(lambda n: n, range(20), 4, ordered=False))
+        self.assertEqual(sorted(results), list(range(20)))
+
+    def test_exception_propagates(self):
+        def fail_on_three(n):
+            if n == 3:
+                raise ValueError("three")
+            return n
+
+        seen = []
+        with self.assertRaises(ValueError):
+            for n in _run_concurrently(fail_on_three, range(10), 2):
+                seen.append(n)
+        self.assertEqual(seen, [0, 1, 2])
+
+    def test_governor_sets_pool_size(self):
+        governor = AdaptiveConcurrency(initial=1, max_limit=2)
+        names = set(_run_concurrently(lambda n: threading.current_thread().name, range(20), 8,
+                                      concurrency=governor, thread_name_prefix="test-pool"))
+        self.assertTrue(all(name.startswith("test-pool") for name in names))
+        self.assertLessEqual(len(names), 2)
+
+    def test_governor_capped_at_pool_size(self):
+        governor = AdaptiveConcurrency(initial=8, max_limit=32)
+        names = set(_run_concurrently(lambda n: threading.current_thread().name, range(50), 8,
+                                      concurrency=governor, pool_maxsize=3))
+        self.assertLessEqual(len(names), 3)
+        self.assertEqual((governor.max_limit, governor.limit), (3, 3))
+
+
+class TestChainConcurrently(unittest.TestCase):
+    """Tests for the streaming thread-pool helper."""
+
+    def test_values_in_input_order(self):
+        def count(n):
+            for i in range(n):
+                time.sleep(0.001 * (5 - n))
+                yield (n, i)
+
+        expected = [(n, i) for n in range(5) for i in range(n)]
+        self.assertEqual(list(_chain_concurrently(count, range(5), 3)), expected)
+
+    def test_read_ahead_is_bounded(self):
+        produced = []
+
+        def endless(n):
+            while True:
+                produced.append(n)
+                yield n
+
+        values = _chain_concurrently(endless, range(10), 2, buffer=2)
+        self.assertEqual(next(values), 0)
+        time.sleep(0.05)
+        self.assertLessEqual(len(produced), 2 * (2 + 1) + 1)
+        values.close()
+
+    def test_exception_propagates_in_order(self):
+        def values(n):
+            yield n
+            if n == 1:
+                raise ValueError("one")
+
+        seen = []
+        with self.assertRaises(ValueError):
+            for value in _chain_concurrently(values, range(4), 4):
+                seen.append(value)
+        self.assertEqual(seen, [0, 1])
+
+    def test_governor_slot_per_step(self):
+        governor = AdaptiveConcurrency(initial=1, max_limit=2)
+        values = list(
+            _chain_concurrently(lambda n: iter(range(n)), [3, 3], 8, concurrency=governor)
+        )
+        self.assertEqual(values, [0, 1, 2, 0, 1, 2])
+        self.assertEqual(governor.in_flight, 0)
+
+
+class TestSearchParallelGovernor(unittest.TestCase):
+    """Tests that throttled pages cut the governor's limit."""
+
+    @patch("hypothesisapi.transport.time.sleep")
+    @patch("hypothesisapi.requests.Session.get")
+    def test_throttled_pages_cut_limit(self, mock_get, mock_sleep):
+        throttled = set()
+
+        def side_effect(url, **kwargs):
+            start = int(parse_qs(urlparse(url).query)["offset"][0])
+            response = Mock()
+            if start and start % 30 == 0 and start not in throttled:
+                throttled.add(start)
+                response.status_code = 429
+                response.headers = {}
+                return response
+            response.status_code = 200
+            response.content = json_body({
+                "rows": [{"id": str(i)} for i in range(start, min(start + 10, 100))],
+                "total": 100,
+            })
+            return response
+
+        mock_get.side_effect = side_effect
+        governor = AdaptiveConcurrency(initial=8, max_limit=8)
+        api = API(username="testuser", api_key="testkey")
+        ids = [row["id"] for row in api.search_parallel(limit=10, concurrency=governor)]
+        self.assertEqual(ids, [str(i) for i in range(100)])
+        self.assertGreater(governor.throttle_count, 0)
+        self.assertLess(governor.limit, 8)
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_failed_page_raises(self, mock_get):
+        response = Mock()
+        response.status_code = 404
+        response.text = "missing"
+        mock_get.return_value = response
+        api = API(username="testuser", api_key="testkey")
+        with self.assertRaises(HypothesisAPIError):
+            list(api.search_parallel(concurrency=AdaptiveConcurrency()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_crawl
+----------------------------------
+
+Tests for the time-window partitioned crawler.
+"""
+
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlparse
+
+from hypothesisapi import API, crawl
+from hypothesisapi.crawl import _to_millis
+
+from .helpers import json_body
+
+
+def make_corpus(count, spacing=timedelta(minutes=7)):
+    """Annotations with increasing created timestamps."""
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {"id": f"id{i:04d}", "created": (base + spacing * i).isoformat(timespec="microseconds")}
+        for i in range(count)
+    ]
+
+
+class FakeSearch:
+    """Session.get side effect emulating sort/order/search_after/limit."""
+
+    def __init__(self, corpus, honor_total=True):
+        self.corpus = corpus
+        self.honor_total = honor_total
+        self.queries = []
+
+    def __call__(self, url, **kwargs):
+        query = {k: v[0] for k, v in parse_qs(urlparse(url).query).items()}
+        self.queries.append(query)
+        field = query.get("sort", "updated")
+        rows = sorted(self.corpus, key=lambda r: r[field], reverse=query.get("order") == "desc")
+        total = len(rows)
+        if "search_after" in query:
+            after = query["search_after"]
+            after_ms = int(after) if after.isdigit() else _to_millis(after)
+            rows = [r for r in rows if _to_millis(r[field]) > after_ms]
+            if self.honor_total:
+                total = len(rows)
+        limit = int(query["limit"])
+        response = Mock()
+        response.status_code = 200
+        response.content = json_body({"rows": rows[:limit], "total": total})
+        return response
+
+
+class TestCrawl(unittest.TestCase):
+    """Tests for crawl()."""
+
+    def setUp(self):
+        self.api = API(username="testuser", api_key="testkey")
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_crawl_yields_every_row_in_order(self, mock_get):
+        corpus = make_corpus(500)
+        mock_get.side_effect = FakeSearch(corpus)
+        ids = [row["id"] for row in crawl(self.api, max_window_rows=60, limit=25)]
+        self.assertEqual(ids, [row["id"] for row in corpus])
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_crawl_splits_large_windows(self, mock_get):
+        corpus = make_corpus(400)
+        fake = FakeSearch(corpus, honor_total=False)
+        mock_get.side_effect = fake
+        list(crawl(self.api, max_window_rows=50, max_workers=2, limit=200))
+        window_starts = {q["search_after"] for q in fake.queries if q["limit"] == "200"}
+        # 400 rows in windows of at most 50 rows need at least 8 windows
+        self.assertGreaterEqual(len(window_starts), 8)
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_crawl_estimates_windows_from_rows(self, mock_get):
+        # 20 rows in the first hour, 200 spread over the next 200 days
+        corpus = make_corpus(20, timedelta(minutes=3))
+        corpus += make_corpus(220, timedelta(days=1))[20:]
+        fake = FakeSearch(corpus, honor_total=False)
+        mock_get.side_effect = fake
+        ids = [row["id"] for row in crawl(self.api, max_window_rows=40, max_workers=1, limit=20)]
+        self.assertEqual(ids, sorted(row["id"] for row in corpus))
+        window_starts = {
+            q["search_after"] for q in fake.queries if q.get("search_after", "").isdigit()
+        }
+        self.assertGreaterEqual(len(window_starts), 220 // 40)
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_crawl_never_uses_offset(self, mock_get):
+        fake = FakeSearch(make_corpus(120))
+        mock_get.side_effect = fake
+        list(crawl(self.api, max_window_rows=30, limit=20))
+        for query in fake.queries:
+            self.assertNotIn("offset", query)
+            self.assertEqual(query["sort"], "created")
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_crawl_respects_start_and_end(self, mock_get):
+        corpus = make_corpus(100)
+        mock_get.side_effect = FakeSearch(corpus)
+        start, end = corpus[10]["created"], corpus[19]["created"]
+        ids = [row["id"] for row in crawl(self.api, start=start, end=end)]
+        self.assertEqual(ids, [row["id"] for row in corpus[10:20]])
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_crawl_survives_totals_ignoring_search_after(self, mock_get):
+        corpus = make_corpus(90)
+        mock_get.side_effect = FakeSearch(corpus, honor_total=False)
+        ids = [row["id"] for row in crawl(self.api, max_window_rows=10, limit=15)]
+        self.assertEqual(ids, [row["id"] for row in corpus])
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_crawl_empty_result(self, mock_get):
+        mock_get.side_effect = FakeSearch([])
+        self.assertEqual(list(crawl(self.api, tag="nothing")), [])
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_crawl_passes_filters(self, mock_get):
+        fake = FakeSearch(make_corpus(5))
+        mock_get.side_effect = fake
+        list(crawl(self.api, user="someone", tag="t"))
+        self.assertEqual(fake.queries[0]["user"], "acct:someone@hypothes.is")
+        self.assertEqual(fake.queries[0]["tag"], "t")
+
+    def test_crawl_rejects_managed_parameters(self):
+        with self.assertRaises(ValueError):
+            crawl(self.api, sort="updated")
+        with self.assertRaises(ValueError):
+            crawl(self.api, field="id")
+        with self.assertRaises(ValueError):
+            crawl(self.api, max_workers=0)
+
+    def test_to_millis(self):
+        self.assertEqual(_to_millis("1970-01-01T00:00:01.500000+00:00"), 1500)
+        self.assertEqual(_to_millis("1970-01-01T00:00:02Z"), 2000)
+        self.assertEqual(_to_millis(datetime(1970, 1, 1, 0, 0, 3)), 3000)
+        self.assertEqual(_to_millis(42), 42)
+
+
+if __name__ == "__main__":
+    unittest.main()
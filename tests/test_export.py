@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_export
+----------------------------------
+
+Tests for streaming JSON Lines export.
+"""
+
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from hypothesisapi import API, HypothesisAPIError, export_jsonl, export_parquet
+from hypothesisapi.export import PARQUET_COLUMNS, _arrow_schema, flatten_annotation
+
+from .helpers import cursor_pages, make_response
+
+try:
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+def make_rows(count, start=0):
+    return [
+        {
+            "id": f"id{n}",
+            "created": f"2024-01-01T00:{n // 60:02d}:{n % 60:02d}",
+            "text": f"note ü {n}",
+        }
+        for n in range(start, start + count)
+    ]
+
+
+class TestExportJsonl(unittest.TestCase):
+    """Tests for export_jsonl()."""
+
+    def setUp(self):
+        self.api = API(username="testuser", api_key="testkey")
+        self.rows = make_rows(450)
+        patcher = patch("hypothesisapi.requests.Session.get", side_effect=cursor_pages(self.rows))
+        self.mock_get = patcher.start()
+        self.addCleanup(patcher.stop)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = directory.name
+
+    def test_binary_stream(self):
+        out = io.BytesIO()
+        report = export_jsonl(self.api, out, tag="x")
+        lines = out.getvalue().decode("utf-8").splitlines()
+        self.assertEqual(report.rows, 450)
+        self.assertEqual([json.loads(line)["id"] for line in lines], [r["id"] for r in self.rows])
+        params = parse_qs(urlparse(self.mock_get.call_args_list[0][0][0]).query)
+        self.assertEqual(
+            (params["sort"], params["order"], params["tag"]), (["created"], ["asc"], ["x"])
+        )
+
+    def test_text_stream(self):
+        out = io.StringIO()
+        export_jsonl(self.api, out)
+        self.assertEqual(len(out.getvalue().splitlines()), 450)
+        with self.assertRaises(ValueError):
+            export_jsonl(self.api, io.StringIO(), compression="gzip")
+
+    def test_gzip_chosen_from_suffix(self):
+        path = os.path.join(self.dir, "out.jsonl.gz")
+        export_jsonl(self.api, path)
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            self.assertEqual(sum(1 for _ in f), 450)
+
+    def test_resume_after_failure(self):
+        path = os.path.join(self.dir, "out.jsonl.gz")
+        checkpoint = os.path.join(self.dir, "out.ckpt")
+        healthy = self.mock_get.side_effect
+        calls = []
+
+        def failing(url, **kwargs):
+            calls.append(url)
+            if len(calls) == 3:
+                return make_response(400)
+            return healthy(url, **kwargs)
+
+        self.mock_get.side_effect = failing
+        with self.assertRaises(HypothesisAPIError):
+            export_jsonl(self.api, path, checkpoint=checkpoint, group="g")
+        # A partial page written after the checkpoint is dropped on resume
+        with open(path, "ab") as f:
+            f.write(b"garbage")
+
+        self.mock_get.side_effect = healthy
+        report = export_jsonl(self.api, path, checkpoint=checkpoint, group="g")
+        self.assertTrue(report.resumed)
+        self.assertEqual((report.rows, report.total_rows), (50, 450))
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            ids = [json.loads(line)["id"] for line in f]
+        self.assertEqual(ids, [r["id"] for r in self.rows])
+
+    def test_rerun_appends_new_rows(self):
+        path = os.path.join(self.dir, "out.jsonl")
+        checkpoint = os.path.join(self.dir, "out.ckpt")
+        export_jsonl(self.api, path, checkpoint=checkpoint)
+        self.rows.extend(make_rows(3, start=450))
+        report = export_jsonl(self.api, path, checkpoint=checkpoint)
+        self.assertEqual((report.rows, report.total_rows), (3, 453))
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 453)
+
+    def test_checkpoint_for_other_query_raises(self):
+        path = os.path.join(self.dir, "out.jsonl")
+        checkpoint = os.path.join(self.dir, "out.ckpt")
+        export_jsonl(self.api, path, checkpoint=checkpoint, group="a")
+        with self.assertRaises(ValueError):
+            export_jsonl(self.api, path, checkpoint=checkpoint, group="b")
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            export_jsonl(self.api, io.BytesIO(), sort="updated")
+        with self.assertRaises(ValueError):
+            export_jsonl(self.api, io.BytesIO(), compression="bz2")
+        with self.assertRaises(ValueError):
+            export_jsonl(self.api, io.BytesIO(), checkpoint=os.path.join(self.dir, "c"))
+
+    @patch("hypothesisapi.export.zstandard", None)
+    def test_zstd_requires_zstandard(self):
+        with self.assertRaises(ImportError):
+            export_jsonl(self.api, os.path.join(self.dir, "out.jsonl.zst"))
+
+
+class TestFlattenAnnotation(unittest.TestCase):
+    """Tests for the flat Parquet row layout."""
+
+    def test_columns(self):
+        row = flatten_annotation({
+            "id": "abc",
+            "created": "2024-01-02T03:04:05.123456+00:00",
+            "updated": "2024-01-03T00:00:00Z",
+            "user": "acct:alice@hypothes.is",
+            "uri": "https://example.com",
+            "group": "__world__",
+            "text": "note",
+            "target": [{"selector": [{"type": "TextQuoteSelector", "exact": "quoted"}]}],
+            "document": {"title": ["ignored"]},
+        })
+        self.assertEqual(row["created"], datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc))
+        self.assertEqual(row["updated"], datetime(2024, 1, 3, tzinfo=timezone.utc))
+        self.assertEqual((row["tags"], row["quote"]), ([], "quoted"))
+        self.assertNotIn("document", row)
+
+    def test_keys_follow_parquet_columns(self):
+        row = flatten_annotation({"id": "abc"})
+        self.assertEqual(list(row), [name for name, _ in PARQUET_COLUMNS])
+        self.assertEqual((row["created"], row["tags"], row["quote"]), (None, [], ""))
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_arrow_schema_matches_parquet_columns(self):
+        schema = _arrow_schema()
+        self.assertEqual([(field.name, str(field.type)) for field in schema], list(PARQUET_COLUMNS))
+
+
+class TestExportParquet(unittest.TestCase):
+    """Tests for export_parquet()."""
+
+    def setUp(self):
+        self.api = API(username="testuser", api_key="testkey")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "out.parquet")
+
+    @patch("hypothesisapi.export.pyarrow", None)
+    def test_requires_pyarrow(self):
+        with self.assertRaises(ImportError):
+            export_parquet(self.api, self.path)
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_row_groups_and_types(self):
+        rows = [dict(row, tags=["a"]) for row in make_rows(450)]
+        with patch("hypothesisapi.requests.Session.get", side_effect=cursor_pages(rows)):
+            report = export_parquet(self.api, self.path, row_group_size=100, tag="a")
+        self.assertEqual(report.rows, 450)
+        parquet_file = pyarrow.parquet.ParquetFile(self.path)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 5)
+        table = parquet_file.read()
+        self.assertEqual(str(table.schema.field("created").type), "timestamp[us, tz=UTC]")
+        self.assertEqual(table.column("tags").to_pylist()[0], ["a"])
+        self.assertEqual(table.column("id").to_pylist(), [r["id"] for r in rows])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_httpcache
+----------------------------------
+
+Tests for conditional GETs through the transport's HTTP cache, run against a
+local stub server that honors If-None-Match.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from hypothesisapi import API, HTTPCache, SQLiteCacheBackend
+from hypothesisapi.httpcache import CacheEntry, MemoryCacheBackend, endpoint_for
+
+from .stub_server import StubServer
+
+
+class ETagServer:
+    """Stub handler serving JSON documents by path with ETag validation."""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.version = 1
+        self.not_modified = 0
+
+    def __call__(self, method, path, headers, body):
+        if method != "GET":
+            self.version += 1
+            return 200, {"Content-Type": "application/json"}, b"{}"
+        etag = f'"v{self.version}"'
+        if headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            return 304, {"ETag": etag}, b""
+        document = self.documents.get(path.split("?")[0], {})
+        payload = json.dumps({**document, "version": self.version})
+        return 200, {"Content-Type": "application/json", "ETag": etag}, payload.encode("utf-8")
+
+
+class TestEndpointNames(unittest.TestCase):
+    """Tests for mapping URLs to endpoint names."""
+
+    def test_endpoint_for(self):
+        base = "https://hypothes.is/api"
+        cases = {
+            base: "root",
+            f"{base}/links": "get_links",
+            f"{base}/profile": "get_profile",
+            f"{base}/profile/groups": "get_profile_groups",
+            f"{base}/groups?authority=x": "get_groups",
+            f"{base}/groups/abc": "get_group",
+            f"{base}/groups/abc/members": "get_group_members",
+            f"{base}/annotations/abc": "get_annotation",
+            f"{base}/search?limit=1": "search",
+            f"{base}/analytics/events": "default",
+        }
+        for url, name in cases.items():
+            with self.subTest(url=url):
+                self.assertEqual(endpoint_for(url), name)
+
+    def test_unknown_endpoint_in_freshness_raises(self):
+        with self.assertRaises(ValueError):
+            HTTPCache(freshness={"get_everything": 10})
+
+
+class TestMemoryCacheBackend(unittest.TestCase):
+    """Tests for the default entry storage."""
+
+    def test_lru_eviction_and_delete_by_url(self):
+        backend = MemoryCacheBackend(max_entries=2)
+        for key in ("a", "b", "c"):
+            backend.set(key, CacheEntry(url=f"https://x/{key}", status=200, headers={}, body=b""))
+        self.assertIsNone(backend.get("a"))
+        backend.delete_urls(["https://x/b"])
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(len(backend), 1)
+
+
+class TestSQLiteCacheBackend(unittest.TestCase):
+    """Tests for the persistent entry storage."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cache", "http.sqlite")
+
+    def open_backend(self, **kwargs):
+        backend = SQLiteCacheBackend(self.path, **kwargs)
+        self.addCleanup(backend.close)
+        return backend
+
+    def test_entries_survive_reopening(self):
+        entry = CacheEntry(
+            url="https://x/a", status=200, headers={"ETag": '"v1"'}, body=b"\x00{}", stored_at=5.0
+        )
+        self.open_backend().set("k", entry)
+        self.assertEqual(self.open_backend().get("k"), entry)
+
+    def test_wal_mode(self):
+        backend = self.open_backend()
+        mode = backend._connection().execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_least_recently_read_evicted(self):
+        backend = self.open_backend(max_entries=2)
+        with patch("hypothesisapi.httpcache.time.time", side_effect=[100.0, 200.0, 300.0, 400.0]):
+            backend.set("a", CacheEntry(url="https://x/a", status=200, headers={}, body=b""))
+            backend.set("b", CacheEntry(url="https://x/b", status=200, headers={}, body=b""))
+            backend.get("a")
+            backend.set("c", CacheEntry(url="https://x/c", status=200, headers={}, body=b""))
+        self.assertIsNone(backend.get("b"))
+        self.assertIsNotNone(backend.get("a"))
+        self.assertEqual(len(backend), 2)
+
+    def test_recent_reads_not_rewritten(self):
+        backend = self.open_backend()
+        with patch("hypothesisapi.httpcache.time.time", side_effect=[100.0, 130.0, 170.0]):
+            backend.set("a", CacheEntry(url="https://x/a", status=200, headers={}, body=b""))
+            backend.get("a")
+            rows = backend._connection().execute("SELECT accessed_at FROM responses")
+            accessed = rows.fetchone()[0]
+            self.assertEqual(accessed, 100.0)
+            backend.get("a")
+        accessed = backend._connection().execute("SELECT accessed_at FROM responses").fetchone()[0]
+        self.assertEqual(accessed, 170.0)
+
+    def test_entry_count_checked_periodically(self):
+        backend = self.open_backend(max_entries=300)
+        with patch.object(SQLiteCacheBackend, "__len__", return_value=0) as count:
+            for n in range(9):
+                entry = CacheEntry(url=f"https://x/{n}", status=200, headers={}, body=b"")
+                backend.set(f"k{n}", entry)
+        self.assertEqual(count.call_count, 3)
+
+    def test_delete_urls_purge_and_clear(self):
+        backend = self.open_backend()
+        backend.set(
+            "a1", CacheEntry(url="https://x/a", status=200, headers={}, body=b"", stored_at=0.0)
+        )
+        backend.set("a2", CacheEntry(url="https://x/a", status=200, headers={}, body=b""))
+        backend.set("b", CacheEntry(url="https://x/b", status=200, headers={}, body=b""))
+        backend.delete_urls(["https://x/a"])
+        self.assertEqual(len(backend), 1)
+        backend.set(
+            "old", CacheEntry(url="https://x/old", status=200, headers={}, body=b"", stored_at=0.0)
+        )
+        self.assertEqual(backend.purge(older_than=3600), 1)
+        backend.clear()
+        self.assertEqual(len(backend), 0)
+
+    def test_threads_share_the_file(self):
+        backend = self.open_backend()
+
+        def write(n):
+            backend.set(f"k{n}", CacheEntry(url=f"https://x/{n}", status=200, headers={}, body=b""))
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(backend), 8)
+
+
+class TestConditionalRequests(unittest.TestCase):
+    """Tests for 304 handling and freshness through API calls."""
+
+    def setUp(self):
+        self.handler = ETagServer({"/profile": {"userid": "acct:me@hypothes.is"}})
+        self.server = StubServer(self.handler).__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+
+    def make_api(self, cache):
+        api = API(username="me", api_key="key", api_url=self.server.url + "/api", http_cache=cache)
+        self.addCleanup(api.close)
+        return api
+
+    def test_not_modified_served_from_cache(self):
+        cache = HTTPCache()
+        api = self.make_api(cache)
+        first = api.get_profile()
+        second = api.get_profile()
+        self.assertEqual(first, second)
+        self.assertEqual(self.handler.not_modified, 1)
+        self.assertEqual(self.server.requests[1][2]["If-None-Match"], '"v1"')
+        self.assertEqual((cache.misses, cache.revalidations, cache.hits), (1, 1, 0))
+
+    def test_changed_resource_downloaded_again(self):
+        api = self.make_api(HTTPCache())
+        api.get_profile()
+        self.handler.version = 2
+        self.assertEqual(api.get_profile()["version"], 2)
+        self.assertEqual(self.handler.not_modified, 0)
+
+    def test_fresh_entries_skip_the_network(self):
+        cache = HTTPCache(freshness={"get_profile": 60})
+        api = self.make_api(cache)
+        with patch("hypothesisapi.httpcache.time.time", return_value=1000.0):
+            api.get_profile()
+            api.get_profile()
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(cache.hits, 1)
+        with patch("hypothesisapi.httpcache.time.time", return_value=1061.0):
+            api.get_profile()
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(cache.revalidations, 1)
+
+    def test_credentials_are_cached_separately(self):
+        cache = HTTPCache(freshness={"default": 60})
+        api = self.make_api(cache)
+        other = API(
+            username="you", api_key="other", api_url=self.server.url + "/api", http_cache=cache
+        )
+        self.addCleanup(other.close)
+        api.get_profile()
+        other.get_profile()
+        self.assertEqual(len(self.server.requests), 2)
+        for key in cache.backend._entries:
+            self.assertNotIn("key", key.split(" ", 1)[0])
+
+    def test_write_invalidates_entry(self):
+        cache = HTTPCache(freshness={"get_profile": 60})
+        api = self.make_api(cache)
+        api.get_profile()
+        api.update_profile({"show_sidebar_tutorial": False})
+        self.assertEqual(api.get_profile()["version"], 2)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_bypass_refreshes_entry(self):
+        cache = HTTPCache(freshness={"get_profile": 60})
+        api = self.make_api(cache)
+        api.get_profile()
+        with cache.bypass():
+            api.get_profile()
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertNotIn("If-None-Match", self.server.requests[1][2])
+
+    def test_bypass_reaches_worker_threads(self):
+        cache = HTTPCache(freshness={"get_annotation": 600})
+        api = self.make_api(cache)
+        api.get_annotations(["a", "b"], authenticated=False)
+        with cache.bypass():
+            api.get_annotations(["a", "b"], authenticated=False, max_workers=2)
+        self.assertEqual(len(self.server.requests), 4)
+        self.assertEqual(cache.hits, 0)
+
+    def test_counts_from_worker_threads(self):
+        cache = HTTPCache(freshness={"get_annotation": 600})
+        api = self.make_api(cache)
+        ids = [f"id{n}" for n in range(40)]
+        api.get_annotations(ids, authenticated=False, max_workers=8)
+        api.get_annotations(ids, authenticated=False, max_workers=8)
+        self.assertEqual((cache.misses, cache.hits), (40, 40))
+
+    def test_responses_without_validators_are_not_stored(self):
+        def handler(method, path, headers, body):
+            return 200, {"Content-Type": "application/json"}, b'{"ok": true}'
+
+        self.server.handler = handler
+        cache = HTTPCache()
+        api = self.make_api(cache)
+        api.get_profile()
+        self.assertEqual(len(cache.backend), 0)
+
+    def test_persistent_backend_starts_warm(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "http.sqlite")
+        for _ in range(2):
+            backend = SQLiteCacheBackend(path)
+            self.addCleanup(backend.close)
+            api = self.make_api(HTTPCache(backend=backend, freshness={"get_profile": 600}))
+            self.assertEqual(api.get_profile()["version"], 1)
+        self.assertEqual(len(self.server.requests), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,19 +8,24 @@ test_hypothesisapi
 Tests for `hypothesisapi` module.
 """
 
+import time
 import unittest
 from unittest.mock import Mock, patch, call
+from urllib.parse import parse_qs, urlparse
 
 from hypothesisapi import (
     API,
     API_URL,
     APP_URL,
+    MAX_SEARCH_OFFSET,
     HypothesisAPIError,
     AuthenticationError,
     NotFoundError,
     ForbiddenError,
 )
 
+from .helpers import cursor_pages, json_body
+
 
 class TestAPIInit(unittest.TestCase):
     """Tests for API initialization."""
@@ -82,14 +87,14 @@ class TestAPIResponseHandling(unittest.TestCase):
     def test_handle_response_success_200(self):
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "123"}
+        mock_response.content = json_body({"id": "123"})
         result = self.api._handle_response(mock_response)
         self.assertEqual(result, {"id": "123"})
 
     def test_handle_response_success_201(self):
         mock_response = Mock()
         mock_response.status_code = 201
-        mock_response.json.return_value = {"id": "123"}
+        mock_response.content = json_body({"id": "123"})
         result = self.api._handle_response(mock_response)
         self.assertEqual(result, {"id": "123"})
 
@@ -140,22 +145,22 @@ class TestAPICreate(unittest.TestCase):
             self.api.create({"text": "Test annotation"})
         self.assertIn("uri", str(ctx.exception))
 
-    @patch("hypothesisapi.requests.post")
+    @patch("hypothesisapi.requests.Session.post")
     def test_create_success(self, mock_post):
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "abc123"}
+        mock_response.content = json_body({"id": "abc123"})
         mock_post.return_value = mock_response
 
         result = self.api.create({"uri": "https://example.com", "text": "Test"})
         self.assertEqual(result["id"], "abc123")
         mock_post.assert_called_once()
 
-    @patch("hypothesisapi.requests.post")
+    @patch("hypothesisapi.requests.Session.post")
     def test_create_with_group(self, mock_post):
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "abc123", "group": "mygroup"}
+        mock_response.content = json_body({"id": "abc123", "group": "mygroup"})
         mock_post.return_value = mock_response
 
         result = self.api.create({"uri": "https://example.com"}, group="mygroup")
@@ -165,12 +170,12 @@ class TestAPICreate(unittest.TestCase):
         payload = call_args.kwargs["json"]
         self.assertEqual(payload["group"], "mygroup")
 
-    @patch("hypothesisapi.requests.post")
+    @patch("hypothesisapi.requests.Session.post")
     def test_create_does_not_override_payload_group(self, mock_post):
         """Test that create() doesn't override group if already in payload."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "abc123", "group": "payload_group"}
+        mock_response.content = json_body({"id": "abc123", "group": "payload_group"})
         mock_post.return_value = mock_response
 
         # Pass group in payload AND as argument - payload should win
@@ -190,20 +195,20 @@ class TestAPISearch(unittest.TestCase):
     def setUp(self):
         self.api = API(username="testuser", api_key="testkey")
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_search_single_page(self, mock_get):
         """Test search with results fitting in one page."""
         # First call returns results, second call returns empty (pagination check)
         mock_response_page1 = Mock()
         mock_response_page1.status_code = 200
-        mock_response_page1.json.return_value = {
+        mock_response_page1.content = json_body({
             "rows": [{"id": "1"}, {"id": "2"}],
             "total": 2,
-        }
+        })
 
         mock_response_page2 = Mock()
         mock_response_page2.status_code = 200
-        mock_response_page2.json.return_value = {"rows": [], "total": 2}
+        mock_response_page2.content = json_body({"rows": [], "total": 2})
 
         mock_get.side_effect = [mock_response_page1, mock_response_page2]
 
@@ -212,20 +217,20 @@ class TestAPISearch(unittest.TestCase):
         self.assertEqual(results[0]["id"], "1")
         self.assertEqual(results[1]["id"], "2")
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_search_pagination(self, mock_get):
         """Test search handles pagination correctly."""
         # First page returns results, second page is empty
         mock_response_page1 = Mock()
         mock_response_page1.status_code = 200
-        mock_response_page1.json.return_value = {
+        mock_response_page1.content = json_body({
             "rows": [{"id": "1"}, {"id": "2"}],
             "total": 2,
-        }
+        })
 
         mock_response_page2 = Mock()
         mock_response_page2.status_code = 200
-        mock_response_page2.json.return_value = {"rows": [], "total": 2}
+        mock_response_page2.content = json_body({"rows": [], "total": 2})
 
         mock_get.side_effect = [mock_response_page1, mock_response_page2]
 
@@ -234,16 +239,16 @@ class TestAPISearch(unittest.TestCase):
         # Should have made 2 calls (first page + check for more)
         self.assertEqual(mock_get.call_count, 2)
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_search_with_uri(self, mock_get):
         """Test search with URI filter."""
         mock_response_page1 = Mock()
         mock_response_page1.status_code = 200
-        mock_response_page1.json.return_value = {"rows": [{"id": "1"}], "total": 1}
+        mock_response_page1.content = json_body({"rows": [{"id": "1"}], "total": 1})
 
         mock_response_page2 = Mock()
         mock_response_page2.status_code = 200
-        mock_response_page2.json.return_value = {"rows": [], "total": 1}
+        mock_response_page2.content = json_body({"rows": [], "total": 1})
 
         mock_get.side_effect = [mock_response_page1, mock_response_page2]
 
@@ -252,18 +257,18 @@ class TestAPISearch(unittest.TestCase):
         call_url = mock_get.call_args_list[0][0][0]
         self.assertIn("uri=https", call_url)
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_search_empty_results(self, mock_get):
         """Test search with no results."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"rows": [], "total": 0}
+        mock_response.content = json_body({"rows": [], "total": 0})
         mock_get.return_value = mock_response
 
         results = list(self.api.search(user="nonexistent"))
         self.assertEqual(len(results), 0)
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_search_error_handling(self, mock_get):
         """Test that search raises errors for non-200 responses."""
         mock_response = Mock()
@@ -275,12 +280,12 @@ class TestAPISearch(unittest.TestCase):
             # Need to consume the generator to trigger the request
             list(self.api.search(user="testuser"))
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_search_with_multiple_tags(self, mock_get):
         """Test that multiple tags are serialized as repeated tag= parameters."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"rows": [], "total": 0}
+        mock_response.content = json_body({"rows": [], "total": 0})
         mock_get.return_value = mock_response
 
         list(self.api.search(tags=["tag1", "tag2"]))
@@ -290,12 +295,12 @@ class TestAPISearch(unittest.TestCase):
         self.assertIn("tag=tag2", call_url)
         self.assertNotIn("tags=", call_url)
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_search_with_single_tag_and_tags(self, mock_get):
         """Test combining tag and tags parameters."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"rows": [], "total": 0}
+        mock_response.content = json_body({"rows": [], "total": 0})
         mock_get.return_value = mock_response
 
         list(self.api.search(tag="single", tags=["multi1", "multi2"]))
@@ -305,24 +310,24 @@ class TestAPISearch(unittest.TestCase):
         self.assertIn("tag=multi1", call_url)
         self.assertIn("tag=multi2", call_url)
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_search_with_authority(self, mock_get):
         """Test search with custom authority."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"rows": [], "total": 0}
+        mock_response.content = json_body({"rows": [], "total": 0})
         mock_get.return_value = mock_response
 
         list(self.api.search(user="testuser", authority="custom.org"))
         call_url = mock_get.call_args_list[0][0][0]
         self.assertIn("acct%3Atestuser%40custom.org", call_url)
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_search_with_full_acct_user(self, mock_get):
         """Test search accepts full acct: format for user."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"rows": [], "total": 0}
+        mock_response.content = json_body({"rows": [], "total": 0})
         mock_get.return_value = mock_response
 
         list(self.api.search(user="acct:someone@other.org"))
@@ -330,16 +335,16 @@ class TestAPISearch(unittest.TestCase):
         # Should use the full acct string as-is
         self.assertIn("acct%3Asomeone%40other.org", call_url)
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_search_infinite_loop_guard(self, mock_get):
         """Test search breaks if same results are returned (infinite loop guard)."""
         # Return the same results twice - should break on second iteration
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = json_body({
             "rows": [{"id": "same_id"}],
             "total": 1,
-        }
+        })
         mock_get.return_value = mock_response
 
         results = list(self.api.search(user="testuser"))
@@ -349,28 +354,221 @@ class TestAPISearch(unittest.TestCase):
         self.assertLessEqual(mock_get.call_count, 2)
 
 
+def paged_search_responses(total, limit):
+    """Return a Session.get side effect serving `total` rows by offset."""
+    def side_effect(url, **kwargs):
+        params = parse_qs(urlparse(url).query)
+        start = int(params["offset"][0])
+        response = Mock()
+        response.status_code = 200
+        response.content = json_body({
+            "rows": [{"id": str(i)} for i in range(start, min(start + limit, total))],
+            "total": total,
+        })
+        return response
+    return side_effect
+
+
+class TestAPISearchCursor(unittest.TestCase):
+    """Tests for search_after cursor pagination."""
+
+    def setUp(self):
+        self.api = API(username="testuser", api_key="testkey")
+        self.rows = [
+            {
+                "id": f"id{i}",
+                "updated": f"2024-01-{i + 1:02d}T00:00:00",
+                "created": f"2023-{i + 1:02d}",
+            }
+            for i in range(7)
+        ]
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_cursor_uses_sort_field_of_last_row(self, mock_get):
+        mock_get.side_effect = cursor_pages(self.rows, "updated")
+        ids = [row["id"] for row in self.api.search(cursor=True, limit=3)]
+        self.assertEqual(ids, [f"id{i}" for i in range(7)])
+
+        queries = [parse_qs(urlparse(c[0][0]).query) for c in mock_get.call_args_list]
+        self.assertEqual(queries[0]["sort"], ["updated"])
+        self.assertNotIn("search_after", queries[0])
+        self.assertEqual(queries[1]["search_after"], [self.rows[2]["updated"]])
+        for query in queries:
+            self.assertNotIn("offset", query)
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_cursor_follows_explicit_sort(self, mock_get):
+        mock_get.side_effect = cursor_pages(self.rows)
+        ids = [row["id"] for row in self.api.search(cursor=True, sort="created", limit=4)]
+        self.assertEqual(len(ids), 7)
+        second = parse_qs(urlparse(mock_get.call_args_list[1][0][0]).query)
+        self.assertEqual(second["search_after"], [self.rows[3]["created"]])
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_search_after_implies_cursor(self, mock_get):
+        mock_get.side_effect = cursor_pages(self.rows, "updated")
+        ids = [row["id"] for row in self.api.search(search_after=self.rows[4]["updated"])]
+        self.assertEqual(ids, ["id5", "id6"])
+        first = parse_qs(urlparse(mock_get.call_args_list[0][0][0]).query)
+        self.assertEqual(first["search_after"], [self.rows[4]["updated"]])
+        self.assertNotIn("offset", first)
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_cursor_with_prefetch(self, mock_get):
+        mock_get.side_effect = cursor_pages(self.rows, "updated")
+        ids = [row["id"] for row in self.api.search(cursor=True, limit=2, prefetch=2)]
+        self.assertEqual(ids, [f"id{i}" for i in range(7)])
+
+    def test_cursor_rejects_non_unique_sort(self):
+        with self.assertRaises(ValueError):
+            list(self.api.search(cursor=True, sort="user"))
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_cursor_row_without_sort_field_raises(self, mock_get):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = json_body({"rows": [{"id": "1"}], "total": 1})
+        mock_get.return_value = mock_response
+        with self.assertRaises(HypothesisAPIError):
+            list(self.api.search(cursor=True))
+
+
+class TestAPISearchPrefetch(unittest.TestCase):
+    """Tests for search() with background page prefetching."""
+
+    def setUp(self):
+        self.api = API(username="testuser", api_key="testkey")
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_prefetch_yields_rows_in_order(self, mock_get):
+        mock_get.side_effect = paged_search_responses(total=23, limit=5)
+        ids = [row["id"] for row in self.api.search(limit=5, prefetch=3)]
+        self.assertEqual(ids, [str(i) for i in range(23)])
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_prefetch_stops_at_reported_total(self, mock_get):
+        mock_get.side_effect = paged_search_responses(total=10, limit=5)
+        list(self.api.search(limit=5, prefetch=1))
+        offsets = sorted(
+            int(parse_qs(urlparse(c[0][0]).query)["offset"][0]) for c in mock_get.call_args_list
+        )
+        # No speculative request for offset 10 once total=10 is known
+        self.assertEqual(offsets, [0, 5])
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_prefetch_requests_pages_ahead_of_consumer(self, mock_get):
+        mock_get.side_effect = paged_search_responses(total=100, limit=5)
+        results = self.api.search(limit=5, prefetch=3)
+        next(results)
+        # Pages 1-3 are requested while page 0 is still being consumed
+        deadline = time.monotonic() + 5
+        while mock_get.call_count < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(mock_get.call_count, 4)
+        results.close()
+
+    @patch("hypothesisapi.transport.time.sleep")
+    @patch("hypothesisapi.requests.Session.get")
+    def test_prefetch_raises_error_for_failing_page(self, mock_get, mock_sleep):
+        ok = paged_search_responses(total=100, limit=5)
+
+        def side_effect(url, **kwargs):
+            if "offset=10" in url:
+                response = Mock()
+                response.status_code = 500
+                response.text = "Server error"
+                return response
+            return ok(url, **kwargs)
+
+        mock_get.side_effect = side_effect
+        seen = []
+        with self.assertRaises(HypothesisAPIError):
+            for row in self.api.search(limit=5, prefetch=2):
+                seen.append(row["id"])
+        self.assertEqual(seen, [str(i) for i in range(10)])
+
+
+class TestAPISearchParallel(unittest.TestCase):
+    """Tests for offset-sharded parallel search."""
+
+    def setUp(self):
+        self.api = API(username="testuser", api_key="testkey")
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_parallel_ordered(self, mock_get):
+        mock_get.side_effect = paged_search_responses(total=47, limit=10)
+        ids = [row["id"] for row in self.api.search_parallel(limit=10, max_workers=3)]
+        self.assertEqual(ids, [str(i) for i in range(47)])
+        # One total request plus five pages, no trailing empty page
+        self.assertEqual(mock_get.call_count, 6)
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_parallel_reads_total_with_limit_zero(self, mock_get):
+        mock_get.side_effect = paged_search_responses(total=3, limit=10)
+        list(self.api.search_parallel(tag="x", limit=10))
+        first_url = mock_get.call_args_list[0][0][0]
+        self.assertIn("limit=0", first_url)
+        self.assertIn("tag=x", first_url)
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_parallel_unordered_yields_every_row(self, mock_get):
+        mock_get.side_effect = paged_search_responses(total=47, limit=10)
+        ids = [row["id"] for row in self.api.search_parallel(limit=10, ordered=False)]
+        self.assertEqual(sorted(ids, key=int), [str(i) for i in range(47)])
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_parallel_removes_duplicates_by_id(self, mock_get):
+        def side_effect(url, **kwargs):
+            start = int(parse_qs(urlparse(url).query)["offset"][0])
+            response = Mock()
+            response.status_code = 200
+            # Each page overlaps the previous one by a row
+            rows = [{"id": str(i)} for i in range(max(start - 1, 0), min(start + 5, 15))]
+            response.content = json_body({"rows": rows, "total": 15})
+            return response
+
+        mock_get.side_effect = side_effect
+        ids = [row["id"] for row in self.api.search_parallel(limit=5)]
+        self.assertEqual(ids, [str(i) for i in range(15)])
+
+    def test_parallel_rejects_search_after(self):
+        with self.assertRaises(ValueError):
+            list(self.api.search_parallel(search_after="2024-01-01"))
+
+    def test_parallel_validates_on_call(self):
+        with self.assertRaises(ValueError):
+            self.api.search_parallel(max_workers=0)
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_parallel_warns_past_max_offset(self, mock_get):
+        mock_get.side_effect = paged_search_responses(total=MAX_SEARCH_OFFSET + 500, limit=200)
+        with self.assertWarns(RuntimeWarning):
+            rows = list(self.api.search_parallel(limit=200, max_workers=8))
+        self.assertEqual(len(rows), MAX_SEARCH_OFFSET + 200)
+
+
 class TestAPIAnnotationOperations(unittest.TestCase):
     """Tests for annotation CRUD operations."""
 
     def setUp(self):
         self.api = API(username="testuser", api_key="testkey")
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_get_annotation(self, mock_get):
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "abc123", "text": "Test"}
+        mock_response.content = json_body({"id": "abc123", "text": "Test"})
         mock_get.return_value = mock_response
 
         result = self.api.get_annotation("abc123")
         self.assertEqual(result["id"], "abc123")
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_get_annotation_authenticated_by_default(self, mock_get):
         """Test that get_annotation sends auth headers by default."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "abc123"}
+        mock_response.content = json_body({"id": "abc123"})
         mock_get.return_value = mock_response
 
         self.api.get_annotation("abc123")
@@ -379,12 +577,12 @@ class TestAPIAnnotationOperations(unittest.TestCase):
         self.assertIn("Authorization", call_kwargs["headers"])
         self.assertEqual(call_kwargs["headers"]["Authorization"], "Bearer testkey")
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_get_annotation_unauthenticated(self, mock_get):
         """Test get_annotation with authenticated=False."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "abc123"}
+        mock_response.content = json_body({"id": "abc123"})
         mock_get.return_value = mock_response
 
         self.api.get_annotation("abc123", authenticated=False)
@@ -392,27 +590,27 @@ class TestAPIAnnotationOperations(unittest.TestCase):
         call_kwargs = mock_get.call_args.kwargs
         self.assertNotIn("Authorization", call_kwargs["headers"])
 
-    @patch("hypothesisapi.requests.patch")
+    @patch("hypothesisapi.requests.Session.patch")
     def test_update_annotation(self, mock_patch):
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "abc123", "text": "Updated"}
+        mock_response.content = json_body({"id": "abc123", "text": "Updated"})
         mock_patch.return_value = mock_response
 
         result = self.api.update("abc123", {"text": "Updated"})
         self.assertEqual(result["text"], "Updated")
 
-    @patch("hypothesisapi.requests.delete")
+    @patch("hypothesisapi.requests.Session.delete")
     def test_delete_annotation(self, mock_delete):
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "abc123", "deleted": True}
+        mock_response.content = json_body({"id": "abc123", "deleted": True})
         mock_delete.return_value = mock_response
 
         result = self.api.delete("abc123")
         self.assertTrue(result["deleted"])
 
-    @patch("hypothesisapi.requests.put")
+    @patch("hypothesisapi.requests.Session.put")
     def test_flag_annotation(self, mock_put):
         mock_response = Mock()
         mock_response.status_code = 204
@@ -421,7 +619,7 @@ class TestAPIAnnotationOperations(unittest.TestCase):
         result = self.api.flag("abc123")
         self.assertEqual(result, {})
 
-    @patch("hypothesisapi.requests.put")
+    @patch("hypothesisapi.requests.Session.put")
     def test_hide_annotation(self, mock_put):
         mock_response = Mock()
         mock_response.status_code = 204
@@ -437,41 +635,41 @@ class TestAPIGroups(unittest.TestCase):
     def setUp(self):
         self.api = API(username="testuser", api_key="testkey")
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_get_groups(self, mock_get):
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = [{"id": "group1"}, {"id": "group2"}]
+        mock_response.content = json_body([{"id": "group1"}, {"id": "group2"}])
         mock_get.return_value = mock_response
 
         result = self.api.get_groups()
         self.assertEqual(len(result), 2)
 
-    @patch("hypothesisapi.requests.post")
+    @patch("hypothesisapi.requests.Session.post")
     def test_create_group(self, mock_post):
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "newgroup", "name": "Test Group"}
+        mock_response.content = json_body({"id": "newgroup", "name": "Test Group"})
         mock_post.return_value = mock_response
 
         result = self.api.create_group("Test Group", description="A test group")
         self.assertEqual(result["name"], "Test Group")
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_get_group(self, mock_get):
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "group1", "name": "Test Group"}
+        mock_response.content = json_body({"id": "group1", "name": "Test Group"})
         mock_get.return_value = mock_response
 
         result = self.api.get_group("group1")
         self.assertEqual(result["id"], "group1")
 
-    @patch("hypothesisapi.requests.patch")
+    @patch("hypothesisapi.requests.Session.patch")
     def test_update_group(self, mock_patch):
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "group1", "name": "Updated Name"}
+        mock_response.content = json_body({"id": "group1", "name": "Updated Name"})
         mock_patch.return_value = mock_response
 
         result = self.api.update_group("group1", name="Updated Name")
@@ -484,17 +682,17 @@ class TestAPIGroups(unittest.TestCase):
         self.assertIn("name", str(ctx.exception))
         self.assertIn("description", str(ctx.exception))
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_get_group_members(self, mock_get):
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = [{"userid": "user1"}, {"userid": "user2"}]
+        mock_response.content = json_body([{"userid": "user1"}, {"userid": "user2"}])
         mock_get.return_value = mock_response
 
         result = self.api.get_group_members("group1")
         self.assertEqual(len(result), 2)
 
-    @patch("hypothesisapi.requests.delete")
+    @patch("hypothesisapi.requests.Session.delete")
     def test_leave_group(self, mock_delete):
         mock_response = Mock()
         mock_response.status_code = 204
@@ -510,21 +708,21 @@ class TestAPIProfile(unittest.TestCase):
     def setUp(self):
         self.api = API(username="testuser", api_key="testkey")
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_get_profile(self, mock_get):
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"userid": "acct:testuser@hypothes.is"}
+        mock_response.content = json_body({"userid": "acct:testuser@hypothes.is"})
         mock_get.return_value = mock_response
 
         result = self.api.get_profile()
         self.assertIn("userid", result)
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_get_profile_groups(self, mock_get):
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = [{"id": "group1"}]
+        mock_response.content = json_body([{"id": "group1"}])
         mock_get.return_value = mock_response
 
         result = self.api.get_profile_groups()
@@ -537,14 +735,14 @@ class TestAPIUsers(unittest.TestCase):
     def setUp(self):
         self.api = API(username="testuser", api_key="testkey")
 
-    @patch("hypothesisapi.requests.post")
+    @patch("hypothesisapi.requests.Session.post")
     def test_create_user(self, mock_post):
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = json_body({
             "userid": "acct:newuser@myauthority.com",
             "username": "newuser",
-        }
+        })
         mock_post.return_value = mock_response
 
         result = self.api.create_user(
@@ -554,24 +752,24 @@ class TestAPIUsers(unittest.TestCase):
         )
         self.assertEqual(result["username"], "newuser")
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_get_user(self, mock_get):
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"userid": "acct:testuser@hypothes.is"}
+        mock_response.content = json_body({"userid": "acct:testuser@hypothes.is"})
         mock_get.return_value = mock_response
 
         result = self.api.get_user("acct:testuser@hypothes.is")
         self.assertIn("userid", result)
 
-    @patch("hypothesisapi.requests.patch")
+    @patch("hypothesisapi.requests.Session.patch")
     def test_update_user(self, mock_patch):
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = json_body({
             "userid": "acct:testuser@hypothes.is",
             "display_name": "New Name",
-        }
+        })
         mock_patch.return_value = mock_response
 
         result = self.api.update_user(
@@ -618,11 +816,11 @@ class TestDeprecatedMethods(unittest.TestCase):
     def setUp(self):
         self.api = API(username="testuser", api_key="testkey")
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_search_id_deprecation_warning(self, mock_get):
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "abc123"}
+        mock_response.content = json_body({"id": "abc123"})
         mock_get.return_value = mock_response
 
         import warnings
@@ -640,12 +838,12 @@ class TestNewAnnotationMethods(unittest.TestCase):
     def setUp(self):
         self.api = API(username="testuser", api_key="testkey")
 
-    @patch("hypothesisapi.requests.post")
+    @patch("hypothesisapi.requests.Session.post")
     def test_reindex(self, mock_post):
         """Test reindex calls correct endpoint."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {}
+        mock_response.content = json_body({})
         mock_post.return_value = mock_response
 
         result = self.api.reindex("abc123")
@@ -654,7 +852,7 @@ class TestNewAnnotationMethods(unittest.TestCase):
         call_url = mock_post.call_args[0][0]
         self.assertIn("/annotations/abc123/reindex", call_url)
 
-    @patch("hypothesisapi.requests.post")
+    @patch("hypothesisapi.requests.Session.post")
     def test_reindex_forbidden(self, mock_post):
         """Test reindex raises ForbiddenError for non-admins."""
         mock_response = Mock()
@@ -665,12 +863,12 @@ class TestNewAnnotationMethods(unittest.TestCase):
         with self.assertRaises(ForbiddenError):
             self.api.reindex("abc123")
 
-    @patch("hypothesisapi.requests.patch")
+    @patch("hypothesisapi.requests.Session.patch")
     def test_moderation_approve(self, mock_patch):
         """Test moderation with APPROVED status."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "abc123", "moderation_status": "APPROVED"}
+        mock_response.content = json_body({"id": "abc123", "moderation_status": "APPROVED"})
         mock_patch.return_value = mock_response
 
         result = self.api.moderation("abc123", moderation_status="APPROVED")
@@ -680,12 +878,12 @@ class TestNewAnnotationMethods(unittest.TestCase):
         self.assertEqual(call_kwargs["json"]["moderation_status"], "APPROVED")
         self.assertEqual(call_kwargs["json"]["annotation_updated"], True)
 
-    @patch("hypothesisapi.requests.patch")
+    @patch("hypothesisapi.requests.Session.patch")
     def test_moderation_hide(self, mock_patch):
         """Test moderation with HIDDEN status."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "abc123", "moderation_status": "HIDDEN"}
+        mock_response.content = json_body({"id": "abc123", "moderation_status": "HIDDEN"})
         mock_patch.return_value = mock_response
 
         result = self.api.moderation("abc123", moderation_status="HIDDEN", annotation_updated=False)
@@ -701,12 +899,12 @@ class TestBulkMethods(unittest.TestCase):
     def setUp(self):
         self.api = API(username="testuser", api_key="testkey")
 
-    @patch("hypothesisapi.requests.post")
+    @patch("hypothesisapi.requests.Session.post")
     def test_bulk(self, mock_post):
         """Test bulk operations endpoint."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"results": []}
+        mock_response.content = json_body({"results": []})
         mock_post.return_value = mock_response
 
         operations = [{"action": "create", "data": {"uri": "https://example.com"}}]
@@ -716,12 +914,12 @@ class TestBulkMethods(unittest.TestCase):
         call_kwargs = mock_post.call_args.kwargs
         self.assertEqual(call_kwargs["json"], operations)
 
-    @patch("hypothesisapi.requests.post")
+    @patch("hypothesisapi.requests.Session.post")
     def test_bulk_annotations(self, mock_post):
         """Test bulk annotation retrieval."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"annotations": [{"id": "1"}, {"id": "2"}]}
+        mock_response.content = json_body({"annotations": [{"id": "1"}, {"id": "2"}]})
         mock_post.return_value = mock_response
 
         result = self.api.bulk_annotations(group="testgroup")
@@ -730,24 +928,24 @@ class TestBulkMethods(unittest.TestCase):
         call_url = mock_post.call_args[0][0]
         self.assertIn("/bulk/annotation", call_url)
 
-    @patch("hypothesisapi.requests.post")
+    @patch("hypothesisapi.requests.Session.post")
     def test_bulk_annotations_with_ids(self, mock_post):
         """Test bulk annotation retrieval with specific IDs."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"annotations": []}
+        mock_response.content = json_body({"annotations": []})
         mock_post.return_value = mock_response
 
         result = self.api.bulk_annotations(annotation_ids=["id1", "id2"])
         call_kwargs = mock_post.call_args.kwargs
         self.assertEqual(call_kwargs["json"]["ids"], ["id1", "id2"])
 
-    @patch("hypothesisapi.requests.post")
+    @patch("hypothesisapi.requests.Session.post")
     def test_bulk_groups(self, mock_post):
         """Test bulk group retrieval."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"groups": []}
+        mock_response.content = json_body({"groups": []})
         mock_post.return_value = mock_response
 
         result = self.api.bulk_groups(group_ids=["g1", "g2"])
@@ -756,12 +954,12 @@ class TestBulkMethods(unittest.TestCase):
         call_kwargs = mock_post.call_args.kwargs
         self.assertEqual(call_kwargs["json"]["ids"], ["g1", "g2"])
 
-    @patch("hypothesisapi.requests.post")
+    @patch("hypothesisapi.requests.Session.post")
     def test_bulk_lms_annotations(self, mock_post):
         """Test LMS bulk annotation retrieval."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"annotations": []}
+        mock_response.content = json_body({"annotations": []})
         mock_post.return_value = mock_response
 
         result = self.api.bulk_lms_annotations(
@@ -782,16 +980,16 @@ class TestGroupMembershipMethods(unittest.TestCase):
     def setUp(self):
         self.api = API(username="testuser", api_key="testkey")
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_get_group_annotations(self, mock_get):
         """Test get_group_annotations endpoint."""
         mock_response = Mock()
         mock_response.status_code = 200
         # Real API returns {"meta": {"page": {"total": N}}, "data": [...]}
-        mock_response.json.return_value = {
+        mock_response.content = json_body({
             "meta": {"page": {"total": 1}},
             "data": [{"id": "1"}]
-        }
+        })
         mock_get.return_value = mock_response
 
         result = self.api.get_group_annotations("testgroup")
@@ -800,12 +998,12 @@ class TestGroupMembershipMethods(unittest.TestCase):
         call_url = mock_get.call_args[0][0]
         self.assertIn("/groups/testgroup/annotations", call_url)
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_get_group_annotations_url_encoding(self, mock_get):
         """Test that group_id is URL-encoded."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"meta": {"page": {"total": 0}}, "data": []}
+        mock_response.content = json_body({"meta": {"page": {"total": 0}}, "data": []})
         mock_get.return_value = mock_response
 
         # Group ID with special characters (unlikely but should handle)
@@ -814,23 +1012,25 @@ class TestGroupMembershipMethods(unittest.TestCase):
         # Slashes should be encoded as %2F
         self.assertIn("group%2Fwith%2Fslashes", call_url)
 
-    @patch("hypothesisapi.requests.post")
+    @patch("hypothesisapi.requests.Session.post")
     def test_add_group_member(self, mock_post):
         """Test adding a member to a group."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"userid": "acct:user@hypothes.is"}
+        mock_response.content = json_body({"userid": "acct:user@hypothes.is"})
         mock_post.return_value = mock_response
 
         result = self.api.add_group_member("testgroup", "acct:user@hypothes.is")
         self.assertIn("userid", result)
 
-    @patch("hypothesisapi.requests.post")
+    @patch("hypothesisapi.requests.Session.post")
     def test_add_group_member_with_roles(self, mock_post):
         """Test adding a member with specific roles."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"userid": "acct:user@hypothes.is", "roles": ["moderator"]}
+        mock_response.content = json_body(
+            {"userid": "acct:user@hypothes.is", "roles": ["moderator"]}
+        )
         mock_post.return_value = mock_response
 
         result = self.api.add_group_member(
@@ -841,12 +1041,12 @@ class TestGroupMembershipMethods(unittest.TestCase):
         call_kwargs = mock_post.call_args.kwargs
         self.assertEqual(call_kwargs["json"]["roles"], ["moderator"])
 
-    @patch("hypothesisapi.requests.post")
+    @patch("hypothesisapi.requests.Session.post")
     def test_add_group_member_url_encoding(self, mock_post):
         """Test that userid is URL-encoded (contains : and @)."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {}
+        mock_response.content = json_body({})
         mock_post.return_value = mock_response
 
         self.api.add_group_member("testgroup", "acct:user@hypothes.is")
@@ -854,23 +1054,25 @@ class TestGroupMembershipMethods(unittest.TestCase):
         # The : and @ should be encoded
         self.assertIn("acct%3Auser%40hypothes.is", call_url)
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_get_group_member(self, mock_get):
         """Test getting a specific member's info."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"userid": "acct:user@hypothes.is", "roles": ["member"]}
+        mock_response.content = json_body({"userid": "acct:user@hypothes.is", "roles": ["member"]})
         mock_get.return_value = mock_response
 
         result = self.api.get_group_member("testgroup", "acct:user@hypothes.is")
         self.assertEqual(result["roles"], ["member"])
 
-    @patch("hypothesisapi.requests.patch")
+    @patch("hypothesisapi.requests.Session.patch")
     def test_update_group_member(self, mock_patch):
         """Test updating a member's roles."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"userid": "acct:user@hypothes.is", "roles": ["moderator"]}
+        mock_response.content = json_body(
+            {"userid": "acct:user@hypothes.is", "roles": ["moderator"]}
+        )
         mock_patch.return_value = mock_response
 
         result = self.api.update_group_member(
@@ -882,7 +1084,7 @@ class TestGroupMembershipMethods(unittest.TestCase):
         call_kwargs = mock_patch.call_args.kwargs
         self.assertEqual(call_kwargs["json"]["roles"], ["moderator"])
 
-    @patch("hypothesisapi.requests.delete")
+    @patch("hypothesisapi.requests.Session.delete")
     def test_remove_group_member(self, mock_delete):
         """Test removing a member from a group."""
         mock_response = Mock()
@@ -899,12 +1101,12 @@ class TestProfileUpdateMethod(unittest.TestCase):
     def setUp(self):
         self.api = API(username="testuser", api_key="testkey")
 
-    @patch("hypothesisapi.requests.patch")
+    @patch("hypothesisapi.requests.Session.patch")
     def test_update_profile(self, mock_patch):
         """Test updating profile preferences."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"userid": "acct:testuser@hypothes.is"}
+        mock_response.content = json_body({"userid": "acct:testuser@hypothes.is"})
         mock_patch.return_value = mock_response
 
         result = self.api.update_profile({"notifications": {"reply": True}})
@@ -922,12 +1124,12 @@ class TestAnalyticsAndUtilityMethods(unittest.TestCase):
     def setUp(self):
         self.api = API(username="testuser", api_key="testkey")
 
-    @patch("hypothesisapi.requests.post")
+    @patch("hypothesisapi.requests.Session.post")
     def test_create_analytics_event(self, mock_post):
         """Test creating an analytics event."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {}
+        mock_response.content = json_body({})
         mock_post.return_value = mock_response
 
         result = self.api.create_analytics_event(
@@ -942,27 +1144,27 @@ class TestAnalyticsAndUtilityMethods(unittest.TestCase):
         self.assertEqual(call_kwargs["json"]["event"], "client.realtime.apply_updates")
         self.assertEqual(call_kwargs["json"]["properties"]["url"], "https://example.com")
 
-    @patch("hypothesisapi.requests.post")
+    @patch("hypothesisapi.requests.Session.post")
     def test_create_analytics_event_minimal(self, mock_post):
         """Test creating an analytics event without properties."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {}
+        mock_response.content = json_body({})
         mock_post.return_value = mock_response
 
         result = self.api.create_analytics_event("client.realtime.apply_updates")
         call_kwargs = mock_post.call_args.kwargs
         self.assertEqual(call_kwargs["json"], {"event": "client.realtime.apply_updates"})
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_get_links(self, mock_get):
         """Test getting URL templates."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = json_body({
             "account.settings": "https://hypothes.is/account/settings",
             "search.tag": "https://hypothes.is/search?q=tag:{tag}"
-        }
+        })
         mock_get.return_value = mock_response
 
         result = self.api.get_links()
@@ -970,12 +1172,12 @@ class TestAnalyticsAndUtilityMethods(unittest.TestCase):
         call_url = mock_get.call_args[0][0]
         self.assertIn("/links", call_url)
 
-    @patch("hypothesisapi.requests.get")
+    @patch("hypothesisapi.requests.Session.get")
     def test_get_links_unauthenticated(self, mock_get):
         """Test that get_links doesn't require authentication."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {}
+        mock_response.content = json_body({})
         mock_get.return_value = mock_response
 
         self.api.get_links()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_interning
+----------------------------------
+
+Tests for sharing repeated values between annotations.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from hypothesisapi import API, Annotation, Interner, Mirror, export_jsonl
+
+from .helpers import make_response
+
+
+def decoded_rows(count):
+    """Rows decoded from JSON, so equal values start out as separate objects."""
+    rows = [{
+        "id": f"id{n}",
+        "updated": f"2024-01-01T00:00:{n:02d}+00:00",
+        "user": "acct:alice@hypothes.is",
+        "group": "__world__",
+        "uri": "https://example.com/page",
+        "tags": ["climate", "todo"],
+        "target": [{"source": "https://example.com/page"}],
+        "document": {"title": ["Example page"]},
+        "permissions": {"read": ["group:__world__"], "delete": ["acct:alice@hypothes.is"]},
+    } for n in range(count)]
+    return json.loads(json.dumps(rows))
+
+
+class TestInterner(unittest.TestCase):
+    """Tests for Interner.annotation()."""
+
+    def test_repeated_values_are_shared(self):
+        interner = Interner()
+        first, second = (interner.annotation(row) for row in decoded_rows(2))
+        for key in ("user", "group", "uri"):
+            self.assertIs(first[key], second[key])
+        self.assertIs(first["tags"][0], second["tags"][0])
+        self.assertIs(first["target"][0]["source"], first["uri"])
+        self.assertIs(first["permissions"], second["permissions"])
+        self.assertIs(first["document"]["title"], second["document"]["title"])
+        self.assertIs(first["permissions"]["delete"][0], first["user"])
+        self.assertEqual(first, decoded_rows(1)[0])
+
+    def test_different_values_stay_separate(self):
+        interner = Interner()
+        first, second = decoded_rows(2)
+        second["permissions"]["read"] = ["acct:alice@hypothes.is"]
+        interner.annotation(first)
+        interner.annotation(second)
+        self.assertIsNot(first["permissions"], second["permissions"])
+        self.assertEqual(second["permissions"]["read"], ["acct:alice@hypothes.is"])
+
+    def test_unusual_values_left_alone(self):
+        row = {"id": "x", "user": None, "tags": None, "permissions": {"read": [{"odd": 1}]},
+               "document": {"title": "not a list"}, "target": ["not a dict"]}
+        self.assertEqual(Interner().annotation(json.loads(json.dumps(row))), row)
+
+    def test_clear(self):
+        interner = Interner()
+        interner.annotation(decoded_rows(1)[0])
+        self.assertEqual((interner.strings, interner.structures), (9, 2))
+        interner.clear()
+        self.assertEqual(len(interner), 0)
+
+
+class TestSearchInterning(unittest.TestCase):
+    """intern= on API.search() and Mirror.search()."""
+
+    def setUp(self):
+        self.api = API(username="testuser", api_key="testkey")
+
+    def pages(self, rows):
+        return [
+            make_response(200, {"rows": rows, "total": len(rows)}),
+            make_response(200, {"rows": []}),
+        ]
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_search(self, mock_get):
+        mock_get.side_effect = self.pages(decoded_rows(3))
+        rows = list(self.api.search(intern=True))
+        self.assertIs(rows[0]["user"], rows[2]["user"])
+        self.assertIs(rows[0]["permissions"], rows[1]["permissions"])
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_interner_shared_across_searches(self, mock_get):
+        interner = Interner()
+        mock_get.side_effect = self.pages(decoded_rows(1)) + self.pages(decoded_rows(1))
+        [first] = self.api.search(intern=interner)
+        [second] = self.api.search(intern=interner)
+        self.assertIs(first["uri"], second["uri"])
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_models(self, mock_get):
+        mock_get.side_effect = self.pages(decoded_rows(2))
+        first, second = self.api.search(intern=True, as_model=True)
+        self.assertIsInstance(first, Annotation)
+        self.assertIs(first.user, second.user)
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_off_by_default(self, mock_get):
+        mock_get.side_effect = self.pages(decoded_rows(2))
+        first, second = self.api.search()
+        self.assertIsNot(first["user"], second["user"])
+
+    def test_mirror(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        with Mirror(os.path.join(directory.name, "mirror.sqlite")) as mirror:
+            pages = self.pages(decoded_rows(3))
+            with patch("hypothesisapi.requests.Session.get", side_effect=pages):
+                mirror.sync(self.api)
+            rows = list(mirror.search(intern=True))
+        self.assertIs(rows[0]["group"], rows[2]["group"])
+        self.assertIs(rows[0]["document"]["title"], rows[1]["document"]["title"])
+
+    def test_export_rejects_as_model(self):
+        with self.assertRaises(ValueError):
+            export_jsonl(self.api, os.devnull, as_model=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_mirror
+----------------------------------
+
+Tests for the incremental SQLite mirror.
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from hypothesisapi import API, HypothesisAPIError, Mirror
+
+from .helpers import make_response
+
+
+def annotation(n, updated, **fields):
+    return {
+        "id": f"id{n}",
+        "created": "2024-01-01T00:00:00+00:00",
+        "updated": updated,
+        "user": "acct:alice@hypothes.is",
+        "uri": "https://example.com",
+        "group": "__world__",
+        "text": f"note {n}",
+        "tags": ["a"],
+        **fields,
+    }
+
+
+class FakeSearch:
+    """Session.get side effect paging ``rows`` by search_after on ``updated``."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def __call__(self, url, **kwargs):
+        params = parse_qs(urlparse(url).query)
+        self.queries.append(params)
+        after = params.get("search_after", [""])[0]
+        limit = int(params["limit"][0])
+        remaining = sorted(
+            (r for r in self.rows if r["updated"] > after), key=lambda r: r["updated"]
+        )
+        return make_response(200, {"rows": remaining[:limit], "total": len(remaining)})
+
+
+class TestMirror(unittest.TestCase):
+    """Tests for Mirror.sync() and prune()."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "mirror", "annotations.sqlite")
+        self.mirror = Mirror(self.path)
+        self.addCleanup(self.mirror.close)
+        self.api = API(username="testuser", api_key="testkey")
+        self.search = FakeSearch([annotation(n, f"2024-02-{n + 1:02d}") for n in range(5)])
+        patcher = patch("hypothesisapi.requests.Session.get", side_effect=self.search)
+        self.mock_get = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_first_sync_loads_everything(self):
+        report = self.mirror.sync(self.api, group="__world__")
+        self.assertTrue(report.full)
+        self.assertEqual(report.upserted, 5)
+        self.assertEqual(report.high_water, "2024-02-05")
+        self.assertEqual(len(self.mirror), 5)
+        self.assertEqual(self.mirror.get("id3")["text"], "note 3")
+        params = self.search.queries[0]
+        self.assertEqual(
+            (params["sort"], params["order"], params["group"]),
+            (["updated"], ["asc"], ["__world__"]),
+        )
+
+    def test_later_syncs_fetch_only_updated_rows(self):
+        self.mirror.sync(self.api, group="__world__")
+        self.search.rows[1] = annotation(1, "2024-03-01", text="edited")
+        self.search.rows.append(annotation(9, "2024-03-02"))
+        self.search.queries.clear()
+
+        report = self.mirror.sync(self.api, group="__world__")
+        self.assertFalse(report.full)
+        self.assertEqual(report.upserted, 2)
+        self.assertEqual(self.search.queries[0]["search_after"], ["2024-02-05"])
+        self.assertEqual(self.mirror.get("id1")["text"], "edited")
+        self.assertEqual(len(self.mirror), 6)
+        self.assertEqual(self.mirror.high_water(group="__world__"), "2024-03-02")
+
+    def test_nothing_new(self):
+        self.mirror.sync(self.api)
+        report = self.mirror.sync(self.api)
+        self.assertEqual((report.upserted, report.high_water), (0, "2024-02-05"))
+
+    def test_queries_have_separate_marks(self):
+        self.mirror.sync(self.api, group="__world__")
+        self.assertIsNone(self.mirror.high_water(group="other"))
+        self.assertTrue(self.mirror.sync(self.api, group="other").full)
+
+    def test_state_survives_reopening(self):
+        self.mirror.sync(self.api, tag="a")
+        with Mirror(self.path) as reopened:
+            self.assertEqual(reopened.high_water(tag="a"), "2024-02-05")
+            self.assertEqual(len(reopened), 5)
+
+    @patch("hypothesisapi.transport.time.sleep")
+    def test_interrupted_sync_keeps_committed_pages(self, mock_sleep):
+        self.search.rows = [annotation(n, f"2024-02-01T00:00:{n:02d}") for n in range(250)]
+        self.mock_get.side_effect = self.failing_after_first_page
+        with self.assertRaises(HypothesisAPIError):
+            self.mirror.sync(self.api)
+        self.assertEqual(len(self.mirror), 200)
+        self.mock_get.side_effect = self.search
+        report = self.mirror.sync(self.api)
+        self.assertEqual(report.upserted, 50)
+        self.assertEqual(len(self.mirror), 250)
+
+    def failing_after_first_page(self, url, **kwargs):
+        if "search_after" in url:
+            return make_response(500)
+        return self.search(url, **kwargs)
+
+    def test_reserved_parameters_raise(self):
+        with self.assertRaises(ValueError):
+            self.mirror.sync(self.api, sort="created")
+
+    @patch("hypothesisapi.requests.Session.post", return_value=make_response(404))
+    def test_prune_records_deletions(self, mock_post):
+        self.mirror.sync(self.api)
+        self.mock_get.side_effect = lambda url, **kwargs: make_response(
+            404 if url.endswith(("/id1", "/id4")) else 200, {"id": url.rsplit("/", 1)[-1]}
+        )
+        deleted = self.mirror.prune(self.api, user="alice")
+        self.assertEqual(sorted(deleted), ["id1", "id4"])
+        self.assertIsNone(self.mirror.get("id1"))
+        self.assertEqual(len(self.mirror), 3)
+        self.assertEqual(sorted(self.mirror.deleted_ids()), ["id1", "id4"])
+
+
+def highlight(exact):
+    selector = {"type": "TextQuoteSelector", "exact": exact}
+    return [{"source": "https://example.com", "selector": [selector]}]
+
+
+class TestMirrorSearch(unittest.TestCase):
+    """Tests for querying the mirror locally."""
+
+    rows = [
+        annotation(
+            0,
+            "2024-02-01",
+            text="Sea level rise",
+            tags=["Climate"],
+            target=highlight("oceans warm"),
+        ),
+        annotation(1, "2024-02-02", text="unrelated note", tags=["climate", "todo"]),
+        annotation(2, "2024-02-03", text="Rising seas", user="acct:bob@hypothes.is", group="g1",
+                   created="2024-01-15T00:00:00+00:00"),
+        annotation(3, "2024-02-04", text="50% done_ish", uri="https://example.com/page_1",
+                   references=["id0"]),
+    ]
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.mirror = Mirror(os.path.join(directory.name, "annotations.sqlite"))
+        self.addCleanup(self.mirror.close)
+        api = API(username="testuser", api_key="testkey")
+        with patch("hypothesisapi.requests.Session.get", side_effect=FakeSearch(list(self.rows))):
+            self.mirror.sync(api)
+
+    def ids(self, **filters):
+        return [a["id"] for a in self.mirror.search(**filters)]
+
+    def test_indexed_filters(self):
+        self.assertEqual(self.ids(user="bob"), ["id2"])
+        self.assertEqual(
+            self.ids(user="acct:alice@hypothes.is", group="__world__"), ["id0", "id1", "id3"]
+        )
+        self.assertEqual(self.ids(uri="https://example.com/page_1"), ["id3"])
+        self.assertEqual(self.ids(references="id0"), ["id3"])
+
+    def test_tags_are_case_insensitive_and_all_required(self):
+        self.assertEqual(self.ids(tag="climate"), ["id0", "id1"])
+        self.assertEqual(self.ids(tags=["CLIMATE", "todo"]), ["id1"])
+
+    def test_wildcard_uri(self):
+        self.assertEqual(self.ids(wildcard_uri="https://example.com/*"), ["id3"])
+        self.assertEqual(self.ids(wildcard_uri="https://example.com/page__"), ["id3"])
+
+    def test_date_ranges(self):
+        self.assertEqual(
+            self.ids(updated_after="2024-02-01T12:00", updated_before="2024-02-04"), ["id1", "id2"]
+        )
+        self.assertEqual(self.ids(created_after=datetime(2024, 1, 10)), ["id2"])
+        self.assertEqual(
+            self.ids(created_before=datetime(2024, 1, 10, tzinfo=timezone.utc)),
+            ["id0", "id1", "id3"],
+        )
+
+    def test_full_text(self):
+        self.assertEqual(self.ids(text="sea level"), ["id0"])
+        self.assertEqual(self.ids(quote="oceans"), ["id0"])
+        self.assertEqual(self.ids(any_field="warm"), ["id0"])
+        self.assertEqual(self.ids(text='"quoted" OR'), [])
+
+    def test_sort_limit_offset(self):
+        self.assertEqual(self.ids(sort="updated", order="desc", limit=2), ["id3", "id2"])
+        self.assertEqual(self.ids(sort="created", offset=3), ["id2"])
+        with self.assertRaises(ValueError):
+            self.ids(sort="text")
+
+    def test_count(self):
+        self.assertEqual(self.mirror.count(tag="climate"), 2)
+        self.assertEqual(self.mirror.count(), 4)
+
+    def test_index_kept_in_step_with_updates(self):
+        api = API(username="testuser", api_key="testkey")
+        rows = [annotation(1, "2024-03-01", text="now about sea", tags=["done"])]
+        with patch("hypothesisapi.requests.Session.get", side_effect=FakeSearch(rows)):
+            self.mirror.sync(api)
+        self.assertEqual(self.ids(text="sea"), ["id0", "id1"])
+        self.assertEqual(self.ids(tag="todo"), [])
+        self.assertEqual(self.ids(tag="done"), ["id1"])
+
+    def test_substring_fallback_without_fts(self):
+        self.mirror.full_text = False
+        self.assertEqual(self.ids(text="sea"), ["id0", "id2"])
+        self.assertEqual(self.ids(text="50%"), ["id3"])
+        self.assertEqual(self.ids(any_field="warm"), ["id0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
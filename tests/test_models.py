@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_models
+----------------------------------
+
+Tests for the compact Annotation record.
+"""
+
+import asyncio
+import copy
+import json
+import pickle
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from hypothesisapi import API, Annotation, AnnotationCache, AsyncAPI, StdlibCodec
+
+from .helpers import make_response
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+ROW = {
+    "id": "abc",
+    "created": "2024-05-01T12:34:56.789012+00:00",
+    "updated": "2024-05-02T08:00:00+00:00",
+    "user": "acct:alice@hypothes.is",
+    "uri": "https://example.com",
+    "group": "__world__",
+    "tags": ["a", "b"],
+    "text": "note",
+    "target": [
+        {
+            "source": "https://example.com",
+            "selector": [{"type": "TextQuoteSelector", "exact": "q"}],
+        }
+    ],
+    "document": {"title": ["Example"]},
+    "permissions": {"read": ["group:__world__"]},
+    "links": {"html": "https://hypothes.is/a/abc"},
+    "hidden": False,
+}
+
+
+class CountingCodec(StdlibCodec):
+    """Standard library codec that counts decodes."""
+
+    def __init__(self):
+        self.loaded = 0
+
+    def loads(self, data):
+        self.loaded += 1
+        return super().loads(data)
+
+
+class TestAnnotation(unittest.TestCase):
+    """Tests for Annotation.from_dict() and its fields."""
+
+    def test_hot_fields_are_typed(self):
+        annotation = Annotation.from_dict(ROW)
+        self.assertEqual(
+            annotation.created, datetime(2024, 5, 1, 12, 34, 56, 789012, tzinfo=timezone.utc)
+        )
+        self.assertEqual(annotation.updated.tzinfo, timezone.utc)
+        self.assertEqual(annotation.tags, ("a", "b"))
+        self.assertEqual(
+            (annotation.id, annotation.user, annotation.group), ("abc", ROW["user"], "__world__")
+        )
+
+    def test_nested_fields_decoded_once_on_access(self):
+        codec = CountingCodec()
+        annotation = Annotation.from_dict(ROW, codec)
+        self.assertEqual(codec.loaded, 0)
+        self.assertEqual(annotation.target, ROW["target"])
+        self.assertEqual(annotation.document, {"title": ["Example"]})
+        self.assertEqual(annotation.permissions, ROW["permissions"])
+        self.assertEqual(annotation.extra, {"links": ROW["links"], "hidden": False})
+        self.assertEqual(codec.loaded, 1)
+
+    def test_missing_fields(self):
+        annotation = Annotation.from_dict({"id": "x"})
+        self.assertIsNone(annotation.created)
+        self.assertEqual(
+            (annotation.tags, annotation.text, annotation.target, annotation.document),
+            ((), "", [], {}),
+        )
+
+    def test_to_dict_and_get(self):
+        annotation = Annotation.from_dict(ROW)
+        self.assertEqual(annotation.to_dict(), ROW)
+        self.assertEqual(annotation.get("links"), ROW["links"])
+        self.assertEqual(annotation.get("uri"), ROW["uri"])
+        self.assertEqual(annotation.get("missing", 1), 1)
+
+    def test_slots_copy_and_pickle(self):
+        annotation = Annotation.from_dict(ROW)
+        self.assertFalse(hasattr(annotation, "__dict__"))
+        self.assertEqual(pickle.loads(pickle.dumps(annotation)), annotation)
+        self.assertEqual(copy.deepcopy(annotation), annotation)
+        self.assertIn("abc", repr(annotation))
+
+
+class TestClientsReturnModels(unittest.TestCase):
+    """search() and get_annotation() with as_model=True."""
+
+    def setUp(self):
+        self.api = API(username="testuser", api_key="testkey")
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_search(self, mock_get):
+        mock_get.side_effect = [
+            make_response(200, {"rows": [ROW, dict(ROW, id="def")], "total": 2}),
+            make_response(200, {"rows": []}),
+        ]
+        results = list(self.api.search(as_model=True))
+        self.assertEqual([type(r) for r in results], [Annotation, Annotation])
+        self.assertEqual([r.id for r in results], ["abc", "def"])
+
+    @patch("hypothesisapi.requests.Session.get", return_value=make_response(200, ROW))
+    def test_get_annotation(self, mock_get):
+        annotation = self.api.get_annotation("abc", as_model=True)
+        self.assertEqual(annotation.to_dict(), ROW)
+        self.assertEqual(self.api.get_annotation("abc"), ROW)
+
+    @patch("hypothesisapi.requests.Session.get", return_value=make_response(200, ROW))
+    def test_get_annotation_from_cache(self, mock_get):
+        api = API(username="testuser", api_key="testkey", annotation_cache=AnnotationCache())
+        api.get_annotation("abc")
+        self.assertIsInstance(api.get_annotation("abc", as_model=True), Annotation)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @unittest.skipIf(httpx is None, "httpx not installed")
+    def test_async(self):
+        def handler(request):
+            if request.url.path.endswith("/search"):
+                rows = [ROW] if "offset=0" in str(request.url) else []
+                return httpx.Response(200, content=json.dumps({"rows": rows}).encode())
+            return httpx.Response(200, content=json.dumps(ROW).encode())
+
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            async with AsyncAPI(username="me", api_key="key", client=client) as api:
+                rows = [row async for row in api.search(as_model=True)]
+                return rows, await api.get_annotation("abc", as_model=True)
+
+        rows, annotation = asyncio.run(run())
+        self.assertEqual([r.id for r in rows], ["abc"])
+        self.assertEqual(annotation.document, ROW["document"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_ratelimit
+----------------------------------
+
+Tests for the token-bucket rate limiter.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from hypothesisapi import API, RateLimiter, RetryPolicy
+
+from .stub_server import StubServer, json_handler
+
+
+class FakeClock:
+    """Stands in for the time module: sleep() advances monotonic()."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Tests for token accounting, using a fake clock."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch("hypothesisapi.ratelimit.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_is_free_then_rate_applies(self):
+        limiter = RateLimiter(rate=2, burst=3)
+        waits = [limiter.acquire() for _ in range(5)]
+        self.assertEqual(waits, [0, 0, 0, 0.5, 0.5])
+
+    def test_tokens_refill_while_idle(self):
+        limiter = RateLimiter(rate=8, burst=5)
+        for _ in range(5):
+            limiter.acquire()
+        self.clock.now += 0.25
+        self.assertTrue(limiter.try_acquire(2))
+        self.assertFalse(limiter.try_acquire())
+
+    def test_refill_is_capped_at_burst(self):
+        limiter = RateLimiter(rate=10, burst=2)
+        self.clock.now += 60
+        self.assertTrue(limiter.try_acquire(2))
+        self.assertFalse(limiter.try_acquire())
+
+    def test_waiters_are_queued_in_order(self):
+        limiter = RateLimiter(rate=4, burst=1)
+        delays = [limiter._reserve(1) for _ in range(4)]
+        self.assertEqual(delays, [0, 0.25, 0.5, 0.75])
+
+    def test_pause_blocks_until_it_ends(self):
+        limiter = RateLimiter(rate=100, burst=10)
+        limiter.pause(5)
+        self.assertFalse(limiter.try_acquire())
+        self.assertAlmostEqual(limiter.acquire(), 5.01)
+
+    def test_default_burst_follows_rate(self):
+        self.assertEqual(RateLimiter(rate=7.5).burst, 7)
+        self.assertEqual(RateLimiter(rate=0.2).burst, 1)
+
+    def test_invalid_settings_raise(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=0)
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=1, burst=0)
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=1, burst=2).acquire(3)
+
+
+class TestRateLimiterConcurrency(unittest.TestCase):
+    """Tests for sharing one limiter between threads, tasks and clients."""
+
+    def test_threads_share_the_rate(self):
+        limiter = RateLimiter(rate=100, burst=1)
+        start = time.monotonic()
+        threads = [
+            threading.Thread(target=lambda: [limiter.acquire() for _ in range(5)])
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # 20 tokens with one free: at least 19 intervals of 10ms
+        self.assertGreaterEqual(time.monotonic() - start, 0.18)
+
+    def test_async_acquire_does_not_block_loop(self):
+        limiter = RateLimiter(rate=50, burst=1)
+
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.005)
+
+            task = asyncio.ensure_future(ticker())
+            await asyncio.gather(*(limiter.acquire_async() for _ in range(5)))
+            task.cancel()
+            return ticks
+
+        self.assertGreater(asyncio.run(main()), 5)
+
+    def test_clients_share_limiter(self):
+        limiter = RateLimiter(rate=0.01, burst=2)
+        with StubServer(json_handler({"id": "abc"})) as server:
+            api1 = API(username="a", api_key="k", api_url=server.url, rate_limiter=limiter)
+            api2 = API(username="b", api_key="k", api_url=server.url, rate_limiter=limiter)
+            self.assertIs(api1.transport.rate_limiter, api2.transport.rate_limiter)
+            api1.get_annotation("abc")
+            api2.get_annotation("abc")
+            self.assertFalse(limiter.try_acquire(2))
+            api1.close()
+            api2.close()
+
+    @patch("hypothesisapi.transport.time.sleep")
+    def test_throttled_response_pauses_limiter(self, mock_sleep):
+        responses = [429, 200]
+
+        def handler(method, path, headers, body):
+            return responses.pop(0), {"Retry-After": "30"}, b"{}"
+
+        limiter = RateLimiter(rate=1000, burst=10)
+        with StubServer(handler) as server:
+            with API(username="a", api_key="k", api_url=server.url, rate_limiter=limiter,
+                     retry=RetryPolicy(max_attempts=2)) as api:
+                with patch.object(limiter, "acquire") as mock_acquire:
+                    api.get_annotation("abc")
+        self.assertEqual(mock_acquire.call_count, 2)
+        mock_sleep.assert_called_once_with(30.0)
+        self.assertFalse(limiter.try_acquire())
+
+
+if __name__ == "__main__":
+    unittest.main()
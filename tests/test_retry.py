@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_retry
+----------------------------------
+
+Tests for retrying throttled and failed requests, run against a local stub
+server that injects failures.
+"""
+
+import json
+import socket
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import Mock, patch
+
+import requests
+
+from hypothesisapi import API, HypothesisAPIError, RetryPolicy, Transport
+from hypothesisapi.transport import _parse_retry_after
+
+from .stub_server import StubServer
+
+
+def failing_handler(failures, payload=None):
+    """
+    Return a handler that answers with each (status, headers) in failures,
+    then with 200 and payload for every later request.
+    """
+    failures = list(failures)
+    body = json.dumps(payload if payload is not None else {"id": "abc"}).encode("utf-8")
+
+    def handler(method, path, headers, request_body):
+        if failures:
+            status, extra_headers = failures.pop(0)
+            return status, extra_headers, b'{"status": "failure"}'
+        return 200, {"Content-Type": "application/json"}, body
+
+    return handler
+
+
+def unused_port_url():
+    """URL of a local port with nothing listening on it."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Tests for retry decisions and delays."""
+
+    def test_backoff_grows_exponentially_and_is_capped(self):
+        policy = RetryPolicy(backoff_factor=0.5, max_backoff=3, jitter=False)
+        self.assertEqual([policy.backoff(n) for n in range(1, 5)], [0.5, 1, 2, 3])
+
+    def test_backoff_jitter_stays_within_bounds(self):
+        policy = RetryPolicy(backoff_factor=1, jitter=True)
+        for _ in range(50):
+            self.assertTrue(0 <= policy.backoff(3) <= 4)
+
+    def test_idempotent_methods_are_retryable(self):
+        policy = RetryPolicy()
+        for method in ("GET", "PUT", "PATCH", "DELETE"):
+            self.assertTrue(policy.is_retryable(method))
+        self.assertFalse(policy.is_retryable("POST"))
+        self.assertFalse(policy.is_retryable("POST", {"Accept": "application/json"}))
+        self.assertTrue(policy.is_retryable("POST", {"Idempotency-Key": "k1"}))
+
+    def test_retry_delay_stops_on_success_and_last_attempt(self):
+        policy = RetryPolicy(max_attempts=3, jitter=False)
+        ok = Mock(status_code=200, headers={})
+        unavailable = Mock(status_code=503, headers={})
+        self.assertIsNone(policy.retry_delay(1, ok))
+        self.assertEqual(policy.retry_delay(1, unavailable), 0.5)
+        self.assertIsNone(policy.retry_delay(3, unavailable))
+
+    def test_retry_delay_honors_retry_after(self):
+        policy = RetryPolicy(max_retry_after=60)
+        retry_after = {"Retry-After": "7"}
+        self.assertEqual(policy.retry_delay(1, Mock(status_code=429, headers=retry_after)), 7)
+        too_long = {"Retry-After": "600"}
+        self.assertIsNone(policy.retry_delay(1, Mock(status_code=429, headers=too_long)))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(_parse_retry_after("12"), 12)
+        self.assertIsNone(_parse_retry_after("soon"))
+        self.assertIsNone(_parse_retry_after(None))
+        later = datetime.now(timezone.utc) + timedelta(seconds=30)
+        self.assertAlmostEqual(_parse_retry_after(format_datetime(later, usegmt=True)), 30, delta=2)
+
+    def test_invalid_max_attempts_raises(self):
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+    def test_api_passes_retry_to_transport(self):
+        policy = RetryPolicy(max_attempts=5)
+        api = API(username="testuser", api_key="testkey", retry=policy)
+        self.assertIs(api.transport.retry, policy)
+        api.close()
+
+
+@patch("hypothesisapi.transport.time.sleep")
+class TestTransportRetry(unittest.TestCase):
+    """Tests for retries against injected failures."""
+
+    def make_api(self, server, **kwargs):
+        return API(username="testuser", api_key="testkey", api_url=server.url, **kwargs)
+
+    def test_get_retried_until_success(self, mock_sleep):
+        with StubServer(failing_handler([(503, {}), (502, {})])) as server:
+            with self.make_api(server) as api:
+                self.assertEqual(api.get_annotation("abc")["id"], "abc")
+        self.assertEqual(len(server.requests), 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    def test_gives_up_after_max_attempts(self, mock_sleep):
+        with StubServer(failing_handler([(503, {})] * 5)) as server:
+            with self.make_api(server, retry=RetryPolicy(max_attempts=3)) as api:
+                with self.assertRaises(HypothesisAPIError) as ctx:
+                    api.get_annotation("abc")
+        self.assertEqual(ctx.exception.status_code, 503)
+        self.assertEqual(len(server.requests), 3)
+
+    def test_retry_after_is_honored(self, mock_sleep):
+        with StubServer(failing_handler([(429, {"Retry-After": "4"})])) as server:
+            with self.make_api(server) as api:
+                api.get_annotation("abc")
+        mock_sleep.assert_called_once_with(4.0)
+
+    def test_client_errors_are_not_retried(self, mock_sleep):
+        with StubServer(failing_handler([(404, {})])) as server:
+            with self.make_api(server) as api:
+                with self.assertRaises(HypothesisAPIError):
+                    api.get_annotation("abc")
+        self.assertEqual(len(server.requests), 1)
+        mock_sleep.assert_not_called()
+
+    def test_patch_and_delete_are_retried(self, mock_sleep):
+        with StubServer(failing_handler([(500, {})])) as server:
+            with self.make_api(server) as api:
+                api.update("abc", {"text": "new"})
+                server.handler = failing_handler([(500, {})])
+                api.delete("abc")
+        self.assertEqual([r[0] for r in server.requests], ["PATCH", "PATCH", "DELETE", "DELETE"])
+
+    def test_create_without_idempotency_key_is_not_retried(self, mock_sleep):
+        with StubServer(failing_handler([(503, {})])) as server:
+            with self.make_api(server) as api:
+                with self.assertRaises(HypothesisAPIError):
+                    api.create({"uri": "https://example.com"})
+        self.assertEqual(len(server.requests), 1)
+
+    def test_create_with_idempotency_key_is_retried(self, mock_sleep):
+        with StubServer(failing_handler([(503, {})])) as server:
+            with self.make_api(server) as api:
+                api.create({"uri": "https://example.com"}, idempotency_key="key-1")
+        self.assertEqual(len(server.requests), 2)
+        for _, _, headers, body in server.requests:
+            self.assertEqual(headers["Idempotency-Key"], "key-1")
+            self.assertEqual(json.loads(body)["uri"], "https://example.com")
+
+    def test_connection_errors_are_retried(self, mock_sleep):
+        transport = Transport(retry=RetryPolicy(max_attempts=3))
+        with self.assertRaises(requests.ConnectionError):
+            transport.request("GET", unused_port_url(), timeout=5)
+        self.assertEqual(mock_sleep.call_count, 2)
+        transport.close()
+
+    def test_disabled_retries(self, mock_sleep):
+        with StubServer(failing_handler([(503, {})])) as server:
+            with self.make_api(server, retry=RetryPolicy(max_attempts=1)) as api:
+                with self.assertRaises(HypothesisAPIError):
+                    api.get_annotation("abc")
+        self.assertEqual(len(server.requests), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_singleflight
+----------------------------------
+
+Tests for coalescing concurrent identical calls and GETs.
+"""
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from hypothesisapi import API, NotFoundError, SingleFlight
+
+from .helpers import make_response
+
+
+def wait_for_waiters(flight, count, timeout=5):
+    """Block until ``count`` callers are waiting on the flight's calls."""
+    deadline = time.monotonic() + timeout
+    while flight.coalesced < count:
+        if time.monotonic() > deadline:
+            raise AssertionError("callers never joined the in-flight call")
+        time.sleep(0.001)
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Tests for SingleFlight."""
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            release.wait(5)
+            return "value"
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            futures = [pool.submit(flight.do, "key", slow) for _ in range(5)]
+            wait_for_waiters(flight, 4)
+            release.set()
+            results = [f.result() for f in futures]
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([value for value, _ in results], ["value"] * 5)
+        self.assertTrue(all(shared for _, shared in results))
+        self.assertEqual((flight.calls, flight.coalesced), (1, 4))
+        self.assertEqual(len(flight), 0)
+
+    def test_error_raised_in_every_caller(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def failing():
+            release.wait(5)
+            raise ValueError("boom")
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(flight.do, "key", failing) for _ in range(3)]
+            wait_for_waiters(flight, 2)
+            release.set()
+            for future in futures:
+                with self.assertRaises(ValueError):
+                    future.result()
+
+    def test_finished_calls_are_not_reused(self):
+        flight = SingleFlight()
+        counter = iter(range(10))
+        self.assertEqual(flight.do("key", lambda: next(counter)), (0, False))
+        self.assertEqual(flight.do("key", lambda: next(counter)), (1, False))
+
+    def test_different_keys_run_separately(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do("a", lambda: 1)[0], 1)
+        self.assertEqual(flight.do("b", lambda: 2)[0], 2)
+        self.assertEqual(flight.calls, 2)
+
+
+class TestCoalescedGets(unittest.TestCase):
+    """Tests for GET coalescing in API."""
+
+    def concurrent_gets(self, api, fn, count=4):
+        release = threading.Event()
+
+        def side_effect(url, **kwargs):
+            release.wait(5)
+            return make_response(200, {"id": "abc", "tags": ["x"]})
+
+        with patch("hypothesisapi.requests.Session.get", side_effect=side_effect) as mock_get:
+            with ThreadPoolExecutor(max_workers=count) as pool:
+                futures = [pool.submit(fn) for _ in range(count)]
+                if api.singleflight is not None:
+                    wait_for_waiters(api.singleflight, count - 1)
+                release.set()
+                results = [f.result() for f in futures]
+        return mock_get, results
+
+    def test_identical_gets_share_one_request(self):
+        api = API(username="testuser", api_key="testkey")
+        mock_get, results = self.concurrent_gets(api, lambda: api.get_annotation("abc"))
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertTrue(all(r == {"id": "abc", "tags": ["x"]} for r in results))
+        # Every caller owns its result
+        results[0]["tags"].append("y")
+        self.assertEqual(results[1]["tags"], ["x"])
+
+    def test_auth_modes_are_not_shared(self):
+        api = API(username="testuser", api_key="testkey")
+        flags = iter([True, False])
+        lock = threading.Lock()
+
+        def fetch():
+            with lock:
+                authenticated = next(flags)
+            return api.get_annotation("abc", authenticated=authenticated)
+
+        release = threading.Event()
+        with patch("hypothesisapi.requests.Session.get") as mock_get:
+            mock_get.side_effect = (
+                lambda url, **kwargs: release.wait(5) and make_response(200, {"id": "abc"})
+            )
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                futures = [pool.submit(fetch) for _ in range(2)]
+                release.set()
+                [f.result() for f in futures]
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_disabled(self):
+        api = API(username="testuser", api_key="testkey", coalesce=False)
+        mock_get, _ = self.concurrent_gets(api, api.get_profile, count=3)
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch("hypothesisapi.requests.Session.get")
+    def test_errors_still_raised(self, mock_get):
+        mock_get.return_value = make_response(404)
+        api = API(username="testuser", api_key="testkey")
+        with self.assertRaises(NotFoundError):
+            api.get_group("missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
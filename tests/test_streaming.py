@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_streaming
+----------------------------------
+
+Tests for incremental parsing of search responses.
+"""
+
+import asyncio
+import json
+import unittest
+from urllib.parse import parse_qs, urlparse
+
+from hypothesisapi import API, AsyncAPI, HTTPCache, HypothesisAPIError, NotFoundError, Transport
+from hypothesisapi.streaming import RowParser, iter_rows
+
+from .stub_server import StubServer
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+def chunked(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+class TestRowParser(unittest.TestCase):
+    """Tests for RowParser and iter_rows()."""
+
+    page = {
+        "meta": {"rows": [{"id": "not a row"}]},
+        "rows": [
+            {"id": "a", "text": 'brackets } ] [ { and "quotes" \\ in text', "n": [1, {"x": []}]},
+            {"id": "b", "text": "naïve ✓", "tags": []},
+            {"id": "c", "target": [{"selector": [{"type": "TextQuoteSelector", "exact": "}"}]}]},
+        ],
+        "total": 3,
+    }
+
+    def test_every_chunk_size(self):
+        body = json.dumps(self.page, ensure_ascii=False).encode("utf-8")
+        for size in (1, 2, 3, 7, 64, len(body)):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_rows(chunked(body, size))), self.page["rows"])
+
+    def test_rows_returned_as_soon_as_complete(self):
+        parser = RowParser()
+        self.assertEqual(parser.feed(b'{"total": 2, "rows": [{"id": "a"}, {"id"'), [b'{"id": "a"}'])
+        self.assertEqual(parser.feed(b': "b"}]'), [b'{"id": "b"}'])
+        self.assertEqual(parser.feed(b', "more": [{"id": "c"}]}'), [])
+        parser.close()
+
+    def test_unfinished_row_is_all_that_is_buffered(self):
+        parser = RowParser()
+        parser.feed(b'{"rows": [' + b'{"id": "x"},' * 1000 + b'{"id": ')
+        self.assertEqual(bytes(parser._buffer), b'{"id": ')
+
+    def test_missing_or_empty_rows(self):
+        self.assertEqual(list(iter_rows([b'{"total": 0}'])), [])
+        self.assertEqual(list(iter_rows([b'{"rows": [], "total": 0}'])), [])
+
+    def test_truncated_body_raises(self):
+        for body in (b"", b'{"rows": [{"id": "a"}', b'{"rows": [{"id": "a"}, {"id": "b"'):
+            with self.subTest(body=body), self.assertRaises(ValueError):
+                list(iter_rows([body]))
+
+
+def search_handler(rows):
+    """Serve ``rows`` by offset or search_after on ``updated``."""
+
+    def handler(method, path, headers, body):
+        params = parse_qs(urlparse(path).query)
+        limit = int(params["limit"][0])
+        if "search_after" in params:
+            after = params["search_after"][0]
+            page = [r for r in rows if r["updated"] > after][:limit]
+        else:
+            offset = int(params.get("offset", ["0"])[0])
+            page = rows[offset:offset + limit]
+        payload = json.dumps({"rows": page, "total": len(rows)}).encode("utf-8")
+        return 200, {"Content-Type": "application/json"}, payload
+
+    return handler
+
+
+ROWS = [{"id": f"id{n}", "updated": f"2024-01-{n + 1:02d}", "text": "x" * 5000} for n in range(7)]
+
+
+class TestStreamedSearch(unittest.TestCase):
+    """search(stream=True) against a local server."""
+
+    def ids(self, api, **kwargs):
+        return [row["id"] for row in api.search(stream=True, **kwargs)]
+
+    def test_offset_pages(self):
+        with StubServer(search_handler(ROWS)) as server:
+            with API(username="me", api_key="key", api_url=server.url) as api:
+                self.assertEqual(self.ids(api, limit=3), [r["id"] for r in ROWS])
+        self.assertEqual(len(server.requests), 4)
+
+    def test_cursor_pages(self):
+        with StubServer(search_handler(ROWS)) as server:
+            with API(username="me", api_key="key", api_url=server.url) as api:
+                ids = self.ids(api, limit=3, sort="updated", cursor=True)
+                self.assertEqual(ids, [r["id"] for r in ROWS])
+        cursors = [
+            parse_qs(urlparse(path).query).get("search_after") for _, path, _, _ in server.requests
+        ]
+        self.assertEqual(cursors, [None, ["2024-01-03"], ["2024-01-06"], ["2024-01-07"]])
+
+    def test_matches_unstreamed_search(self):
+        with StubServer(search_handler(ROWS)) as server:
+            with API(username="me", api_key="key", api_url=server.url) as api:
+                self.assertEqual(list(api.search(stream=True, limit=4)), list(api.search(limit=4)))
+
+    def test_error_status_raises(self):
+        def handler(method, path, headers, body):
+            return 404, {}, b'{"reason": "missing"}'
+
+        with StubServer(handler) as server:
+            with API(username="me", api_key="key", api_url=server.url) as api:
+                with self.assertRaises(NotFoundError):
+                    self.ids(api)
+
+    def test_truncated_page_raises(self):
+        def handler(method, path, headers, body):
+            return 200, {}, b'{"rows": [{"id": "a"}, {"id": "b"'
+
+        with StubServer(handler) as server:
+            with API(username="me", api_key="key", api_url=server.url) as api:
+                rows = api.search(stream=True)
+                self.assertEqual(next(rows)["id"], "a")
+                with self.assertRaises(HypothesisAPIError):
+                    next(rows)
+
+    def test_cached_pages_replay(self):
+        with StubServer(search_handler(ROWS)) as server:
+            transport = Transport(http_cache=HTTPCache(freshness={"search": 60}))
+            with API(username="me", api_key="key", api_url=server.url, transport=transport) as api:
+                expected = [row["id"] for row in api.search(limit=10)]
+                self.assertEqual(self.ids(api, limit=10), expected)
+        self.assertEqual(len(server.requests), 2)
+
+    def test_streamed_pages_not_stored(self):
+        with StubServer(search_handler(ROWS)) as server:
+            cache = HTTPCache(freshness={"search": 60})
+            with API(username="me", api_key="key", api_url=server.url,
+                     transport=Transport(http_cache=cache)) as api:
+                self.ids(api, limit=10)
+                self.ids(api, limit=10)
+        self.assertEqual(len(server.requests), 4)
+        self.assertEqual(len(cache.backend), 0)
+
+    def test_prefetch_rejected(self):
+        api = API(username="me", api_key="key")
+        with self.assertRaises(ValueError):
+            next(api.search(stream=True, prefetch=2))
+
+
+@unittest.skipIf(httpx is None, "httpx not installed")
+class TestAsyncStreamedSearch(unittest.TestCase):
+    """AsyncAPI.search(stream=True)."""
+
+    def run_search(self, handler, **kwargs):
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            async with AsyncAPI(username="me", api_key="key", client=client) as api:
+                return [row["id"] async for row in api.search(stream=True, **kwargs)]
+
+        return asyncio.run(run())
+
+    def test_pages(self):
+        stub = search_handler(ROWS)
+
+        def handler(request):
+            status, headers, body = stub("GET", request.url.raw_path.decode(), request.headers, b"")
+            return httpx.Response(status, content=body)
+
+        self.assertEqual(self.run_search(handler, limit=3), [r["id"] for r in ROWS])
+
+    def test_error_status_raises(self):
+        with self.assertRaises(NotFoundError):
+            self.run_search(lambda request: httpx.Response(404, content=b"{}"))
+
+
+if __name__ == "__main__":
+    unittest.main()
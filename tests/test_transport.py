@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_transport
+----------------------------------
+
+Tests for the pooled HTTP transport, run against a local stub server.
+"""
+
+import unittest
+
+import requests
+
+from hypothesisapi import API, Transport
+
+from .stub_server import StubServer, json_handler
+
+
+class TestTransportConfig(unittest.TestCase):
+    """Tests for transport construction."""
+
+    def test_adapters_use_pool_settings(self):
+        transport = Transport(pool_connections=3, pool_maxsize=7)
+        adapter = transport.session.get_adapter("https://hypothes.is/api")
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 7)
+        transport.close()
+
+    def test_invalid_pool_size_raises(self):
+        with self.assertRaises(ValueError):
+            Transport(pool_maxsize=0)
+
+    def test_keep_alive_disabled_sends_connection_close(self):
+        transport = Transport(keep_alive=False)
+        self.assertEqual(transport.session.headers["Connection"], "close")
+        transport.close()
+
+    def test_existing_session_is_reused(self):
+        session = requests.Session()
+        transport = Transport(session=session)
+        self.assertIs(transport.session, session)
+        transport.close()
+
+    def test_api_builds_default_transport(self):
+        api = API(username="testuser", api_key="testkey", pool_maxsize=4)
+        self.assertIsInstance(api.transport, Transport)
+        self.assertEqual(api.transport.pool_maxsize, 4)
+        api.close()
+
+    def test_api_shares_given_transport(self):
+        transport = Transport()
+        api1 = API(username="a", api_key="k", transport=transport)
+        api2 = API(username="b", api_key="k", transport=transport)
+        self.assertIs(api1.transport, api2.transport)
+        transport.close()
+
+
+class TestTransportPooling(unittest.TestCase):
+    """Tests that API calls reuse pooled connections."""
+
+    def test_sequential_calls_reuse_one_connection(self):
+        with StubServer(json_handler({"id": "abc"})) as server:
+            with API(username="testuser", api_key="testkey", api_url=server.url) as api:
+                for _ in range(5):
+                    self.assertEqual(api.get_annotation("abc")["id"], "abc")
+            self.assertEqual(len(server.requests), 5)
+            self.assertEqual(server.connections, 1)
+
+    def test_keep_alive_disabled_opens_connection_per_call(self):
+        with StubServer(json_handler({"id": "abc"})) as server:
+            api = API(
+                username="testuser",
+                api_key="testkey",
+                api_url=server.url,
+                keep_alive=False,
+            )
+            for _ in range(3):
+                api.get_annotation("abc")
+            api.close()
+            self.assertEqual(server.connections, 3)
+
+    def test_requests_carry_auth_header(self):
+        with StubServer(json_handler({})) as server:
+            with API(username="testuser", api_key="testkey", api_url=server.url) as api:
+                api.get_profile()
+                api.get_links()
+            profile_headers = server.requests[0][2]
+            links_headers = server.requests[1][2]
+            self.assertEqual(profile_headers["Authorization"], "Bearer testkey")
+            self.assertNotIn("Authorization", links_headers)
+
+
+if __name__ == "__main__":
+    unittest.main()